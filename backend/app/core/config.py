@@ -30,9 +30,62 @@ class Settings(BaseSettings):
 
     # 添加比特浏览器配置
     bit_browser_base_url: str = "http://127.0.0.1:54345"  # 默认本地地址
+    bit_browser_timeout: float = 30.0  # 请求超时（秒），打开窗口需等待浏览器启动
+    bit_browser_connect_timeout: float = 5.0  # 建立连接超时（秒）
+    bit_browser_max_connections: int = 20  # 连接池最大连接数
+    bit_browser_max_keepalive: int = 10  # 连接池最多保持的空闲长连接数
+    bit_browser_keepalive_expiry: float = 30.0  # 空闲长连接保持时间（秒）
+    bit_browser_open_concurrency: int = 4  # 批量打开窗口时的默认并发数，按主机性能调整
+    bit_browser_open_retries: int = 2  # 单个窗口打开失败后的重试次数
+    bit_browser_open_backoff: float = 1.0  # 重试退避基数（秒），第 n 次重试等待 基数 * 2^(n-1)
+
+    # Playwright 会话池配置
+    playwright_session_max_idle: int = 300  # 会话空闲超过该时间（秒）后回收
+    playwright_session_max_age: int = 3600  # 会话存活超过该时间（秒）后回收重建
+
+    # 下载队列配置
+    download_max_concurrency: int = 4  # 同时执行的下载任务上限
+    download_domain_concurrency: int = 2  # 单个站点同时执行的下载任务上限，避免集中请求同一站点
+
+    # 下载去重缓存配置
+    download_cache_enabled: bool = True  # 是否启用下载去重缓存（同一视频同一格式只下载一次）
+    download_cache_dir: str = "./downloads/.cache"  # 缓存文件目录，与下载目录在同一磁盘时才能硬链接
+    download_cache_max_entries: int = 500  # 最多缓存的视频数量
+    download_cache_max_bytes: int = 20 * 1024 ** 3  # 缓存文件总大小上限（字节），默认 20GB
+
+    # yt-dlp 元数据解析配置
+    yt_dlp_metadata_workers: int = 8  # 元数据解析线程池大小，限制同时进行的解析请求数量
+    yt_dlp_metadata_cache_ttl: int = 600  # 元数据缓存有效期（秒），0 表示禁用
+    yt_dlp_metadata_cache_max_size: int = 2048  # 最多缓存的 URL 数量
+
+    # YoutubeDL 实例池配置
+    yt_dlp_pool_max_idle: int = 4  # 每组配置（代理/cookies/格式）最多保留的空闲实例数，0 表示不复用
+    yt_dlp_pool_max_age: int = 3600  # 实例存活超过该时间（秒）后不再复用
+
+    # 监控数据配置
+    monitor_stats_upsert_batch_size: int = 500  # 批量写入每日数据时每条 INSERT 包含的记录数
+    monitor_rollup_rebuild_batch_size: int = 50  # 回填历史周/月汇总时每批处理的配置数量
+    monitor_collect_chunk_size: int = 200  # 采集时每次从数据库读取的监控配置数量
+    monitor_collect_concurrency: int = 16  # 采集时所有渠道合计的并发上限
+    monitor_collect_channel_concurrency: int = 4  # 采集时单个渠道的并发上限，避免集中请求同一平台
+    monitor_collect_timeout: float = 60.0  # 单个账号采集超时（秒）
+    monitor_stats_skip_recent: int = 1800  # 每小时数据统计跳过该时长（秒）内已采集的配置（如刚执行过用户采集任务）
+
+    # 任务执行记录配置
+    task_recorder_batch_size: int = 500  # 缓冲多少条任务结束事件后批量写入 tasks 表
+    task_recorder_flush_interval: float = 5.0  # 定时写入间隔（秒），运行超过该时间的任务先以进行中状态入库
 
     # 激活码配置
     activation_grace_hours: int = 1  # 激活码默认宽裕时间（小时）
+    activation_code_batch_size: int = 1000  # 批量生成激活码时每个事务写入的数量
+
+    # 配置缓存
+    setting_cache_ttl: int = 60  # 配置缓存有效期（秒），0 表示禁用
+    setting_cache_max_size: int = 2048  # 最多缓存的所有者（用户/账号）数量
+
+    # 分页总数缓存
+    page_count_cache_ttl: int = 30  # 列表总数缓存有效期（秒），0 表示禁用
+    page_count_cache_max_size: int = 1024  # 最多缓存的查询条件数量
 
     # JWT配置
     jwt_secret_key: str  # JWT密钥，生产环境必须设置
@@ -45,6 +98,15 @@ class Settings(BaseSettings):
     # 认证配置
     enable_auth: bool = True  # 是否启用认证中间件
     token_refresh_threshold: int = 60  # Token刷新阈值（分钟），剩余时间少于阈值时建议刷新
+    jwt_cache_max_size: int = 10000  # 已验证 Token 载荷的缓存数量（按 exp 自动过期），0 表示禁用
+
+    # 密码哈希配置
+    bcrypt_rounds: int = 12  # bcrypt 成本因子（4-31），每加 1 耗时翻倍；只影响新生成的哈希
+    password_hash_workers: int = 4  # 密码哈希/校验线程池大小，限制同时进行的 bcrypt 计算数量
+
+    # 认证用户缓存
+    user_cache_ttl: int = 30  # 当前用户缓存有效期（秒），0 表示禁用
+    user_cache_max_size: int = 4096  # 最多缓存的用户数量
 
     # 视频生成配置
     jianying_draft_folder: str = ""  # 剪映草稿文件夹路径，例如：C:/Users/用户名/AppData/Local/JianyingPro/User Data/Projects/com.lveditor.draft
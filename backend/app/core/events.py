@@ -9,7 +9,15 @@ from app.core.logging import log
 from app.core.middleware import setup_middleware
 from app.db.config import init_db, close_db
 from app.routers import api_router
+from app.services.downloader import download_manager
+from app.services.monitor.browser_service import bit_browser_service
+from app.services.monitor.collector import monitor_collect_engine
+from app.services.monitor.task_recorder import task_recorder
 from app.services.scheduler.scheduler_service import scheduler_service
+from app.util.password import shutdown_password_executor
+from app.util.playwright_pool import playwright_session_pool
+from app.util.yt_dlp_pool import youtube_dl_pool
+from app.util.yt_dlp_util import shutdown_metadata_executor
 
 
 @asynccontextmanager
@@ -24,6 +32,12 @@ async def lifespan(app: FastAPI):
     await init_db()
     log.info("✅ 数据库连接已建立")
 
+    # 启动任务执行记录定时写库
+    task_recorder.start_flusher()
+
+    # 创建比特浏览器长连接客户端
+    await bit_browser_service.start()
+
     # 启动调度器
     await scheduler_service.start()
 
@@ -40,10 +54,34 @@ async def lifespan(app: FastAPI):
         # 停止调度器
         await scheduler_service.stop()
 
+        # 调度器不等待执行中的任务，取消执行中的监控采集并等待其写完结果和任务记录
+        await monitor_collect_engine.shutdown()
+
+        # 取消排队和执行中的下载任务
+        await download_manager.shutdown()
+
+        # 写入缓冲的任务执行记录（需在关闭数据库连接前）
+        await task_recorder.stop()
+
+        # 关闭浏览器会话池
+        await playwright_session_pool.close_all()
+
+        # 关闭比特浏览器客户端
+        await bit_browser_service.stop()
+
         # 关闭数据库连接
         await close_db()
         log.info("✅ 数据库连接已关闭")
 
+        # 关闭密码哈希线程池
+        shutdown_password_executor()
+
+        # 关闭 yt-dlp 元数据解析线程池
+        shutdown_metadata_executor()
+
+        # 关闭复用的 YoutubeDL 实例（保存 cookies、关闭 HTTP 会话）
+        youtube_dl_pool.close_all()
+
         # 这里可以添加其他清理操作
         # 例如：清理缓存、保存状态等
 
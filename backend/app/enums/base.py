@@ -1,8 +1,27 @@
-from enum import Enum
+from enum import Enum, EnumMeta
 from typing import Dict, List, Any
 
 
-class BaseCodeEnum(Enum):
+class CodeIndexedEnumMeta(EnumMeta):
+    """
+    带 code 索引的枚举元类
+
+    在枚举类创建时构建一次 code → 成员 的字典（_code_index），
+    使 from_code 等按编码查找变为 O(1)。编码重复时保留第一个成员，与线性查找结果一致。
+    """
+
+    def __new__(metacls, cls, bases, classdict, **kwds):
+        enum_class = super().__new__(metacls, cls, bases, classdict, **kwds)
+
+        code_index = {}
+        for member in enum_class:
+            code_index.setdefault(member.code, member)
+        enum_class._code_index = code_index
+
+        return enum_class
+
+
+class BaseCodeEnum(Enum, metaclass=CodeIndexedEnumMeta):
     """
     基础枚举类
 
@@ -37,10 +56,10 @@ class BaseCodeEnum(Enum):
         Raises:
             ValueError: 编码不存在
         """
-        for member in cls:
-            if member.code == code:
-                return member
-        raise ValueError(f"不支持的{cls.__name__}编码: {code}")
+        member = cls._code_index.get(code)
+        if member is None:
+            raise ValueError(f"不支持的{cls.__name__}编码: {code}")
+        return member
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,10 @@
+from app.enums.base import BaseCodeEnum
+
+
+class DownloadStatusEnum(BaseCodeEnum):
+    """下载任务状态枚举"""
+    PENDING = (0, "排队中")
+    RUNNING = (1, "下载中")
+    SUCCESS = (2, "成功")
+    FAILED = (3, "失败")
+    CANCELLED = (4, "已取消")
@@ -0,0 +1,8 @@
+from app.enums.base import BaseCodeEnum
+
+
+class PageCountModeEnum(BaseCodeEnum):
+    """分页总数统计方式枚举"""
+    EXACT = (1, "精确统计")
+    ESTIMATED = (2, "估算")
+    NONE = (3, "不统计")
@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+
+from app.enums.base import BaseCodeEnum
+
+
+class StatsGranularityEnum(BaseCodeEnum):
+    """统计数据粒度枚举"""
+    DAY = (1, "日", 1)  # (粒度码, 描述, 单个周期最多覆盖的天数)
+    WEEK = (2, "周", 7)
+    MONTH = (3, "月", 31)
+
+    def __new__(cls, code: int, desc: str, max_days: int):
+        """
+        创建统计粒度枚举实例
+
+        Args:
+            code: 粒度编码
+            desc: 粒度描述
+            max_days: 单个周期最多覆盖的天数
+        """
+        obj = object.__new__(cls)
+        obj.code = code
+        obj.desc = desc
+        obj.max_days = max_days
+        return obj
+
+    @classmethod
+    def coarsest_for(cls, resolution_days: int) -> "StatsGranularityEnum":
+        """
+        获取不超过指定分辨率的最粗粒度
+
+        Args:
+            resolution_days: 每个数据点允许覆盖的最大天数
+
+        Returns:
+            统计粒度，如 7~30 天返回周，31 天及以上返回月
+        """
+        fitting = [member for member in cls if member.max_days <= resolution_days]
+        return max(fitting, key=lambda member: member.max_days) if fitting else cls.DAY
+
+    def period_start(self, day: date) -> date:
+        """获取日期所在周期的开始日期（周一 / 每月 1 日）"""
+        if self is StatsGranularityEnum.WEEK:
+            return day - timedelta(days=day.weekday())
+        if self is StatsGranularityEnum.MONTH:
+            return day.replace(day=1)
+        return day
+
+    def next_period_start(self, start: date) -> date:
+        """获取下一个周期的开始日期"""
+        if self is StatsGranularityEnum.WEEK:
+            return start + timedelta(days=7)
+        if self is StatsGranularityEnum.MONTH:
+            return (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        return start + timedelta(days=1)
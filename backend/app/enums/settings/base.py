@@ -3,6 +3,8 @@
 from enum import Enum
 from typing import Any, Optional, List, Dict
 
+from app.enums.base import CodeIndexedEnumMeta
+
 
 class SettingValueType(str, Enum):
     """配置值类型"""
@@ -37,13 +39,21 @@ class BaseSetting:
         self.required = required    # 是否必填
 
 
-class BaseSettingEnum(Enum):
+class BaseSettingEnum(Enum, metaclass=CodeIndexedEnumMeta):
     """
     配置项枚举基类
 
     所有配置枚举都应继承此类，自动获得 code/desc/default/value_type/options/required 属性。
     """
 
+    @classmethod
+    def from_code(cls, code: int) -> "BaseSettingEnum":
+        """根据编码获取配置项"""
+        member = cls._code_index.get(code)
+        if member is None:
+            raise ValueError(f"不支持的配置项编码: {code}")
+        return member
+
     @property
     def code(self) -> int:
         return self.value.code
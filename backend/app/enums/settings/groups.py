@@ -3,6 +3,7 @@
 from enum import Enum
 from typing import Type
 
+from app.enums.base import CodeIndexedEnumMeta
 from app.enums.settings.general import GeneralSettingEnum
 from app.enums.settings.notification import NotificationSettingEnum
 from app.enums.settings.advanced import AdvancedSettingEnum
@@ -10,7 +11,32 @@ from app.enums.settings.download import DownloadSettingEnum
 from app.enums.settings.scheduler import SchedulerSettingEnum
 
 
-class SettingGroupEnum(Enum):
+class SettingGroupEnumMeta(CodeIndexedEnumMeta):
+    """
+    配置分组枚举元类
+
+    类创建时额外构建：
+    - _settings_by_group: 分组 → 配置项列表
+    - _setting_index: 配置项编码 → (分组, 配置项)，编码重复时保留先出现的分组
+    """
+
+    def __new__(metacls, cls, bases, classdict, **kwds):
+        enum_class = super().__new__(metacls, cls, bases, classdict, **kwds)
+
+        settings_by_group = {}
+        setting_index = {}
+        for group in enum_class:
+            group_settings = tuple(group.setting_enum)
+            settings_by_group[group] = group_settings
+            for setting in group_settings:
+                setting_index.setdefault(setting.code, (group, setting))
+
+        enum_class._settings_by_group = settings_by_group
+        enum_class._setting_index = setting_index
+        return enum_class
+
+
+class SettingGroupEnum(Enum, metaclass=SettingGroupEnumMeta):
     """
     配置分组枚举
 
@@ -30,22 +56,22 @@ class SettingGroupEnum(Enum):
 
     def get_settings(self) -> list:
         """获取该分组下的所有配置项"""
-        return list(self.setting_enum)
+        return list(self._settings_by_group[self])
 
     @classmethod
     def from_code(cls, code: int) -> "SettingGroupEnum":
         """根据编码获取分组"""
-        for member in cls:
-            if member.code == code:
-                return member
-        raise ValueError(f"不支持的分组编码: {code}")
+        member = cls._code_index.get(code)
+        if member is None:
+            raise ValueError(f"不支持的分组编码: {code}")
+        return member
 
     @classmethod
     def get_all_settings(cls) -> list:
         """获取所有配置项"""
         all_settings = []
-        for group in cls:
-            all_settings.extend(group.get_settings())
+        for group_settings in cls._settings_by_group.values():
+            all_settings.extend(group_settings)
         return all_settings
 
     @classmethod
@@ -56,8 +82,7 @@ class SettingGroupEnum(Enum):
         Returns:
             (分组枚举, 配置项枚举) 或抛出 ValueError
         """
-        for group in cls:
-            for setting in group.get_settings():
-                if setting.code == code:
-                    return (group, setting)
-        raise ValueError(f"不支持的配置项编码: {code}")
+        found = cls._setting_index.get(code)
+        if found is None:
+            raise ValueError(f"不支持的配置项编码: {code}")
+        return found
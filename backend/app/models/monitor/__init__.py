@@ -2,6 +2,7 @@
 
 from .monitor_config import MonitorConfig
 from .monitor_daily_stats import MonitorDailyStats
+from .monitor_stats_rollup import MonitorWeeklyStats, MonitorMonthlyStats
 from .task import Task
 
-__all__ = ["MonitorConfig", "MonitorDailyStats", "Task"]
+__all__ = ["MonitorConfig", "MonitorDailyStats", "MonitorWeeklyStats", "MonitorMonthlyStats", "Task"]
@@ -16,3 +16,5 @@ class MonitorDailyStats(BaseModel):
     class Meta:
         table = "monitor_daily_stats"
         ordering = ["-stat_date"]
+        # 对应建表语句中的 uk_config_date，批量 upsert 依赖该唯一约束
+        unique_together = [("config_id", "stat_date")]
@@ -0,0 +1,48 @@
+from tortoise import fields
+
+from app.models.base import BaseModel
+
+
+class MonitorStatsRollup(BaseModel):
+    """
+    监控数据周期汇总基础模型
+
+    由每日数据汇总得到，指标为周期内最后一条每日数据的值，
+    增量为期末值减去周期开始前最后一条每日数据的值（此前没有数据时减去周期内第一条）
+    """
+    config_id = fields.IntField(description="关联配置ID")
+    period_start = fields.DateField(description="周期开始日期")
+    period_end = fields.DateField(description="周期结束日期")
+    last_stat_date = fields.DateField(description="期末数据对应的统计日期")
+    days_count = fields.IntField(default=0, description="周期内有数据的天数")
+    follower_count = fields.IntField(default=0, description="期末粉丝数")
+    liked_count = fields.IntField(default=0, description="期末获赞/收藏数")
+    view_count = fields.BigIntField(default=0, description="期末总播放/阅读量")
+    content_count = fields.IntField(default=0, description="期末发布内容数量")
+    follower_delta = fields.IntField(default=0, description="粉丝增量")
+    liked_delta = fields.IntField(default=0, description="获赞/收藏增量")
+    view_delta = fields.BigIntField(default=0, description="播放/阅读增量")
+    content_delta = fields.IntField(default=0, description="发布内容增量")
+
+    class Meta:
+        abstract = True
+
+
+class MonitorWeeklyStats(MonitorStatsRollup):
+    """监控每周汇总数据模型（周一为周期开始）"""
+
+    class Meta:
+        table = "monitor_weekly_stats"
+        ordering = ["-period_start"]
+        # 对应建表语句中的 uk_config_period，批量 upsert 依赖该唯一约束
+        unique_together = [("config_id", "period_start")]
+
+
+class MonitorMonthlyStats(MonitorStatsRollup):
+    """监控每月汇总数据模型"""
+
+    class Meta:
+        table = "monitor_monthly_stats"
+        ordering = ["-period_start"]
+        # 对应建表语句中的 uk_config_period，批量 upsert 依赖该唯一约束
+        unique_together = [("config_id", "period_start")]
@@ -1,7 +1,7 @@
 """账号仓储"""
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterable
 
 from app.models.account.account import Account
 from app.repositories.base import BaseRepository
@@ -21,6 +21,13 @@ class AccountRepository(BaseRepository[Account]):
         """获取用户的指定账号"""
         return await self.get_or_none(id=account_id, user_id=user_id, deleted_at__isnull=True)
 
+    async def find_user_ids(self, account_ids: Iterable[int]) -> Dict[int, int]:
+        """批量获取账号所属用户 {account_id: user_id}（未删除）"""
+        rows = await self.model.filter(
+            id__in=list(account_ids), deleted_at__isnull=True
+        ).values_list("id", "user_id")
+        return dict(rows)
+
     async def soft_delete(self, account: Account) -> Account:
         """软删除账号"""
         account.deleted_at = datetime.now()
@@ -2,15 +2,26 @@
 激活码仓储类
 封装激活码相关的所有数据访问操作
 """
-from typing import Optional, List
+from typing import Optional, List, Set
 from datetime import datetime
 
+from tortoise.transactions import in_transaction
+
+from app.core.logging import log
 from app.repositories.base import BaseRepository
 from app.models.account.activation_code import ActivationCode
 from app.enums.account.activation_status import ActivationCodeStatusEnum
 from app.util.time_util import get_utc_now
 
 
+class _ClaimConflict(Exception):
+    """领取激活码时部分行已被并发请求修改，用于回滚并重试"""
+
+
+class ActivationCodeClaimConflict(Exception):
+    """并发冲突重试次数用尽仍未领取成功（激活码可能充足，稍后重试即可）"""
+
+
 class ActivationCodeRepository(BaseRepository[ActivationCode]):
     """
     激活码仓储类
@@ -93,6 +104,24 @@ class ActivationCodeRepository(BaseRepository[ActivationCode]):
         """
         return await self.exists(activation_code=code)
 
+    async def find_existing_codes(self, codes: List[str]) -> Set[str]:
+        """
+        批量检查激活码是否存在（单次 IN 查询）
+
+        Args:
+            codes: 待检查的激活码列表
+
+        Returns:
+            已存在的激活码集合
+        """
+        if not codes:
+            return set()
+
+        existing = await self.model.filter(
+            activation_code__in=codes
+        ).values_list("activation_code", flat=True)
+        return set(existing)
+
     async def count_by_status(
         self,
         status: int,
@@ -198,6 +227,34 @@ class ActivationCodeRepository(BaseRepository[ActivationCode]):
             activated_at=activated_at
         )
 
+    async def bulk_create_activation_codes(
+        self,
+        codes: List[str],
+        type_code: int,
+        status: int,
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        批量创建激活码（多行 INSERT）
+
+        Args:
+            codes: 激活码字符串列表
+            type_code: 激活码类型
+            status: 激活码状态
+            batch_size: 每条 INSERT 语句包含的行数（可选）
+
+        Returns:
+            创建的数量
+        """
+        await self.bulk_create(
+            [
+                {"activation_code": code, "type": type_code, "status": status}
+                for code in codes
+            ],
+            batch_size=batch_size
+        )
+        return len(codes)
+
     async def distribute_activation_code(self, code: ActivationCode) -> ActivationCode:
         """
         分发激活码
@@ -213,6 +270,64 @@ class ActivationCodeRepository(BaseRepository[ActivationCode]):
         await code.save()
         return code
 
+    async def claim_unused_codes(
+        self,
+        type_code: int,
+        count: int,
+        max_retries: int = 3
+    ) -> List[str]:
+        """
+        原子地领取并分发指定数量的未使用激活码
+
+        同一事务内执行两条语句：
+        1. SELECT ... FOR UPDATE SKIP LOCKED 锁定 count 行，跳过其他派发请求已锁定的行
+        2. 一条带 status 条件的 UPDATE 批量改为已分发并写入分发时间
+
+        不支持行锁的数据库（如 SQLite）依靠 UPDATE 的 status 条件兜底：
+        更新行数不符说明有行被并发领取，回滚后重试。可用数量不足时不做任何修改。
+
+        Args:
+            type_code: 激活码类型
+            count: 领取数量
+            max_retries: 并发冲突时的最大重试次数
+
+        Returns:
+            已分发的激活码列表；可用数量不足时返回空列表
+
+        Raises:
+            ActivationCodeClaimConflict: 并发冲突重试次数用尽
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                async with in_transaction() as conn:
+                    codes = await self.model.filter(
+                        type=type_code,
+                        status=ActivationCodeStatusEnum.UNUSED.code
+                    ).order_by("-created_at").limit(count).select_for_update(
+                        skip_locked=True
+                    ).only("id", "activation_code").using_db(conn)
+
+                    if len(codes) < count:
+                        return []
+
+                    now = get_utc_now()
+                    updated = await self.model.filter(
+                        id__in=[code.id for code in codes],
+                        status=ActivationCodeStatusEnum.UNUSED.code
+                    ).using_db(conn).update(
+                        status=ActivationCodeStatusEnum.DISTRIBUTED.code,
+                        distributed_at=now,
+                        updated_at=now
+                    )
+                    if updated != len(codes):
+                        raise _ClaimConflict()
+
+                    return [code.activation_code for code in codes]
+            except _ClaimConflict:
+                log.warning(f"派发激活码并发冲突，第{attempt + 1}次重试")
+
+        raise ActivationCodeClaimConflict(f"派发激活码并发冲突，已重试{max_retries}次")
+
     async def activate_activation_code(
         self,
         code: ActivationCode,
@@ -3,18 +3,97 @@
 合并 UserSettingRepository 和 AccountSettingRepository
 """
 
-from typing import Optional, List, Any
+import copy
+from typing import Optional, List, Any, Dict, Iterable, Tuple
 
+from app.core.config import settings
 from app.enums.common.setting_owner import SettingOwnerType
 from app.models.account.setting import Setting
 from app.repositories.base import BaseRepository
+from app.util.cache import TTLCache
 
 
 class SettingRepository(BaseRepository[Setting]):
-    """统一配置仓储"""
+    """统一配置仓储
+
+    按所有者缓存 {setting_key: setting_value} 映射，写操作（upsert/delete）同步失效。
+    直接通过 ORM 修改 settings 表时需调用 clear_cache()。
+    返回的映射是缓存的深拷贝，调用方修改 JSON 配置值不会影响缓存。
+    """
 
     def __init__(self):
         super().__init__(Setting)
+        self._cache: TTLCache[Tuple[int, int], Dict[int, Any]] = TTLCache(
+            max_size=settings.setting_cache_max_size,
+            ttl=settings.setting_cache_ttl
+        )
+        # 失效序号：查询期间发生过失效则不回填缓存，避免写入旧数据
+        self._invalidation_seq = 0
+
+    # ========== 缓存 ==========
+
+    async def find_settings_map(self, owner_type: SettingOwnerType, owner_id: int) -> Dict[int, Any]:
+        """获取所有者的配置映射 {setting_key: setting_value}（带缓存）"""
+        key = (owner_type.code, owner_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        seq = self._invalidation_seq
+        rows = await self.model.filter(
+            owner_type=owner_type.code, owner_id=owner_id
+        ).values_list("setting_key", "setting_value")
+        settings_map = dict(rows)
+
+        if seq == self._invalidation_seq:
+            self._cache.set(key, settings_map)
+        return copy.deepcopy(settings_map)
+
+    async def find_settings_maps(
+        self, owner_type: SettingOwnerType, owner_ids: Iterable[int]
+    ) -> Dict[int, Dict[int, Any]]:
+        """批量获取多个所有者的配置映射 {owner_id: {setting_key: setting_value}}
+
+        命中缓存的所有者不再查库，其余所有者通过一次 IN 查询获取并回填缓存。
+        """
+        result: Dict[int, Dict[int, Any]] = {}
+        missing: List[int] = []
+        for owner_id in dict.fromkeys(owner_ids):
+            cached = self._cache.get((owner_type.code, owner_id))
+            if cached is not None:
+                result[owner_id] = copy.deepcopy(cached)
+            else:
+                missing.append(owner_id)
+
+        if not missing:
+            return result
+
+        seq = self._invalidation_seq
+        rows = await self.model.filter(
+            owner_type=owner_type.code, owner_id__in=missing
+        ).values_list("owner_id", "setting_key", "setting_value")
+
+        fetched: Dict[int, Dict[int, Any]] = {owner_id: {} for owner_id in missing}
+        for owner_id, setting_key, setting_value in rows:
+            fetched[owner_id][setting_key] = setting_value
+
+        for owner_id, settings_map in fetched.items():
+            if seq == self._invalidation_seq:
+                self._cache.set((owner_type.code, owner_id), settings_map)
+            result[owner_id] = copy.deepcopy(settings_map)
+        return result
+
+    def invalidate_owner(self, owner_type: SettingOwnerType, owner_id: int) -> None:
+        """使指定所有者的配置缓存失效"""
+        self._invalidation_seq += 1
+        self._cache.invalidate((owner_type.code, owner_id))
+
+    def clear_cache(self) -> None:
+        """清空全部配置缓存"""
+        self._invalidation_seq += 1
+        self._cache.clear()
+
+    # ========== 基础操作 ==========
 
     async def find_by_owner_and_key(
         self, owner_type: SettingOwnerType, owner_id: int, setting_key: int
@@ -34,27 +113,31 @@ class SettingRepository(BaseRepository[Setting]):
         self, owner_type: SettingOwnerType, owner_id: int, setting_key: int, setting_value: Any
     ) -> Setting:
         """创建或更新配置"""
+        self.invalidate_owner(owner_type, owner_id)
         existing = await self.find_by_owner_and_key(owner_type, owner_id, setting_key)
         if existing:
             existing.setting_value = setting_value
             await existing.save()
-            return existing
-        return await self.create(
-            owner_type=owner_type.code,
-            owner_id=owner_id,
-            setting_key=setting_key,
-            setting_value=setting_value
-        )
+        else:
+            existing = await self.create(
+                owner_type=owner_type.code,
+                owner_id=owner_id,
+                setting_key=setting_key,
+                setting_value=setting_value
+            )
+        self.invalidate_owner(owner_type, owner_id)
+        return existing
 
     async def delete_by_owner_and_key(
         self, owner_type: SettingOwnerType, owner_id: int, setting_key: int
     ) -> bool:
         """删除配置"""
-        setting = await self.find_by_owner_and_key(owner_type, owner_id, setting_key)
-        if setting:
-            await setting.delete()
-            return True
-        return False
+        self.invalidate_owner(owner_type, owner_id)
+        deleted = await self.model.filter(
+            owner_type=owner_type.code, owner_id=owner_id, setting_key=setting_key
+        ).delete()
+        self.invalidate_owner(owner_type, owner_id)
+        return deleted > 0
 
     # ========== 便捷方法：用户配置 ==========
 
@@ -64,6 +147,9 @@ class SettingRepository(BaseRepository[Setting]):
     async def find_all_user_settings(self, user_id: int) -> List[Setting]:
         return await self.find_all_by_owner(SettingOwnerType.USER, user_id)
 
+    async def find_user_settings_map(self, user_id: int) -> Dict[int, Any]:
+        return await self.find_settings_map(SettingOwnerType.USER, user_id)
+
     async def upsert_user_setting(self, user_id: int, setting_key: int, value: Any) -> Setting:
         return await self.upsert(SettingOwnerType.USER, user_id, setting_key, value)
 
@@ -78,6 +164,9 @@ class SettingRepository(BaseRepository[Setting]):
     async def find_all_account_settings(self, account_id: int) -> List[Setting]:
         return await self.find_all_by_owner(SettingOwnerType.ACCOUNT, account_id)
 
+    async def find_account_settings_map(self, account_id: int) -> Dict[int, Any]:
+        return await self.find_settings_map(SettingOwnerType.ACCOUNT, account_id)
+
     async def upsert_account_setting(self, account_id: int, setting_key: int, value: Any) -> Setting:
         return await self.upsert(SettingOwnerType.ACCOUNT, account_id, setting_key, value)
 
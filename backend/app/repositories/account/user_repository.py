@@ -2,10 +2,13 @@
 用户仓储类
 封装用户相关的所有数据访问操作
 """
+import copy
 from typing import Optional, List
 
+from app.core.config import settings
 from app.repositories.base import BaseRepository
 from app.models.account.user import User
+from app.util.cache import TTLCache
 
 
 class UserRepository(BaseRepository[User]):
@@ -18,6 +21,68 @@ class UserRepository(BaseRepository[User]):
     def __init__(self):
         """初始化用户仓储"""
         super().__init__(User)
+        # 认证用户缓存：user_id -> User，仅缓存存在的用户
+        self._cache: TTLCache[int, User] = TTLCache(
+            max_size=settings.user_cache_max_size,
+            ttl=settings.user_cache_ttl
+        )
+        # 每次失效递增，查询期间发生过失效的结果不回填缓存
+        self._invalidation_seq = 0
+
+    # ========== 缓存 ==========
+
+    async def get_cached_by_id(self, user_id: int) -> Optional[User]:
+        """
+        根据 ID 获取用户（带缓存，用于认证）
+
+        缓存中的实例在多个请求间共享，每次返回其副本，修改返回值不会影响缓存；
+        返回值可能是缓存有效期内的旧数据，需要修改并保存时应通过 get_by_id 重新读取
+
+        Args:
+            user_id: 用户 ID
+
+        Returns:
+            用户实例副本，如果不存在则返回 None
+        """
+        user = self._cache.get(user_id)
+        if user is not None:
+            return copy.copy(user)
+
+        seq = self._invalidation_seq
+        user = await self.get_by_id(user_id)
+        if user is None:
+            return None
+        if seq == self._invalidation_seq:
+            self._cache.set(user_id, user)
+        return copy.copy(user)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """使指定用户的缓存失效"""
+        self._invalidation_seq += 1
+        self._cache.invalidate(user_id)
+
+    def clear_cache(self) -> None:
+        """清空全部用户缓存"""
+        self._invalidation_seq += 1
+        self._cache.clear()
+
+    async def update(self, instance: User, **kwargs) -> User:
+        """更新用户（写前写后均使缓存失效）"""
+        self.invalidate_user(instance.id)
+        try:
+            return await super().update(instance, **kwargs)
+        finally:
+            self.invalidate_user(instance.id)
+
+    async def delete(self, instance: User) -> bool:
+        """删除用户（写前写后均使缓存失效）"""
+        self.invalidate_user(instance.id)
+        try:
+            return await super().delete(instance)
+        finally:
+            self.invalidate_user(instance.id)
+
+    # ========== 查询 ==========
 
     async def find_by_username(self, username: str) -> Optional[User]:
         """
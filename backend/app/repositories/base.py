@@ -2,13 +2,127 @@
 基础仓储类
 提供通用的 CRUD 操作，所有具体的 Repository 都应继承此类
 """
-from typing import TypeVar, Generic, Optional, List, Type, Dict, Any
+from typing import TypeVar, Generic, Optional, List, Type, Dict, Any, Iterable, Tuple
+from pydantic import BaseModel as SchemaModel
 from tortoise.models import Model
 from tortoise.queryset import QuerySet
 
 T = TypeVar('T', bound=Model)
 
 
+class ModelProjection:
+    """
+    Model → 响应模型 的列投影
+
+    只查询响应模型需要的列（values_list），直接由元组构建字典，
+    不创建 Tortoise Model 实例。响应模型中非数据库列的字段（如 channel_name）
+    复用 Model 上同名的 @property 计算，保证与完整加载时结果一致。
+
+    同一 (Model, 响应模型) 只构建一次，通过 of() 获取
+    """
+
+    _instances: Dict[Tuple[Type[Model], Type[SchemaModel]], "ModelProjection"] = {}
+
+    def __init__(self, model: Type[Model], schema: Type[SchemaModel]):
+        """
+        初始化投影
+
+        Args:
+            model: Model 类型
+            schema: 响应模型类型
+
+        Raises:
+            ValueError: 响应模型的必填字段既不是数据库列也不是 Model 属性
+        """
+        db_fields = model._meta.fields_db_projection
+        properties = {
+            name: attr
+            for klass in reversed(model.__mro__)
+            if issubclass(klass, Model) and klass is not Model
+            for name, attr in vars(klass).items()
+            if isinstance(attr, property)
+        }
+
+        columns = [name for name in schema.model_fields if name in db_fields]
+        # 游标分页需要 (created_at, id)，始终一并查询
+        for name in ("id", "created_at"):
+            if name in db_fields and name not in columns:
+                columns.append(name)
+
+        derived = []
+        for name, field in schema.model_fields.items():
+            if name in db_fields:
+                continue
+            if name in properties:
+                derived.append(name)
+            elif field.is_required():
+                raise ValueError(f"{schema.__name__}.{name} 无法由 {model.__name__} 投影")
+
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.derived: Tuple[str, ...] = tuple(derived)
+        # 仅含数据列槽位和 Model 属性的轻量行对象，用于计算派生字段
+        self._row_class = type(
+            f"{model.__name__}Row",
+            (),
+            {"__slots__": self.columns, **{name: properties[name] for name in properties if name not in db_fields}}
+        )
+
+    @classmethod
+    def of(cls, model: Type[Model], schema: Type[SchemaModel]) -> "ModelProjection":
+        """
+        获取（并缓存）投影
+
+        Args:
+            model: Model 类型
+            schema: 响应模型类型
+
+        Returns:
+            ModelProjection 实例
+        """
+        key = (model, schema)
+        projection = cls._instances.get(key)
+        if projection is None:
+            projection = cls._instances[key] = cls(model, schema)
+        return projection
+
+    def build(self, rows: Iterable[tuple]) -> List[Dict[str, Any]]:
+        """
+        由 values_list 元组构建字典列表
+
+        Args:
+            rows: 按 columns 顺序排列的元组
+
+        Returns:
+            字典列表
+        """
+        columns = self.columns
+        if not self.derived:
+            return [dict(zip(columns, row)) for row in rows]
+
+        items = []
+        for row in rows:
+            item = dict(zip(columns, row))
+            obj = self._row_class()
+            for name, value in item.items():
+                setattr(obj, name, value)
+            for name in self.derived:
+                item[name] = getattr(obj, name)
+            items.append(item)
+        return items
+
+    async def fetch(self, query: QuerySet) -> List[Dict[str, Any]]:
+        """
+        执行投影查询
+
+        Args:
+            query: 查询集（可已附加排序/分页）
+
+        Returns:
+            字典列表
+        """
+        return self.build(await query.values_list(*self.columns))
+
+
 class BaseRepository(Generic[T]):
     """
     基础仓储类
@@ -141,18 +255,48 @@ class BaseRepository(Generic[T]):
         """
         return self.model.filter(**filters)
 
-    async def bulk_create(self, objects: List[Dict[str, Any]]) -> List[T]:
+    def projection(self, schema: Type[SchemaModel]) -> ModelProjection:
+        """
+        获取本仓储 Model 到响应模型的列投影
+
+        Args:
+            schema: 响应模型类型
+
+        Returns:
+            ModelProjection 实例
+        """
+        return ModelProjection.of(self.model, schema)
+
+    async def find_projected(self, schema: Type[SchemaModel], **filters) -> List[Dict[str, Any]]:
+        """
+        根据条件查询记录，只取响应模型需要的列
+
+        Args:
+            schema: 响应模型类型
+            **filters: 过滤条件
+
+        Returns:
+            字典列表（键为响应模型字段）
+        """
+        return await self.projection(schema).fetch(self.model.filter(**filters))
+
+    async def bulk_create(
+        self,
+        objects: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> List[T]:
         """
         批量创建记录
 
         Args:
             objects: 对象列表，每个对象是一个字典
+            batch_size: 每条 INSERT 语句包含的行数（可选，默认一次写入）
 
         Returns:
             创建的 Model 实例列表
         """
         instances = [self.model(**obj) for obj in objects]
-        return await self.model.bulk_create(instances)
+        return await self.model.bulk_create(instances, batch_size=batch_size)
 
     async def bulk_update(
         self,
@@ -170,3 +314,63 @@ class BaseRepository(Generic[T]):
             更新的记录数量
         """
         return await self.model.bulk_update(instances, fields)
+
+    async def bulk_upsert(
+        self,
+        instances: List[T],
+        conflict_fields: List[str],
+        update_fields: List[str]
+    ) -> None:
+        """
+        批量插入或更新记录（依赖 conflict_fields 上的唯一约束），整批通过一条语句写入
+
+        MySQL 下 bulk_create(on_conflict=...) 生成带行别名的 INSERT ... AS new_xxx ON DUPLICATE KEY UPDATE，
+        驱动无法将其合并为多行语句，会逐行执行（且行别名要求 MySQL 8.0.19+），
+        因此自行生成多行 INSERT ... ON DUPLICATE KEY UPDATE；其他数据库使用 ON CONFLICT DO UPDATE
+
+        Args:
+            instances: 未保存的 Model 实例列表
+            conflict_fields: 唯一约束字段（MySQL 由唯一索引确定，仅用于其他数据库）
+            update_fields: 冲突时更新的字段
+        """
+        if not instances:
+            return
+
+        db = self.model._choose_db(for_write=True)
+        if db.capabilities.dialect != "mysql":
+            await self.model.bulk_create(instances, on_conflict=conflict_fields, update_fields=update_fields)
+            return
+
+        sql, values = self.build_mysql_upsert(instances, update_fields)
+        await db.execute_query(sql, values)
+
+    def build_mysql_upsert(self, instances: List[T], update_fields: List[str]) -> Tuple[str, List[Any]]:
+        """
+        生成 MySQL 多行 INSERT ... VALUES (...), (...) ON DUPLICATE KEY UPDATE col = VALUES(col) 语句
+
+        Args:
+            instances: 未保存的 Model 实例列表
+            update_fields: 冲突时更新的字段
+
+        Returns:
+            (SQL, 参数列表)
+        """
+        meta = self.model._meta
+        field_names = [name for name in meta.fields_db_projection if not meta.fields_map[name].generated]
+        columns = ", ".join(f"`{meta.fields_db_projection[name]}`" for name in field_names)
+        row = "(" + ", ".join(["%s"] * len(field_names)) + ")"
+        updates = ", ".join(
+            f"`{column}` = VALUES(`{column}`)" for column in (meta.fields_db_projection[name] for name in update_fields)
+        )
+
+        values: List[Any] = []
+        for instance in instances:
+            values.extend(
+                meta.fields_map[name].to_db_value(getattr(instance, name), instance) for name in field_names
+            )
+
+        sql = (
+            f"INSERT INTO `{meta.db_table}` ({columns}) VALUES {', '.join([row] * len(instances))} "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+        return sql, values
@@ -2,9 +2,11 @@
 监控配置仓储类
 封装监控配置相关的所有数据访问操作
 """
-from typing import Optional, List
+from typing import AsyncIterator, Iterable, Optional, List, Set
 from datetime import datetime
 
+from tortoise.expressions import Q
+
 from app.repositories.base import BaseRepository
 from app.models.monitor.monitor_config import MonitorConfig
 from app.util.time_util import get_utc_now
@@ -44,6 +46,22 @@ class MonitorConfigRepository(BaseRepository[MonitorConfig]):
 
         return await self.get_or_none(**filters)
 
+    async def find_owned_ids(self, config_ids: Iterable[int], user_id: int) -> Set[int]:
+        """
+        批量校验配置归属（一次查询）
+
+        Args:
+            config_ids: 配置 ID 列表
+            user_id: 用户 ID
+
+        Returns:
+            属于该用户且未删除的配置 ID 集合
+        """
+        ids = await self.model.filter(
+            id__in=list(config_ids), user_id=user_id, deleted_at__isnull=True
+        ).values_list("id", flat=True)
+        return set(ids)
+
     def find_with_filters(
         self,
         user_id: int,
@@ -203,6 +221,66 @@ class MonitorConfigRepository(BaseRepository[MonitorConfig]):
         await config.save()
         return config
 
+    async def iter_active_chunks(
+        self,
+        chunk_size: int,
+        user_id: Optional[int] = None,
+        ran_before: Optional[datetime] = None
+    ) -> AsyncIterator[List[MonitorConfig]]:
+        """
+        按 ID 升序分块遍历启用且未删除的监控配置
+
+        使用 id > 上一块最大 ID 的键集分页，每块一次查询，不会一次性加载全部配置。
+
+        Args:
+            chunk_size: 每块数量
+            user_id: 用户 ID（可选，为空时遍历所有用户）
+            ran_before: 只遍历从未执行或最后执行时间早于该时间的配置（可选）
+
+        Yields:
+            监控配置列表
+        """
+        query = self.model.filter(is_active=1, deleted_at__isnull=True)
+        if user_id is not None:
+            query = query.filter(user_id=user_id)
+        if ran_before is not None:
+            query = query.filter(Q(last_run_at__isnull=True) | Q(last_run_at__lt=ran_before))
+
+        last_id = 0
+        while True:
+            chunk = await query.filter(id__gt=last_id).order_by("id").limit(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            last_id = chunk[-1].id
+
+    async def bulk_update_last_run(
+        self,
+        config_ids: Iterable[int],
+        last_run_at: datetime,
+        last_run_status: int
+    ) -> int:
+        """
+        批量更新最后执行信息（一条 UPDATE ... WHERE id IN）
+
+        Args:
+            config_ids: 配置 ID 列表
+            last_run_at: 最后执行时间
+            last_run_status: 最后执行状态
+
+        Returns:
+            更新的记录数量
+        """
+        config_ids = list(config_ids)
+        if not config_ids:
+            return 0
+        return await self.model.filter(id__in=config_ids).update(
+            last_run_at=last_run_at,
+            last_run_status=last_run_status
+        )
+
 
 # 创建单例实例
 monitor_config_repository = MonitorConfigRepository()
@@ -2,11 +2,18 @@
 监控每日数据仓储类
 封装监控每日数据相关的所有数据访问操作
 """
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Tuple
 from datetime import date
 
+from tortoise.transactions import in_transaction
+
+from app.core.config import settings
 from app.repositories.base import BaseRepository
 from app.models.monitor.monitor_daily_stats import MonitorDailyStats
+from app.repositories.monitor.monitor_stats_rollup_repository import refresh_stats_rollups
+
+# 批量 upsert 时冲突后更新的指标字段
+STATS_METRIC_FIELDS = ["follower_count", "liked_count", "view_count", "content_count"]
 
 
 class MonitorDailyStatsRepository(BaseRepository[MonitorDailyStats]):
@@ -43,6 +50,42 @@ class MonitorDailyStatsRepository(BaseRepository[MonitorDailyStats]):
             stat_date__lte=end_date
         ).order_by("stat_date").all()
 
+    async def find_metrics_by_configs(
+        self,
+        config_ids: List[int],
+        start_date: date,
+        end_date: date
+    ) -> List[Tuple]:
+        """
+        批量查询多个配置在日期范围内的指标（一次查询，只读取指标列）
+
+        Args:
+            config_ids: 配置 ID 列表
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            (config_id, stat_date, follower_count, liked_count, view_count, content_count) 元组列表，按日期升序排列
+        """
+        return await self.model.filter(
+            config_id__in=config_ids,
+            stat_date__gte=start_date,
+            stat_date__lte=end_date
+        ).order_by("stat_date").values_list("config_id", "stat_date", *STATS_METRIC_FIELDS)
+
+    async def find_latest_before(self, config_id: int, before: date) -> Optional[MonitorDailyStats]:
+        """
+        查询配置在指定日期之前的最后一条数据
+
+        Args:
+            config_id: 配置 ID
+            before: 截止日期（不含）
+
+        Returns:
+            每日数据实例，如果不存在则返回 None
+        """
+        return await self.model.filter(config_id=config_id, stat_date__lt=before).order_by("-stat_date").first()
+
     async def find_by_config_and_date(
         self,
         config_id: int,
@@ -143,7 +186,7 @@ class MonitorDailyStatsRepository(BaseRepository[MonitorDailyStats]):
         extra_data: Optional[Dict[str, Any]] = None
     ) -> MonitorDailyStats:
         """
-        创建或更新每日数据（如果已存在则更新）
+        创建或更新每日数据（如果已存在则更新），并在同一事务中刷新所在周期的周 / 月汇总
 
         Args:
             config_id: 配置 ID
@@ -157,29 +200,110 @@ class MonitorDailyStatsRepository(BaseRepository[MonitorDailyStats]):
         Returns:
             每日数据实例
         """
-        stats = await self.find_by_config_and_date(config_id, stat_date)
-
-        if stats:
-            # 更新已存在的记录
-            return await self.update_daily_stats(
-                stats,
-                follower_count=follower_count,
-                liked_count=liked_count,
-                view_count=view_count,
-                content_count=content_count,
-                extra_data=extra_data
+        async with in_transaction():
+            stats = await self.find_by_config_and_date(config_id, stat_date)
+
+            if stats:
+                # 更新已存在的记录
+                stats = await self.update_daily_stats(
+                    stats,
+                    follower_count=follower_count,
+                    liked_count=liked_count,
+                    view_count=view_count,
+                    content_count=content_count,
+                    extra_data=extra_data
+                )
+            else:
+                # 创建新记录
+                stats = await self.create_daily_stats(
+                    config_id=config_id,
+                    stat_date=stat_date,
+                    follower_count=follower_count,
+                    liked_count=liked_count,
+                    view_count=view_count,
+                    content_count=content_count,
+                    extra_data=extra_data
+                )
+
+            await refresh_stats_rollups([(config_id, stat_date)])
+            return stats
+
+    async def bulk_upsert_daily_stats(
+        self,
+        records: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        批量创建或更新每日数据
+
+        依赖 uk_config_date 唯一约束，每块生成多行 INSERT ... ON DUPLICATE KEY UPDATE
+        （SQLite / PostgreSQL 为 ON CONFLICT DO UPDATE）。每块先用一次查询确定已存在的记录，
+        用于统计新增/更新数量，并刷新受影响周期的周 / 月汇总，整块在同一事务中完成。
+
+        指标或 extra_data 为 None（数据源不提供）时：新记录按默认值写入，已有记录保留原值，
+        避免覆盖真实数据后在周 / 月汇总中产生虚假的负增量。记录按提供了值的字段分组，
+        每组一条语句（同一数据源的记录字段一致，通常每块只有一组）；
+        同一块内 (config_id, stat_date) 重复的记录以最后一条为准。
+
+        Args:
+            records: 记录列表，每条包含 config_id、stat_date 及可选的指标字段和 extra_data（None 表示不更新）
+            batch_size: 每块记录数，默认读取配置
+
+        Returns:
+            {"inserted": 新增数量, "updated": 更新数量}
+        """
+        batch_size = batch_size or settings.monitor_stats_upsert_batch_size
+        result = {"inserted": 0, "updated": 0}
+
+        chunk: Dict[Tuple[int, date], Dict[str, Any]] = {}
+        for record in records:
+            chunk[(record["config_id"], record["stat_date"])] = record
+            if len(chunk) >= batch_size:
+                await self._upsert_chunk(chunk, result)
+                chunk = {}
+        if chunk:
+            await self._upsert_chunk(chunk, result)
+
+        return result
+
+    async def _upsert_chunk(
+        self,
+        chunk: Dict[Tuple[int, date], Dict[str, Any]],
+        result: Dict[str, int]
+    ) -> None:
+        """写入一块记录并累加新增/更新数量"""
+        config_ids = {config_id for config_id, _ in chunk}
+        stat_dates = {stat_date for _, stat_date in chunk}
+
+        # 按提供了值的字段分组：新记录未提供的字段按默认值写入，已有记录只更新提供了值的字段
+        groups: Dict[Tuple[str, ...], List[MonitorDailyStats]] = {}
+        for (config_id, stat_date), record in chunk.items():
+            provided = tuple(
+                field for field in STATS_METRIC_FIELDS + ["extra_data"] if record.get(field) is not None
             )
-        else:
-            # 创建新记录
-            return await self.create_daily_stats(
+            groups.setdefault(provided, []).append(self.model(
                 config_id=config_id,
                 stat_date=stat_date,
-                follower_count=follower_count,
-                liked_count=liked_count,
-                view_count=view_count,
-                content_count=content_count,
-                extra_data=extra_data
-            )
+                **{field: record[field] for field in provided}
+            ))
+
+        async with in_transaction():
+            existing = await self.model.filter(
+                config_id__in=config_ids, stat_date__in=stat_dates
+            ).values_list("config_id", "stat_date")
+            updated = len(set(existing) & chunk.keys())
+
+            for provided, instances in groups.items():
+                await self.bulk_upsert(
+                    instances,
+                    conflict_fields=["config_id", "stat_date"],
+                    update_fields=list(provided) + ["updated_at"]
+                )
+
+            await refresh_stats_rollups(chunk.keys())
+
+        result["updated"] += updated
+        result["inserted"] += len(chunk) - updated
 
 
 # 创建单例实例
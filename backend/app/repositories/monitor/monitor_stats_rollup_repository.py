@@ -0,0 +1,274 @@
+"""
+监控周期汇总数据仓储类
+封装每周 / 每月汇总数据的查询和增量维护
+"""
+from datetime import date, timedelta
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from tortoise.expressions import Q
+from tortoise.functions import Max, Min
+from tortoise.transactions import in_transaction
+
+from app.core.config import settings
+from app.core.logging import log
+from app.enums.monitor.stats_granularity import StatsGranularityEnum
+from app.models.monitor.monitor_daily_stats import MonitorDailyStats
+from app.models.monitor.monitor_stats_rollup import MonitorMonthlyStats, MonitorStatsRollup, MonitorWeeklyStats
+from app.repositories.base import BaseRepository
+
+# 汇总的指标字段（期末值字段，对应的增量字段为 xxx_delta）
+ROLLUP_METRIC_FIELDS = ["follower_count", "liked_count", "view_count", "content_count"]
+ROLLUP_DELTA_FIELDS = [field.replace("_count", "_delta") for field in ROLLUP_METRIC_FIELDS]
+
+# 重新计算后覆盖的字段
+_ROLLUP_UPDATE_FIELDS = (
+    ["period_end", "last_stat_date", "days_count"] + ROLLUP_METRIC_FIELDS + ROLLUP_DELTA_FIELDS + ["updated_at"]
+)
+
+# 每日数据行: (config_id, stat_date, follower_count, liked_count, view_count, content_count)
+DailyRow = Tuple
+
+
+class MonitorStatsRollupRepository(BaseRepository[MonitorStatsRollup]):
+    """
+    监控周期汇总数据仓储类
+
+    每个实例对应一种粒度（周 / 月）的汇总表
+    """
+
+    def __init__(self, model: Type[MonitorStatsRollup], granularity: StatsGranularityEnum):
+        """
+        初始化周期汇总数据仓储
+
+        Args:
+            model: 汇总数据模型
+            granularity: 汇总粒度
+        """
+        super().__init__(model)
+        self.granularity = granularity
+
+    async def find_by_config_and_date_range(
+        self,
+        config_id: int,
+        start_date: date,
+        end_date: date
+    ) -> List[MonitorStatsRollup]:
+        """
+        根据配置 ID 和日期范围查询汇总数据
+
+        Args:
+            config_id: 配置 ID
+            start_date: 开始日期（所在周期整体包含在内）
+            end_date: 结束日期
+
+        Returns:
+            汇总数据列表，按周期升序排列
+        """
+        return await self.model.filter(
+            config_id=config_id,
+            period_start__gte=self.granularity.period_start(start_date),
+            period_start__lte=end_date
+        ).order_by("period_start").all()
+
+    async def find_metrics_by_configs(
+        self,
+        config_ids: List[int],
+        start_date: date,
+        end_date: date
+    ) -> List[Tuple]:
+        """
+        批量查询多个配置在日期范围内的期末指标（一次查询，只读取指标列）
+
+        Args:
+            config_ids: 配置 ID 列表
+            start_date: 开始日期（所在周期整体包含在内）
+            end_date: 结束日期
+
+        Returns:
+            (config_id, period_start, follower_count, liked_count, view_count, content_count) 元组列表，按周期升序排列
+        """
+        return await self.model.filter(
+            config_id__in=config_ids,
+            period_start__gte=self.granularity.period_start(start_date),
+            period_start__lte=end_date
+        ).order_by("period_start").values_list("config_id", "period_start", *ROLLUP_METRIC_FIELDS)
+
+    async def refresh(self, keys: Iterable[Tuple[int, date]]) -> int:
+        """
+        重新计算受每日数据变更影响的汇总周期
+
+        受影响的周期为变更日期所在周期，以及其后第一个有数据的周期（其增量以变更周期的期末值为基线，
+        中间可能隔着没有数据的周期）。按配置分别读取其变更周期范围内的每日数据、范围之前的最后一条作为基线，
+        以及范围之后第一个有数据的周期，计算结果通过一次批量 upsert 写入。
+        需要与每日数据写入处于同一事务中调用。
+
+        Args:
+            keys: 发生变更的 (config_id, stat_date) 列表
+
+        Returns:
+            写入的汇总记录数
+        """
+        affected: Dict[int, Set[date]] = {}
+        for config_id, stat_date in keys:
+            affected.setdefault(config_id, set()).add(self.granularity.period_start(stat_date))
+        if not affected:
+            return 0
+
+        # 每个配置单独计算读取范围，避免不同配置的变更日期相距较远时读取大量无关数据
+        windows: Dict[int, Tuple[date, date]] = {
+            config_id: (min(starts), self.granularity.next_period_start(max(starts)))
+            for config_id, starts in affected.items()
+        }
+
+        rows = await MonitorDailyStats.filter(Q(
+            *[
+                Q(config_id=config_id, stat_date__gte=window_start, stat_date__lt=window_end)
+                for config_id, (window_start, window_end) in windows.items()
+            ],
+            join_type="OR"
+        )).values_list("config_id", "stat_date", *ROLLUP_METRIC_FIELDS)
+        rows = list(rows) + await self._find_following_period_rows(
+            {config_id: window_end for config_id, (_, window_end) in windows.items()}
+        )
+        rows.sort(key=lambda row: (row[0], row[1]))
+        baselines = await self._find_baselines(
+            {config_id: window_start for config_id, (window_start, _) in windows.items()}
+        )
+
+        instances = []
+        for config_id, config_rows in groupby(rows, key=lambda row: row[0]):
+            starts = affected[config_id]
+            baseline = baselines.get(config_id)
+            # 上一个有数据的周期发生了变更，本周期的基线随之变化
+            follows_changed = False
+            for period_start, period_rows in groupby(config_rows, key=lambda row: self.granularity.period_start(row[1])):
+                period_rows = list(period_rows)
+                if period_start in starts or follows_changed:
+                    instances.append(self._build(config_id, period_start, period_rows, baseline or period_rows[0]))
+                follows_changed = period_start in starts
+                baseline = period_rows[-1]
+
+        await self.bulk_upsert(
+            instances,
+            conflict_fields=["config_id", "period_start"],
+            update_fields=_ROLLUP_UPDATE_FIELDS
+        )
+        return len(instances)
+
+    async def _find_following_period_rows(self, after: Dict[int, date]) -> List[DailyRow]:
+        """查询每个配置在各自指定日期（含）之后第一个有数据的周期内的每日数据"""
+        first_dates = await MonitorDailyStats.filter(Q(
+            *[Q(config_id=config_id, stat_date__gte=after_date) for config_id, after_date in after.items()],
+            join_type="OR"
+        )).annotate(first_date=Min("stat_date")).group_by("config_id").values_list("config_id", "first_date")
+        if not first_dates:
+            return []
+
+        conditions = []
+        for config_id, first_date in first_dates:
+            period_start = self.granularity.period_start(first_date)
+            conditions.append(Q(
+                config_id=config_id,
+                stat_date__gte=period_start,
+                stat_date__lt=self.granularity.next_period_start(period_start)
+            ))
+        return list(await MonitorDailyStats.filter(Q(*conditions, join_type="OR")).values_list(
+            "config_id", "stat_date", *ROLLUP_METRIC_FIELDS
+        ))
+
+    def _build(
+        self,
+        config_id: int,
+        period_start: date,
+        period_rows: List[DailyRow],
+        baseline: DailyRow
+    ) -> MonitorStatsRollup:
+        """根据周期内的每日数据和基线生成汇总记录"""
+        last = period_rows[-1]
+        return self.model(
+            config_id=config_id,
+            period_start=period_start,
+            period_end=self.granularity.next_period_start(period_start) - timedelta(days=1),
+            last_stat_date=last[1],
+            days_count=len(period_rows),
+            **dict(zip(ROLLUP_METRIC_FIELDS, last[2:])),
+            **{delta: (last[i] or 0) - (baseline[i] or 0) for i, delta in enumerate(ROLLUP_DELTA_FIELDS, start=2)}
+        )
+
+    @staticmethod
+    async def _find_baselines(before: Dict[int, date]) -> Dict[int, DailyRow]:
+        """查询每个配置在各自指定日期之前的最后一条每日数据"""
+        last_dates = await MonitorDailyStats.filter(Q(
+            *[Q(config_id=config_id, stat_date__lt=before_date) for config_id, before_date in before.items()],
+            join_type="OR"
+        )).annotate(last_date=Max("stat_date")).group_by("config_id").values_list("config_id", "last_date")
+        if not last_dates:
+            return {}
+
+        wanted = set(last_dates)
+        rows = await MonitorDailyStats.filter(
+            config_id__in=[config_id for config_id, _ in last_dates],
+            stat_date__in={last_date for _, last_date in last_dates}
+        ).values_list("config_id", "stat_date", *ROLLUP_METRIC_FIELDS)
+        return {row[0]: row for row in rows if (row[0], row[1]) in wanted}
+
+
+# 创建单例实例
+monitor_weekly_stats_repository = MonitorStatsRollupRepository(MonitorWeeklyStats, StatsGranularityEnum.WEEK)
+monitor_monthly_stats_repository = MonitorStatsRollupRepository(MonitorMonthlyStats, StatsGranularityEnum.MONTH)
+
+# 按粒度查找汇总仓储
+ROLLUP_REPOSITORIES: Dict[StatsGranularityEnum, MonitorStatsRollupRepository] = {
+    StatsGranularityEnum.WEEK: monitor_weekly_stats_repository,
+    StatsGranularityEnum.MONTH: monitor_monthly_stats_repository,
+}
+
+
+async def refresh_stats_rollups(keys: Iterable[Tuple[int, date]]) -> None:
+    """
+    按每日数据变更刷新全部粒度的汇总数据
+
+    Args:
+        keys: 发生变更的 (config_id, stat_date) 列表
+    """
+    keys = list(keys)
+    for repository in ROLLUP_REPOSITORIES.values():
+        await repository.refresh(keys)
+
+
+async def find_configs_missing_rollups() -> List[int]:
+    """
+    查询有每日数据但缺少周 / 月汇总的配置（如汇总表上线前的历史数据）
+
+    Returns:
+        配置 ID 列表，按 ID 升序排列
+    """
+    daily_ids = set(await MonitorDailyStats.all().distinct().values_list("config_id", flat=True))
+    missing = set()
+    for repository in ROLLUP_REPOSITORIES.values():
+        rolled_ids = set(await repository.model.all().distinct().values_list("config_id", flat=True))
+        missing |= daily_ids - rolled_ids
+    return sorted(missing)
+
+
+async def rebuild_stats_rollups(config_ids: Iterable[int], batch_size: Optional[int] = None) -> int:
+    """
+    按全部每日数据重建指定配置的周 / 月汇总（可重复执行）
+
+    Args:
+        config_ids: 配置 ID 列表
+        batch_size: 每批处理的配置数量，默认读取配置
+
+    Returns:
+        处理的配置数量
+    """
+    batch_size = batch_size or settings.monitor_rollup_rebuild_batch_size
+    config_ids = list(config_ids)
+    for offset in range(0, len(config_ids), batch_size):
+        batch = config_ids[offset:offset + batch_size]
+        async with in_transaction():
+            keys = await MonitorDailyStats.filter(config_id__in=batch).values_list("config_id", "stat_date")
+            await refresh_stats_rollups(keys)
+        log.info(f"周/月汇总重建进度: {min(offset + batch_size, len(config_ids))}/{len(config_ids)}")
+    return len(config_ids)
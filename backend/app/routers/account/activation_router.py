@@ -73,4 +73,4 @@ async def get_paginated_activation_codes(params: ActivationCodeQueryRequest):
     获取激活码列表（分页+条件查询）
     """
     query = activation_service.get_activation_code_list(params)
-    return await paginated_response(query, params)
+    return await paginated_response(query, params, cache_count=True, schema=ActivationCodeResponse)
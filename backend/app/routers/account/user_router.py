@@ -50,4 +50,4 @@ async def get_paginated_users(params: UserQueryRequest):
     获取用户列表（分页+条件查询）
     """
     query = user_service.get_user_list(params)
-    return await paginated_response(query, params)
+    return await paginated_response(query, params, cache_count=True, schema=UserResponse)
@@ -7,7 +7,11 @@ from app.schemas.monitor.monitor import (
     MonitorConfigQueryRequest,
     MonitorConfigResponse,
     MonitorDailyStatsQueryRequest,
-    MonitorDailyStatsResponse
+    MonitorDailyStatsResponse,
+    MonitorStatsTrendQueryRequest,
+    MonitorStatsTrendResponse,
+    MonitorStatsBatchQueryRequest,
+    MonitorStatsBatchResponse
 )
 from app.schemas.common.pagination import PageResponse
 from app.schemas.common.response import ApiResponse, success_response, paginated_response
@@ -41,7 +45,7 @@ async def get_monitor_config_list(
     分页查询监控配置列表（支持多维度筛选）
     """
     query = monitor_service.get_monitor_config_queryset(user_id, params)
-    return await paginated_response(query, params)
+    return await paginated_response(query, params, cache_count=True, schema=MonitorConfigResponse)
 
 
 @router.post("/config/update", response_model=ApiResponse[MonitorConfigResponse], summary="修改监控配置")
@@ -102,3 +106,37 @@ async def get_daily_stats(
     """
     result = await monitor_service.get_daily_stats(user_id, request)
     return success_response(data=result)
+
+
+@router.post("/stats/trend", response_model=ApiResponse[MonitorStatsTrendResponse], summary="查询趋势数据")
+async def get_stats_trend(
+    request: MonitorStatsTrendQueryRequest,
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    按指定分辨率查询趋势数据（期末值 + 增量），长区间自动使用周 / 月汇总
+
+    - **config_id**: 配置ID
+    - **start_date**: 开始日期
+    - **end_date**: 结束日期
+    - **resolution_days**: 每个数据点允许覆盖的最大天数（1:日 7~30:周 ≥31:月）
+    """
+    result = await monitor_service.get_stats_trend(user_id, request)
+    return success_response(data=result)
+
+
+@router.post("/stats/batch", response_model=ApiResponse[MonitorStatsBatchResponse], summary="批量查询多个配置的数据")
+async def get_batch_stats(
+    request: MonitorStatsBatchQueryRequest,
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    一次请求查询多个配置的数据（用于看板），列式返回：共用一个日期数组，每个配置返回各指标数组
+
+    - **config_ids**: 配置ID列表（最多100个）
+    - **start_date**: 开始日期
+    - **end_date**: 结束日期
+    - **resolution_days**: 每个数据点允许覆盖的最大天数（1:日 7~30:周 ≥31:月）
+    """
+    result = await monitor_service.get_batch_stats(user_id, request)
+    return success_response(data=result)
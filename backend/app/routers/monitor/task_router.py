@@ -14,4 +14,4 @@ async def get_monitor_task_list(params: MonitorTaskQueryRequest):
     分页查询任务列表（支持多维度筛选）
     """
     query = task_service.get_monitor_task_queryset(params)
-    return await paginated_response(query, params)
+    return await paginated_response(query, params, cache_count=True, schema=MonitorTaskResponse)
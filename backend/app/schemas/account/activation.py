@@ -12,7 +12,7 @@ class ActivationCodeCreateItem(BaseRequestModel):
     """单个激活码创建项"""
     type: int = Field(..., ge=0, le=3,
                       description=f"激活码类型：{', '.join([f'{e.code}：{e.desc}' for e in ActivationTypeEnum])}")
-    count: int = Field(..., ge=1, le=1000, description="生成数量")
+    count: int = Field(..., ge=1, le=100000, description="生成数量")
 
 
 class ActivationCodeBatchCreateRequest(BaseRequestModel):
@@ -44,6 +44,8 @@ class ActivationCodeBatchResponse(BaseResponseModel):
     results: List[ActivationCodeTypeResult] = Field(..., description="各类型激活码结果")
     total_count: int = Field(..., description="总数量")
     summary: Dict[str, int] = Field(..., description="各类型数量汇总")
+    elapsed_ms: int = Field(0, description="生成耗时（毫秒）")
+    codes_per_second: float = Field(0, description="生成吞吐量（个/秒）")
 
 
 class ActivationCodeGetRequest(BaseRequestModel):
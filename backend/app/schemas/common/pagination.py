@@ -1,8 +1,9 @@
-from typing import Generic, TypeVar, List
+from typing import Generic, TypeVar, List, Optional
 
-from pydantic import Field
+from pydantic import Field, field_validator
 
 from app.schemas.common.base import BaseRequestModel, BaseResponseModel
+from app.util.pagination import decode_cursor
 
 T = TypeVar('T')
 
@@ -11,18 +12,36 @@ class PageRequest(BaseRequestModel):
     """分页请求参数模型"""
     page: int = Field(1, ge=1, description="当前页码，从1开始")
     size: int = Field(10, ge=1, le=100, description="每页数量，最大100")
+    cursor_mode: bool = Field(False, description="是否使用游标分页（按创建时间倒序，适合深度翻页）")
+    cursor: Optional[str] = Field(None, description="游标，传入上一页返回的 next_cursor；传入时自动启用游标分页")
+    count_mode: int = Field(1, ge=1, le=3, description="总数统计方式（1:精确 2:估算 3:不统计）")
+
+    @field_validator('cursor')
+    @classmethod
+    def validate_cursor(cls, v: Optional[str]) -> Optional[str]:
+        """游标格式校验"""
+        if v:
+            decode_cursor(v)
+        return v
+
+    @property
+    def use_cursor(self) -> bool:
+        """是否使用游标分页"""
+        return self.cursor_mode or bool(self.cursor)
 
     @property
     def offset(self) -> int:
         """计算数据库查询的偏移量，增加上限保护"""
         offset = (self.page - 1) * self.size
-        return min(offset, 100000)  # 限制最大偏移量为100000，避免过大偏移
+        return min(offset, 100000)  # 限制最大偏移量为100000，避免过大偏移；深度翻页请使用游标分页
 
 
 class PageResponse(BaseResponseModel, Generic[T]):
     """分页数据模型，不包含外层的 success/message"""
-    total: int = Field(..., description="总记录数")
+    total: Optional[int] = Field(..., description="总记录数（不统计时为空，估算时为近似值）")
     page: int = Field(..., description="当前页码")
     size: int = Field(..., description="每页数量")
-    pages: int = Field(..., description="总页数")
+    pages: Optional[int] = Field(..., description="总页数（不统计时为空）")
     items: List[T] = Field(..., description="当前页的数据列表")
+    next_cursor: Optional[str] = Field(None, description="下一页游标（仅游标分页返回）")
+    has_more: Optional[bool] = Field(None, description="是否还有下一页（仅游标分页返回）")
@@ -1,11 +1,14 @@
+import asyncio
 from datetime import datetime
-from typing import Generic, TypeVar, Optional
+from typing import Generic, TypeVar, Optional, List, Tuple, Type
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 from tortoise.queryset import QuerySet
 
+from app.repositories.base import ModelProjection
 from app.schemas.common.base import BaseResponseModel
 from app.schemas.common.pagination import PageResponse, PageRequest
+from app.util.pagination import apply_cursor, count_total, cursor_of
 
 T = TypeVar('T')
 
@@ -38,32 +41,74 @@ def error_response(message: str = "操作失败", code: int = 500) -> ApiRespons
     )
 
 
+async def _fetch_page(
+        query: QuerySet,
+        params: PageRequest,
+        projection: Optional[ModelProjection] = None
+) -> Tuple[List, Optional[str], Optional[bool]]:
+    """
+    查询当前页数据
+
+    Returns:
+        (当前页数据, 下一页游标, 是否还有下一页)，偏移分页时后两项为 None
+    """
+    async def fetch(page_query: QuerySet) -> List:
+        return await projection.fetch(page_query) if projection else await page_query
+
+    if not params.use_cursor:
+        return await fetch(query.offset(params.offset).limit(params.size)), None, None
+
+    # 多取一条判断是否还有下一页
+    rows = await fetch(apply_cursor(query, params.cursor).limit(params.size + 1))
+    has_more = len(rows) > params.size
+    items = rows[:params.size]
+    next_cursor = cursor_of(items[-1]) if has_more else None
+    return items, next_cursor, has_more
+
+
 async def paginated_response(
         query: QuerySet,
-        params: PageRequest
+        params: PageRequest,
+        cache_count: bool = False,
+        schema: Optional[Type[BaseModel]] = None
 ) -> ApiResponse[PageResponse[T]]:
     """
     创建分页响应的工具函数
 
+    支持两种分页方式：
+    - 偏移分页（默认）：OFFSET/LIMIT，按 page 翻页
+    - 游标分页（cursor_mode 或传入 cursor）：按 (created_at, id) 倒序定位，
+      深度翻页性能稳定，通过 next_cursor 获取下一页
+
+    总数统计与当前页查询并发执行（各自从连接池获取连接）
+
     Args:
         query: TortoiseORM 的 QuerySet
         params: 分页参数对象
+        cache_count: 是否缓存总数。开启后第一页重新统计，后续翻页在有效期内复用同条件的总数
+        schema: 响应模型。传入时只查询该模型需要的列，返回字典而非 Model 实例
 
     Returns:
         包装在 ApiResponse 中的 PageResponse
     """
-    total = await query.count()
-    items = await query.offset(params.offset).limit(params.size)
+    first_page = not params.cursor if params.use_cursor else params.page == 1
+    projection = ModelProjection.of(query.model, schema) if schema else None
+    total, (items, next_cursor, has_more) = await asyncio.gather(
+        count_total(query, params.count_mode, use_cache=cache_count, refresh=first_page),
+        _fetch_page(query, params, projection)
+    )
 
     # 计算总页数
-    pages = (total + params.size - 1) // params.size
+    pages = None if total is None else (total + params.size - 1) // params.size
 
     paginated_data = PageResponse[T](
         total=total,
         page=params.page,
         size=params.size,
         pages=pages,
-        items=items
+        items=items,
+        next_cursor=next_cursor,
+        has_more=has_more
     )
 
     return success_response(data=paginated_data)
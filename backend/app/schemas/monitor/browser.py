@@ -26,6 +26,8 @@ class BrowserOpenRequest(BaseModel):
     args: Optional[List[str]] = Field([], description="浏览器启动参数")
     ignoreDefaultUrls: Optional[bool] = Field(False, description="忽略已同步URL")
     newPageUrl: Optional[str] = Field("", description="指定打开URL")
+    concurrency: Optional[int] = Field(None, ge=1, le=20, description="并发打开数量（不传使用默认配置）")
+    max_retries: Optional[int] = Field(None, ge=0, le=5, description="单个窗口失败重试次数（不传使用默认配置）")
 
 
 class BrowserCloseRequest(BaseModel):
@@ -70,6 +72,8 @@ class BatchOpenResult(BaseResponseModel):
     success: bool = Field(..., description="是否成功")
     data: Optional[BrowserOpenResponse] = Field(None, description="成功时的响应数据")
     error: Optional[str] = Field(None, description="失败时的错误信息")
+    attempts: int = Field(1, description="尝试次数")
+    latency_ms: int = Field(0, description="最后一次打开请求耗时（毫秒）")
 
 
 class BrowserBatchOpenResponse(BaseResponseModel):
@@ -78,6 +82,8 @@ class BrowserBatchOpenResponse(BaseResponseModel):
     total: int = Field(..., description="总数量")
     success_count: int = Field(..., description="成功数量")
     fail_count: int = Field(..., description="失败数量")
+    concurrency: int = Field(1, description="本次使用的并发数")
+    elapsed_ms: int = Field(0, description="批量打开总耗时（毫秒）")
 
 
 class BrowserDetailResponse(BaseResponseModel):
@@ -1,5 +1,5 @@
 from datetime import datetime, date
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from pydantic import Field, model_validator
 
@@ -88,3 +88,65 @@ class MonitorDailyStatsResponse(BaseResponseModel):
     content_count: int = Field(..., description="内容数")
     extra_data: Optional[Dict[str, Any]] = Field(None, description="扩展数据")
     created_at: datetime = Field(..., description="创建时间")
+
+
+# ============ 趋势数据相关 ============
+
+class MonitorStatsTrendQueryRequest(MonitorDailyStatsQueryRequest):
+    """趋势数据查询请求"""
+    resolution_days: int = Field(1, ge=1, description="每个数据点允许覆盖的最大天数，按不超过该值的最粗粒度（日/周/月）返回")
+
+
+class MonitorStatsPointResponse(BaseResponseModel):
+    """趋势数据点响应"""
+    period_start: date = Field(..., description="周期开始日期")
+    period_end: date = Field(..., description="周期结束日期")
+    last_stat_date: date = Field(..., description="期末数据对应的统计日期")
+    follower_count: int = Field(..., description="期末粉丝数")
+    liked_count: int = Field(..., description="期末获赞数")
+    view_count: int = Field(..., description="期末播放量")
+    content_count: int = Field(..., description="期末内容数")
+    follower_delta: int = Field(..., description="粉丝增量")
+    liked_delta: int = Field(..., description="获赞增量")
+    view_delta: int = Field(..., description="播放增量")
+    content_delta: int = Field(..., description="内容增量")
+
+
+class MonitorStatsTrendResponse(BaseResponseModel):
+    """趋势数据响应"""
+    config_id: int = Field(..., description="配置ID")
+    granularity: int = Field(..., description="数据粒度 1:日 2:周 3:月")
+    points: List[MonitorStatsPointResponse] = Field(default_factory=list, description="数据点，按周期升序排列")
+
+
+# ============ 多配置批量查询相关 ============
+
+class MonitorStatsBatchQueryRequest(BaseRequestModel):
+    """多配置数据批量查询请求"""
+    config_ids: List[int] = Field(..., min_length=1, max_length=100, description="配置ID列表")
+    start_date: date = Field(..., description="开始日期")
+    end_date: date = Field(..., description="结束日期")
+    resolution_days: int = Field(1, ge=1, description="每个数据点允许覆盖的最大天数，按不超过该值的最粗粒度（日/周/月）返回")
+
+    @model_validator(mode='after')
+    def validate_date_range(self):
+        """验证日期区间"""
+        if self.start_date > self.end_date:
+            raise ValueError("开始日期不能大于结束日期")
+        return self
+
+
+class MonitorStatsSeriesResponse(BaseResponseModel):
+    """单个配置的指标序列，与 dates 按下标一一对应，缺失数据为 null"""
+    config_id: int = Field(..., description="配置ID")
+    follower_count: List[Optional[int]] = Field(..., description="粉丝数序列")
+    liked_count: List[Optional[int]] = Field(..., description="获赞数序列")
+    view_count: List[Optional[int]] = Field(..., description="播放量序列")
+    content_count: List[Optional[int]] = Field(..., description="内容数序列")
+
+
+class MonitorStatsBatchResponse(BaseResponseModel):
+    """多配置数据批量查询响应（列式）"""
+    granularity: int = Field(..., description="数据粒度 1:日 2:周 3:月")
+    dates: List[date] = Field(default_factory=list, description="统计日期（周/月粒度为周期开始日期），升序")
+    series: List[MonitorStatsSeriesResponse] = Field(default_factory=list, description="各配置的指标序列，顺序与请求一致")
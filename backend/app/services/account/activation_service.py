@@ -1,12 +1,15 @@
-from datetime import datetime
-from typing import List
+import time
+from typing import List, Set
+
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
 
 from app.core.config import settings
 from app.core.exceptions import BusinessException
 from app.core.logging import log
 from app.enums.account.activation_type import ActivationTypeEnum
 from app.enums.account.activation_status import ActivationCodeStatusEnum
-from app.repositories.account.activation_repository import activation_repository
+from app.repositories.account.activation_repository import ActivationCodeClaimConflict, activation_repository
 from app.schemas.account.activation import (
     ActivationCodeBatchCreateRequest,
     ActivationCodeBatchResponse,
@@ -21,17 +24,77 @@ from app.util.activation_code_generator import code_generator
 class ActivationCodeService:
     """激活码服务类"""
 
-    async def _generate_unique_code(self) -> str:
+    # 批量写入撞码（并发生成）时整块重试的最大次数
+    _MAX_CHUNK_RETRIES = 3
+
+    async def _generate_unique_chunk(self, size: int, exclude: Set[str]) -> List[str]:
+        """
+        批量生成一块唯一的激活码
+
+        先在内存中生成候选码，再用一次 IN 查询排除库中已存在的码，直到凑满 size 个
+
+        Args:
+            size: 需要的数量
+            exclude: 本次已生成的激活码（避免块之间重复）
+
+        Returns:
+            唯一的激活码列表
+        """
+        chunk = {}
+        while len(chunk) < size:
+            candidates = [
+                code for code in code_generator.generate_batch(size - len(chunk))
+                if code not in exclude and code not in chunk
+            ]
+            existing = await activation_repository.find_existing_codes(candidates)
+            for code in candidates:
+                if code not in existing:
+                    chunk[code] = None
+        return list(chunk)
+
+    async def _mint_activation_codes(self, type_code: int, count: int) -> List[str]:
         """
-        生成唯一的激活码
+        批量生成并写入指定类型的激活码
+
+        按 activation_code_batch_size 分块：每块批量生成 → 一次 IN 查重 → 事务内 bulk_create，
+        每块仅 2 次数据库往返
+
+        Args:
+            type_code: 激活码类型
+            count: 生成数量
 
         Returns:
-            唯一的激活码字符串
+            生成的激活码列表
+
+        Raises:
+            BusinessException: 多次撞码写入失败
         """
-        while True:
-            code = code_generator.generate()
-            if not await activation_repository.code_exists(code):
-                return code
+        batch_size = max(1, settings.activation_code_batch_size)
+        minted: List[str] = []
+        minted_set: Set[str] = set()
+        retries = 0
+
+        while len(minted) < count:
+            chunk = await self._generate_unique_chunk(min(batch_size, count - len(minted)), minted_set)
+            try:
+                async with in_transaction():
+                    await activation_repository.bulk_create_activation_codes(
+                        chunk,
+                        type_code=type_code,
+                        status=ActivationCodeStatusEnum.UNUSED.code
+                    )
+            except IntegrityError as e:
+                # 查重与写入之间被并发请求抢先写入了相同的码，整块重新生成
+                retries += 1
+                log.warning(f"批量写入激活码冲突，第{retries}次重试: {e}")
+                if retries > self._MAX_CHUNK_RETRIES:
+                    raise BusinessException(message="激活码生成冲突，请稍后重试")
+                continue
+
+            minted.extend(chunk)
+            minted_set.update(chunk)
+
+        return minted
 
     async def init_activation_codes(self, request: ActivationCodeBatchCreateRequest) -> ActivationCodeBatchResponse:
         """
@@ -48,6 +111,7 @@ class ActivationCodeService:
         results = []
         total_count = 0
         summary = {}
+        start = time.perf_counter()
 
         for item in request.items:
             type_enum = ActivationTypeEnum.from_code(item.type)
@@ -55,18 +119,7 @@ class ActivationCodeService:
 
             log.info(f"生成{type_name}激活码，数量：{item.count}")
 
-            activation_codes = []
-
-            for i in range(item.count):
-                code = await self._generate_unique_code()
-                await activation_repository.create_activation_code(
-                    activation_code=code,
-                    type_code=item.type,
-                    status=ActivationCodeStatusEnum.UNUSED.code,
-                    expire_time=None,
-                    activated_at=None
-                )
-                activation_codes.append(code)
+            activation_codes = await self._mint_activation_codes(item.type, item.count)
 
             # 构建响应
             type_result = ActivationCodeTypeResult(
@@ -81,12 +134,16 @@ class ActivationCodeService:
 
             log.info(f"成功生成{len(activation_codes)}个{type_name}激活码")
 
-        log.info(f"批量生成完成，总计{total_count}个激活码")
+        elapsed = time.perf_counter() - start
+        codes_per_second = round(total_count / elapsed, 1) if elapsed > 0 else 0
+        log.info(f"批量生成完成，总计{total_count}个激活码，耗时{elapsed:.2f}s，吞吐量{codes_per_second}个/秒")
 
         return ActivationCodeBatchResponse(
             results=results,
             total_count=total_count,
-            summary=summary
+            summary=summary,
+            elapsed_ms=int(elapsed * 1000),
+            codes_per_second=codes_per_second
         )
 
     async def distribute_activation_codes(self, request: ActivationCodeGetRequest) -> List[str]:
@@ -100,24 +157,25 @@ class ActivationCodeService:
             激活码字符串列表
 
         Raises:
-            BusinessException: 激活码数量不足
+            BusinessException: 激活码数量不足，或并发派发冲突（409，可重试）
         """
         log.info(f"派发激活码，类型：{request.type}，数量：{request.count}")
 
-        codes = await activation_repository.find_unused_codes(
-            type_code=request.type,
-            limit=request.count
-        )
+        # 单事务内锁定并批量更新，避免逐条 UPDATE 及并发重复派发
+        try:
+            activation_codes = await activation_repository.claim_unused_codes(
+                type_code=request.type,
+                count=request.count
+            )
+        except ActivationCodeClaimConflict as e:
+            log.warning(str(e))
+            raise BusinessException(message="派发请求较多，激活码被并发领取，请稍后重试", code=409)
 
-        if len(codes) < request.count:
+        if len(activation_codes) < request.count:
             type_enum = ActivationTypeEnum.from_code(request.type)
+            available = await activation_repository.count_unused_by_type(request.type)
             raise BusinessException(
-                message=f"{type_enum.desc}可用激活码不足，需要{request.count}个，实际只有{len(codes)}个")
-
-        activation_codes = []
-        for code in codes:
-            await activation_repository.distribute_activation_code(code)
-            activation_codes.append(code.activation_code)
+                message=f"{type_enum.desc}可用激活码不足，需要{request.count}个，实际只有{available}个")
 
         log.info(f"成功派发{len(activation_codes)}个激活码")
         return activation_codes
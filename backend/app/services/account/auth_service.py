@@ -6,7 +6,7 @@ from app.models.account.user import User
 from app.repositories.account.user_repository import user_repository
 from app.repositories.account.activation_repository import activation_repository
 from app.util.jwt import jwt_manager
-from app.util.password import verify_password, hash_password
+from app.util.password import verify_password_async, hash_password_async
 
 
 class AuthService:
@@ -31,7 +31,7 @@ class AuthService:
             raise BusinessException(message="用户名或密码错误", code=401)
 
         # 验证密码
-        if not verify_password(password, user.password):
+        if not await verify_password_async(password, user.password):
             raise BusinessException(message="用户名或密码错误", code=401)
 
         # 检查激活码是否过期
@@ -81,14 +81,19 @@ class AuthService:
         修改用户密码
 
         Args:
-            user: 用户实例
+            user: 用户实例（可以是认证缓存中的副本）
             new_password: 新密码（密码复杂度验证已在schema中完成）
 
         Returns:
             是否修改成功
         """
+        # 认证得到的用户可能是缓存中的旧数据，重新读取后再修改，避免用旧值覆盖其他字段
+        user = await user_repository.get_by_id(user.id)
+        if not user:
+            raise BusinessException(message="用户不存在", code=404)
+
         # 更新密码（schema已验证复杂度）
-        user.password = hash_password(new_password)
+        user.password = await hash_password_async(new_password)
         await user_repository.update(user)
 
         log.info(f"用户 {user.username} 修改密码成功")
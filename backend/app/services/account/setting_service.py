@@ -3,12 +3,13 @@
 统一处理用户配置和账号配置，通过 SettingOwnerType 区分
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional
 
 from app.core.exceptions import BusinessException
 from app.core.logging import log
 from app.enums.common.setting_owner import SettingOwnerType
 from app.enums.settings import SettingGroupEnum
+from app.repositories.account.account_repository import account_repository
 from app.repositories.account.setting_repository import setting_repository
 from app.schemas.account.setting import (
     SettingResponse,
@@ -61,17 +62,9 @@ class SettingService:
         """
         log.info(f"获取账号{account_id}的配置")
 
-        # 获取账号配置
-        account_settings = await setting_repository.find_all_account_settings(account_id)
-        account_settings_map: Dict[int, Any] = {
-            s.setting_key: s.setting_value for s in account_settings
-        }
-
-        # 获取用户配置
-        user_settings = await setting_repository.find_all_user_settings(user_id)
-        user_settings_map: Dict[int, Any] = {
-            s.setting_key: s.setting_value for s in user_settings
-        }
+        # 获取账号配置、用户配置（走仓储缓存）
+        account_settings_map = await setting_repository.find_account_settings_map(account_id)
+        user_settings_map = await setting_repository.find_user_settings_map(user_id)
 
         # 按分组组织
         groups = []
@@ -121,32 +114,77 @@ class SettingService:
         group, setting = SettingGroupEnum.find_setting_by_code(setting_key)
 
         # 先查账号配置
-        account_setting = await setting_repository.find_account_setting(account_id, setting_key)
-        if account_setting:
-            return account_setting.setting_value
+        account_settings_map = await setting_repository.find_account_settings_map(account_id)
+        if setting_key in account_settings_map:
+            return account_settings_map[setting_key]
 
         # 再查用户配置
-        user_setting = await setting_repository.find_user_setting(user_id, setting_key)
-        if user_setting:
-            return user_setting.setting_value
+        user_settings_map = await setting_repository.find_user_settings_map(user_id)
+        if setting_key in user_settings_map:
+            return user_settings_map[setting_key]
 
         # 返回默认值
         return setting.default
 
+    async def resolve_effective_settings(
+        self, account_ids: Iterable[int], keys: Optional[Iterable[int]] = None
+    ) -> Dict[int, Dict[int, Any]]:
+        """批量获取多个账号的有效配置值（账号 > 用户 > 默认）
+
+        供下载、调度、发布等批处理场景使用：账号归属 1 次查询，账号配置、用户配置
+        各至多 1 次 IN 查询（命中缓存则跳过），在内存中合并，查询次数与账号数无关。
+
+        Args:
+            account_ids: 账号ID列表
+            keys: 配置项编码列表，不传则返回全部配置项
+
+        Returns:
+            {account_id: {setting_key: value}}，不存在或已删除的账号不出现在结果中
+        """
+        if keys is None:
+            settings = SettingGroupEnum.get_all_settings()
+        else:
+            settings = [SettingGroupEnum.find_setting_by_code(key)[1] for key in dict.fromkeys(keys)]
+
+        account_user_map = await account_repository.find_user_ids(dict.fromkeys(account_ids))
+        if not account_user_map:
+            return {}
+
+        account_maps = await setting_repository.find_settings_maps(
+            SettingOwnerType.ACCOUNT, account_user_map.keys()
+        )
+        user_maps = await setting_repository.find_settings_maps(
+            SettingOwnerType.USER, account_user_map.values()
+        )
+
+        result: Dict[int, Dict[int, Any]] = {}
+        for account_id, user_id in account_user_map.items():
+            account_settings = account_maps.get(account_id, {})
+            user_settings = user_maps.get(user_id, {})
+            effective: Dict[int, Any] = {}
+            for setting in settings:
+                code = setting.code
+                if code in effective:
+                    # 编码重复时以先出现的配置项为准，与 find_setting_by_code 一致
+                    continue
+                if code in account_settings:
+                    effective[code] = account_settings[code]
+                elif code in user_settings:
+                    effective[code] = user_settings[code]
+                else:
+                    effective[code] = setting.default
+            result[account_id] = effective
+
+        log.info(f"批量解析{len(result)}个账号的有效配置，配置项{len(settings)}个")
+        return result
+
     # ========== 私有方法 ==========
 
     async def _get_all_settings_by_owner(
         self, owner_type: SettingOwnerType, owner_id: int
     ) -> AllSettingsResponse:
         """获取所有配置（通用）"""
-        if owner_type == SettingOwnerType.USER:
-            settings_list = await setting_repository.find_all_user_settings(owner_id)
-        else:
-            settings_list = await setting_repository.find_all_account_settings(owner_id)
-
-        settings_map: Dict[int, Any] = {
-            s.setting_key: s.setting_value for s in settings_list
-        }
+        settings_map = await setting_repository.find_settings_map(owner_type, owner_id)
 
         groups = []
         for group in SettingGroupEnum:
@@ -182,10 +220,10 @@ class SettingService:
         """获取单个配置（通用）"""
         group, setting = SettingGroupEnum.find_setting_by_code(setting_key)
 
-        saved = await setting_repository.find_by_owner_and_key(owner_type, owner_id, setting_key)
+        settings_map = await setting_repository.find_settings_map(owner_type, owner_id)
 
-        if saved:
-            value = saved.setting_value
+        if setting_key in settings_map:
+            value = settings_map[setting_key]
             is_default = False
         else:
             value = setting.default
@@ -241,14 +279,7 @@ class SettingService:
         """按分组获取配置（通用）"""
         group = SettingGroupEnum.from_code(group_code)
 
-        if owner_type == SettingOwnerType.USER:
-            settings_list = await setting_repository.find_all_user_settings(owner_id)
-        else:
-            settings_list = await setting_repository.find_all_account_settings(owner_id)
-
-        settings_map: Dict[int, Any] = {
-            s.setting_key: s.setting_value for s in settings_list
-        }
+        settings_map = await setting_repository.find_settings_map(owner_type, owner_id)
 
         settings = []
         for setting in group.get_settings():
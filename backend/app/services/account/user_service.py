@@ -6,7 +6,7 @@ from app.repositories.account.user_repository import user_repository
 from app.schemas.account.user import UserRegisterRequest, UserUpdateRequest, UserResponse, UserQueryRequest
 from app.services.account.activation_service import activation_service
 from app.util.transaction import transactional
-from app.util.password import hash_password
+from app.util.password import hash_password_async
 
 
 class UserService:
@@ -30,7 +30,7 @@ class UserService:
             raise BusinessException(message="用户名已存在", code=400)
 
         # 3. 创建用户（事务内操作）
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
         user_obj = await user_repository.create_user(
             username=user_data.username,
             password=hashed_password,
@@ -5,8 +5,15 @@
     from app.services.downloader import download
 
     path = await download("https://www.xiaohongshu.com/explore/xxx")
+
+    # 通过下载队列执行（全局/按站点限流、优先级、取消、进度订阅）
+    from app.services.downloader import download_manager
+
+    job = download_manager.submit(url, user_id, priority=1)
+    path = await job.wait()
 """
 
+from app.services.downloader.download_manager import DownloadJob, DownloadManager, download_manager
 from app.services.downloader.downloader_service import download
 
-__all__ = ["download"]
+__all__ = ["download", "download_manager", "DownloadManager", "DownloadJob"]
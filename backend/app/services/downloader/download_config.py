@@ -38,26 +38,18 @@ class DownloadConfig:
         Returns:
             DownloadConfig 配置对象
         """
-        from app.repositories.account.user_setting_repository import user_setting_repository
+        from app.repositories.account.setting_repository import setting_repository
 
-        # 单次批量查询所有下载相关配置
-        setting_keys = [e.code for e in DownloadSettingEnum]
-        user_settings = await user_setting_repository.find_by_user_and_keys(user_id, setting_keys)
+        # 单次批量查询用户配置（code -> value 映射，带缓存）
+        settings_map = await setting_repository.find_user_settings_map(user_id)
 
-        # 构建 code -> value 映射
-        settings_map = {s.setting_key: s.setting_value for s in user_settings}
-
-        # 获取值，不存在则使用默认值
-        download_path = settings_map.get(
-            DownloadSettingEnum.DOWNLOAD_PATH.code,
+        # 获取值，不存在或为空则使用默认值
+        download_path = settings_map.get(DownloadSettingEnum.DOWNLOAD_PATH.code) or \
             DownloadSettingEnum.DOWNLOAD_PATH.default
-        )
-        proxy_value = settings_map.get(
-            DownloadSettingEnum.PROXY_URL.code,
+        proxy_value = settings_map.get(DownloadSettingEnum.PROXY_URL.code) or \
             DownloadSettingEnum.PROXY_URL.default
-        )
 
         return cls(
             download_path=download_path,
-            proxy=proxy_value
+            proxy=proxy_value or None
         )
@@ -0,0 +1,328 @@
+"""下载管理器
+
+为下载任务提供排队调度：全局并发上限 + 按站点并发上限、优先级、取消和进度广播。
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import BusinessException
+from app.core.logging import log
+from app.enums.common.download_status import DownloadStatusEnum
+from app.services.downloader.downloader_service import ProgressCallback, download
+from app.services.downloader.strategy_registry import StrategyRegistry
+
+
+# 下载执行函数: (url, user_id, on_progress) -> 文件路径
+DownloadRunner = Callable[[str, int, Optional[ProgressCallback]], Awaitable[str]]
+
+
+class DownloadCancelled(Exception):
+    """下载已被取消（在 yt-dlp 进度钩子中抛出，用于中止工作线程中的下载）"""
+
+
+class DownloadJob:
+    """
+    下载任务
+
+    由 DownloadManager.submit() 创建，调用方通过 wait() 获取下载结果，
+    通过 subscribe() 订阅进度。
+    """
+
+    def __init__(self, url: str, user_id: int, priority: int, domain: str, seq: int):
+        """
+        初始化下载任务
+
+        Args:
+            url: 视频 URL
+            user_id: 用户 ID
+            priority: 优先级，数值越大越先执行
+            domain: 所属站点（用于按站点限流）
+            seq: 提交序号，同优先级按提交顺序执行
+        """
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.user_id = user_id
+        self.priority = priority
+        self.domain = domain
+        self.seq = seq
+        self.status = DownloadStatusEnum.PENDING
+        self.downloaded = 0
+        self.total = 0
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        self._future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._subscribers: List[ProgressCallback] = []
+        self._cancel_requested = False
+
+    @property
+    def progress(self) -> float:
+        """下载进度百分比"""
+        return self.downloaded / self.total * 100 if self.total > 0 else 0.0
+
+    @property
+    def done(self) -> bool:
+        """任务是否已结束（成功、失败或取消）"""
+        return self._future.done()
+
+    def subscribe(self, callback: ProgressCallback) -> Callable[[], None]:
+        """
+        订阅下载进度
+
+        回调在事件循环线程中执行，参数为 (downloaded_bytes, total_bytes)。
+
+        Args:
+            callback: 进度回调
+
+        Returns:
+            取消订阅函数
+        """
+        self._subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    async def wait(self) -> str:
+        """
+        等待任务结束
+
+        调用方被取消不会影响任务本身。
+
+        Returns:
+            下载后的文件绝对路径，与 download() 返回值一致
+
+        Raises:
+            BusinessException: 下载失败时抛出
+            asyncio.CancelledError: 任务被取消时抛出
+        """
+        return await asyncio.shield(self._future)
+
+    def _publish(self, downloaded: int, total: int) -> None:
+        """记录进度并广播给所有订阅者"""
+        self.downloaded = downloaded
+        self.total = total
+        for callback in list(self._subscribers):
+            try:
+                callback(downloaded, total)
+            except Exception as e:
+                log.warning(f"下载进度回调异常 [{self.id}]: {e}")
+
+
+class DownloadManager:
+    """
+    下载管理器
+
+    - 任务进入优先级队列，数值越大越先执行，同优先级先进先出
+    - 同时执行的任务数受全局上限和按站点上限（StrategyRegistry 匹配的站点）共同限制
+    - 站点名额已满的任务不会阻塞其他站点的任务
+    - 排队中的任务取消后直接出队；执行中的任务在下一次进度回调时中止，
+      站点名额在工作线程真正结束后才释放
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        domain_concurrency: Optional[int] = None,
+        runner: Optional[DownloadRunner] = None
+    ):
+        """
+        初始化下载管理器
+
+        Args:
+            max_concurrency: 全局并发上限，默认读取配置
+            domain_concurrency: 单站点并发上限，默认读取配置
+            runner: 下载执行函数，默认使用 downloader_service.download
+        """
+        self.max_concurrency = max_concurrency or settings.download_max_concurrency
+        self.domain_concurrency = domain_concurrency or settings.download_domain_concurrency
+        self._runner: DownloadRunner = runner or download
+        self._queue: List[Tuple[int, int, DownloadJob]] = []
+        self._seq = itertools.count()
+        self._jobs: Dict[str, DownloadJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._domain_running: Dict[str, int] = {}
+
+    def submit(
+        self,
+        url: str,
+        user_id: int,
+        priority: int = 0,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> DownloadJob:
+        """
+        提交下载任务
+
+        Args:
+            url: 视频 URL
+            user_id: 用户 ID（用于获取下载配置）
+            priority: 优先级，数值越大越先执行
+            on_progress: 进度回调 (downloaded_bytes, total_bytes)
+
+        Returns:
+            下载任务
+
+        Raises:
+            BusinessException: URL 不受支持时抛出
+        """
+        domain = StrategyRegistry.get_domain(url)
+        if domain is None:
+            patterns = ", ".join(StrategyRegistry.get_supported_patterns())
+            raise BusinessException(message=f"不支持的URL，支持的域名: {patterns}")
+
+        job = DownloadJob(url, user_id, priority, domain, next(self._seq))
+        if on_progress:
+            job.subscribe(on_progress)
+
+        self._jobs[job.id] = job
+        heapq.heappush(self._queue, (-priority, job.seq, job))
+        log.info(f"下载任务入队 [{job.id}] {domain} 优先级={priority}: {url}")
+
+        self._dispatch()
+        return job
+
+    async def download(
+        self,
+        url: str,
+        user_id: int,
+        priority: int = 0,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """
+        提交下载任务并等待完成
+
+        Args:
+            url: 视频 URL
+            user_id: 用户 ID
+            priority: 优先级，数值越大越先执行
+            on_progress: 进度回调 (downloaded_bytes, total_bytes)
+
+        Returns:
+            下载后的文件绝对路径
+        """
+        job = self.submit(url, user_id, priority, on_progress)
+        return await job.wait()
+
+    def get_job(self, job_id: str) -> Optional[DownloadJob]:
+        """获取未结束的下载任务"""
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        取消下载任务
+
+        Args:
+            job_id: 任务 ID
+
+        Returns:
+            是否取消成功（任务不存在或已结束返回 False）
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return False
+
+        job._cancel_requested = True
+        job.status = DownloadStatusEnum.CANCELLED
+        job.finished_at = time.monotonic()
+        job._future.cancel()
+
+        if job.id not in self._tasks:
+            # 排队中的任务：从队列中移除后出队时会跳过
+            self._jobs.pop(job.id, None)
+        log.info(f"下载任务已取消 [{job.id}]: {job.url}")
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        """获取队列状态"""
+        return {
+            "pending": sum(1 for _, _, job in self._queue if job.status == DownloadStatusEnum.PENDING),
+            "running": len(self._tasks),
+            "domains": {domain: count for domain, count in self._domain_running.items() if count},
+        }
+
+    async def shutdown(self) -> None:
+        """取消全部排队和执行中的任务（应用关闭时调用）"""
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+        self._queue.clear()
+
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        """按优先级启动名额允许的任务"""
+        deferred = []
+        while self._queue and len(self._tasks) < self.max_concurrency:
+            item = heapq.heappop(self._queue)
+            job = item[2]
+            if job.status != DownloadStatusEnum.PENDING:
+                continue
+            if self._domain_running.get(job.domain, 0) >= self.domain_concurrency:
+                deferred.append(item)
+                continue
+            self._start(job)
+
+        for item in deferred:
+            heapq.heappush(self._queue, item)
+
+    def _start(self, job: DownloadJob) -> None:
+        """占用名额并启动任务"""
+        job.status = DownloadStatusEnum.RUNNING
+        job.started_at = time.monotonic()
+        self._domain_running[job.domain] = self._domain_running.get(job.domain, 0) + 1
+        self._tasks[job.id] = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: DownloadJob) -> None:
+        """执行下载并在结束后释放名额"""
+        loop = asyncio.get_running_loop()
+
+        def on_progress(downloaded: int, total: int):
+            # yt-dlp 在工作线程中回调，切回事件循环线程再广播
+            if job._cancel_requested:
+                raise DownloadCancelled(job.id)
+            loop.call_soon_threadsafe(job._publish, downloaded, total)
+
+        try:
+            path = await self._runner(job.url, job.user_id, on_progress)
+            if not job._future.done():
+                job.result = path
+                job.status = DownloadStatusEnum.SUCCESS
+                job._future.set_result(path)
+        except asyncio.CancelledError:
+            if not job._future.done():
+                job.status = DownloadStatusEnum.CANCELLED
+                job._future.cancel()
+            raise
+        except Exception as e:
+            if not job._future.done():
+                job.error = str(e)
+                job.status = DownloadStatusEnum.FAILED
+                job._future.set_exception(
+                    e if isinstance(e, BusinessException) else BusinessException(message=f"下载失败: {e}")
+                )
+                # 避免无人等待时出现 "exception was never retrieved" 警告
+                job._future.exception()
+        finally:
+            job.finished_at = job.finished_at or time.monotonic()
+            self._tasks.pop(job.id, None)
+            self._jobs.pop(job.id, None)
+            self._domain_running[job.domain] -= 1
+            self._dispatch()
+
+
+# 全局下载管理器实例
+download_manager = DownloadManager()
@@ -15,13 +15,31 @@ class StrategyRegistry:
     ]
 
     @classmethod
-    def get_strategy(cls, url: str) -> Optional[BaseDownloadStrategy]:
-        """根据 URL 获取匹配的策略实例"""
+    def get_strategy_class(cls, url: str) -> Optional[Type[BaseDownloadStrategy]]:
+        """根据 URL 获取匹配的策略类"""
         for strategy_class in cls._strategies:
             if strategy_class.can_handle(url):
-                return strategy_class()
+                return strategy_class
         return None
 
+    @classmethod
+    def get_strategy(cls, url: str) -> Optional[BaseDownloadStrategy]:
+        """根据 URL 获取匹配的策略实例"""
+        strategy_class = cls.get_strategy_class(url)
+        return strategy_class() if strategy_class else None
+
+    @classmethod
+    def get_domain(cls, url: str) -> Optional[str]:
+        """
+        根据 URL 获取所属站点（匹配策略的首个 URL 模式）
+
+        同一策略的多个域名（如 youtube.com / youtu.be）归为同一站点，用于按站点限流。
+        """
+        strategy_class = cls.get_strategy_class(url)
+        if strategy_class is None or not strategy_class.url_patterns:
+            return None
+        return strategy_class.url_patterns[0]
+
     @classmethod
     def get_supported_patterns(cls) -> List[str]:
         """获取支持的 URL 模式列表"""
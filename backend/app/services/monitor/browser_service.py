@@ -1,4 +1,5 @@
 import asyncio
+import time
 from typing import Dict, Any, Optional, List
 
 import httpx
@@ -12,6 +13,25 @@ from app.schemas.monitor.browser import (
 )
 
 
+def _is_retryable(error: Exception) -> bool:
+    """
+    判断打开窗口的失败是否可重试
+
+    只有网络传输错误、超时和 HTTP 5xx 可重试，比特浏览器返回的业务错误直接返回；
+    _make_request 包装的 BusinessException 按其原始异常判断
+
+    Args:
+        error: 打开窗口时抛出的异常
+
+    Returns:
+        是否可重试
+    """
+    cause = error.__cause__ if isinstance(error, BusinessException) else error
+    if isinstance(cause, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    return isinstance(cause, httpx.HTTPStatusError) and cause.response.status_code >= 500
+
+
 class BitBrowserService:
     """比特浏览器服务类"""
 
@@ -20,6 +40,39 @@ class BitBrowserService:
         self.headers = {
             "Content-Type": "application/json"
         }
+        # 长连接客户端，由应用生命周期创建和关闭
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        """创建共享的 HTTP 客户端（应用启动时调用）"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=httpx.Timeout(
+                    settings.bit_browser_timeout,
+                    connect=settings.bit_browser_connect_timeout
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.bit_browser_max_connections,
+                    max_keepalive_connections=settings.bit_browser_max_keepalive,
+                    keepalive_expiry=settings.bit_browser_keepalive_expiry
+                )
+            )
+            log.info("✅ 比特浏览器客户端已创建")
+
+    async def stop(self) -> None:
+        """关闭共享的 HTTP 客户端（应用关闭时调用）"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            log.info("✅ 比特浏览器客户端已关闭")
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """获取共享客户端，未随应用启动（如脚本中直接调用）时按需创建"""
+        if self._client is None or self._client.is_closed:
+            await self.start()
+        return self._client
 
     async def _make_request(self, endpoint: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -32,31 +85,28 @@ class BitBrowserService:
         Returns:
             API响应数据
         """
-        url = f"{self.base_url}{endpoint}"
+        client = await self._get_client()
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    url,
-                    json=data or {},
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = await client.post(endpoint, json=data or {})
+            response.raise_for_status()
+            result = response.json()
 
-                if not result.get("success"):
-                    error_msg = result.get("msg", "未知错误")
-                    log.error(f"比特浏览器API错误: {error_msg}")
-                    raise BusinessException(message=f"比特浏览器API错误: {error_msg}", code=400)
+            if not result.get("success"):
+                error_msg = result.get("msg", "未知错误")
+                log.error(f"比特浏览器API错误: {error_msg}")
+                raise BusinessException(message=f"比特浏览器API错误: {error_msg}", code=400)
 
-                return result.get("data", {})
+            return result.get("data", {})
 
+        except BusinessException:
+            raise
         except httpx.HTTPError as e:
             log.error(f"HTTP请求失败: {str(e)}")
-            raise BusinessException(message="比特浏览器服务不可用", code=503)
+            raise BusinessException(message="比特浏览器服务不可用", code=503) from e
         except Exception as e:
             log.error(f"比特浏览器服务异常: {str(e)}")
-            raise BusinessException(message="比特浏览器服务异常", code=500)
+            raise BusinessException(message="比特浏览器服务异常", code=500) from e
 
     async def health_check(self) -> None:
         """
@@ -67,10 +117,75 @@ class BitBrowserService:
         """
         await self._make_request("/health")
 
+    async def _open_single(
+        self,
+        browser_id: str,
+        request: BrowserOpenRequest,
+        semaphore: asyncio.Semaphore,
+        max_retries: int
+    ) -> BatchOpenResult:
+        """
+        打开单个窗口（受并发信号量限制，网络错误、超时和 HTTP 5xx 按指数退避重试）
+
+        退避等待期间不占用并发名额，业务错误不重试
+
+        Args:
+            browser_id: 浏览器窗口ID
+            request: 浏览器打开请求
+            semaphore: 并发信号量
+            max_retries: 最大重试次数
+
+        Returns:
+            单个窗口的打开结果
+        """
+        # 为每个窗口创建单独的请求数据
+        single_request_data = {
+            "id": browser_id,
+            "args": request.args or [],
+            "ignoreDefaultUrls": request.ignoreDefaultUrls,
+            "newPageUrl": request.newPageUrl
+        }
+
+        attempt = 0
+        while True:
+            attempt += 1
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result = await self._make_request("/browser/open", single_request_data)
+                    return BatchOpenResult(
+                        id=browser_id,
+                        success=True,
+                        data=BrowserOpenResponse(**result),
+                        attempts=attempt,
+                        latency_ms=int((time.perf_counter() - start) * 1000)
+                    )
+                except Exception as e:
+                    latency_ms = int((time.perf_counter() - start) * 1000)
+                    error_msg = getattr(e, "message", str(e))
+                    retryable = _is_retryable(e)
+
+            if not retryable or attempt > max_retries:
+                log.warning(f"打开窗口 {browser_id} 失败，已尝试{attempt}次: {error_msg}")
+                return BatchOpenResult(
+                    id=browser_id,
+                    success=False,
+                    error=error_msg,
+                    attempts=attempt,
+                    latency_ms=latency_ms
+                )
+
+            delay = settings.bit_browser_open_backoff * 2 ** (attempt - 1)
+            log.warning(f"打开窗口 {browser_id} 第{attempt}次失败: {error_msg}，{delay:.1f}秒后重试")
+            await asyncio.sleep(delay)
+
     async def open_browser(self, request: BrowserOpenRequest) -> BrowserBatchOpenResponse:
         """
         批量打开浏览器窗口
 
+        按并发数限制同时打开多个窗口，单个窗口失败时按指数退避重试，
+        结果顺序与请求中的窗口ID顺序一致
+
         Args:
             request: 浏览器打开请求
 
@@ -83,53 +198,37 @@ class BitBrowserService:
         if not request.ids or len(request.ids) == 0:
             raise BusinessException(message="必须提供窗口ID列表", code=400)
 
-        results = []
-        success_count = 0
-        fail_count = 0
-
-        # 循环调用单个打开接口
-        for browser_id in request.ids:
-            try:
-                # 为每个窗口创建单独的请求数据
-                single_request_data = {
-                    "id": browser_id,
-                    "args": request.args or [],
-                    "ignoreDefaultUrls": request.ignoreDefaultUrls,
-                    "newPageUrl": request.newPageUrl
-                }
-
-                # 调用单个打开接口
-                result = await self._make_request("/browser/open", single_request_data)
-
-                # 记录成功结果
-                results.append(BatchOpenResult(
-                    id=browser_id,
-                    success=True,
-                    data=BrowserOpenResponse(**result)
-                ))
-                success_count += 1
-
-                # 添加短暂延迟，避免请求过于密集
-                await asyncio.sleep(0.1)
-
-            except Exception as e:
-                # 记录失败结果
-                error_msg = str(e)
-                if hasattr(e, 'message'):
-                    error_msg = e.message
-
-                results.append(BatchOpenResult(
-                    id=browser_id,
-                    success=False,
-                    error=error_msg
-                ))
-                fail_count += 1
+        concurrency = request.concurrency or settings.bit_browser_open_concurrency
+        max_retries = (
+            request.max_retries if request.max_retries is not None else settings.bit_browser_open_retries
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+
+        start = time.perf_counter()
+        # gather 按传入顺序返回结果
+        results = await asyncio.gather(*(
+            self._open_single(browser_id, request, semaphore, max_retries)
+            for browser_id in request.ids
+        ))
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+
+        success_count = sum(1 for result in results if result.success)
+        fail_count = len(results) - success_count
+
+        latencies = [result.latency_ms for result in results if result.success]
+        if latencies:
+            log.info(
+                f"批量打开窗口完成：成功{success_count}个，失败{fail_count}个，并发{concurrency}，"
+                f"总耗时{elapsed_ms}ms，单窗口平均{sum(latencies) // len(latencies)}ms，最长{max(latencies)}ms"
+            )
 
         return BrowserBatchOpenResponse(
-            results=results,
+            results=list(results),
             total=len(request.ids),
             success_count=success_count,
-            fail_count=fail_count
+            fail_count=fail_count,
+            concurrency=concurrency,
+            elapsed_ms=elapsed_ms
         )
 
     async def close_browser(self, browser_id: str) -> None:
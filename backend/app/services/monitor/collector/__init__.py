@@ -0,0 +1,21 @@
+"""
+监控数据采集模块
+
+使用方式：
+    from app.services.monitor.collector import monitor_collect_engine
+
+    summary = await monitor_collect_engine.run(user_id=1)
+"""
+
+from app.services.monitor.collector.collect_engine import CollectSummary, MonitorCollectEngine, monitor_collect_engine
+from app.services.monitor.collector.fetcher_registry import FetcherRegistry
+from app.services.monitor.collector.fetchers import BaseStatsFetcher, CollectedStats
+
+__all__ = [
+    "monitor_collect_engine",
+    "MonitorCollectEngine",
+    "CollectSummary",
+    "FetcherRegistry",
+    "BaseStatsFetcher",
+    "CollectedStats",
+]
@@ -0,0 +1,232 @@
+"""监控数据采集引擎"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logging import log
+from app.enums.monitor.task_type import TaskTypeEnum
+from app.models.monitor.monitor_config import MonitorConfig
+from app.repositories.monitor.monitor_config_repository import monitor_config_repository
+from app.services.monitor.collector.fetcher_registry import FetcherRegistry
+from app.services.monitor.collector.fetchers.base import BaseStatsFetcher
+from app.services.monitor.collector.stats_sink import StatsSink
+from app.services.monitor.task_recorder import task_recorder
+from app.util.time_util import get_utc_now
+
+# 渠道队列结束标记
+_DONE = object()
+
+
+@dataclass
+class CollectSummary:
+    """一次采集的执行汇总"""
+    total: int = 0
+    success: int = 0
+    failed: int = 0
+    skipped: int = 0
+    inserted: int = 0
+    updated: int = 0
+    elapsed_ms: int = 0
+
+
+class MonitorCollectEngine:
+    """
+    监控数据采集引擎
+
+    - 按 ID 分块流式读取启用且未删除的监控配置，不一次性加载全部配置
+    - 按渠道分发到各自的队列，每个渠道最多 channel_concurrency 个并发采集，
+      所有渠道合计不超过 concurrency
+    - 渠道队列不限长度，读取配置时从不等待某个渠道，慢渠道积压不会阻塞其他渠道；
+      积压的只是轻量的配置对象，数据库读取仍按块进行
+    - 任一采集协程异常退出（如写库失败）时取消其余协程并抛出异常，不会等待无人消费的队列
+    - 采集结果和执行状态通过 StatsSink 批量写库
+    - 没有采集器的渠道跳过，不更新执行状态
+    - 每个账号的采集记为一条每日采集任务，由 task_recorder 批量写入 tasks 表
+    - 同一时间只执行一次采集，用户采集任务和每小时数据统计重叠时排队执行
+    - 记录执行中的采集，应用关闭时通过 shutdown() 取消并等待其写完缓冲区
+    """
+
+    def __init__(
+        self,
+        fetchers: Optional[Dict[int, BaseStatsFetcher]] = None,
+        concurrency: Optional[int] = None,
+        channel_concurrency: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        初始化采集引擎
+
+        Args:
+            fetchers: 渠道编码 -> 采集器，默认每次运行时读取 FetcherRegistry
+            concurrency: 全局并发上限，默认读取配置
+            channel_concurrency: 单渠道并发上限，默认读取配置
+            chunk_size: 每次读取的配置数量，默认读取配置
+            timeout: 单个账号采集超时（秒），默认读取配置
+        """
+        self.fetchers = fetchers
+        self.concurrency = concurrency or settings.monitor_collect_concurrency
+        self.channel_concurrency = channel_concurrency or settings.monitor_collect_channel_concurrency
+        self.chunk_size = chunk_size or settings.monitor_collect_chunk_size
+        self.timeout = timeout or settings.monitor_collect_timeout
+        self._runs: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    async def run(
+        self,
+        user_id: Optional[int] = None,
+        stat_date: Optional[date] = None,
+        skip_recent: Optional[float] = None
+    ) -> CollectSummary:
+        """
+        执行一次采集
+
+        同一时间只执行一次采集，重叠的采集排队执行，避免并发写入相同的每日数据和汇总
+
+        Args:
+            user_id: 用户 ID（可选，为空时采集所有用户）
+            stat_date: 统计日期，默认当天
+            skip_recent: 跳过该时长（秒）内已执行过的配置（可选，开始采集时计算）
+
+        Returns:
+            执行汇总
+        """
+        current = asyncio.current_task()
+        self._runs.add(current)
+        try:
+            async with self._lock:
+                ran_before = get_utc_now() - timedelta(seconds=skip_recent) if skip_recent else None
+                return await self._run(user_id, stat_date, ran_before)
+        finally:
+            self._runs.discard(current)
+
+    async def shutdown(self) -> None:
+        """
+        取消执行中的采集并等待其结束（应用关闭时，在停止任务记录器和关闭数据库之前调用）
+
+        被取消的账号由 _collect_one 记为失败，已采集的结果在采集结束前写库
+        """
+        runs = list(self._runs)
+        for run in runs:
+            run.cancel()
+        if runs:
+            await asyncio.gather(*runs, return_exceptions=True)
+            log.info(f"[监控采集] 已取消 {len(runs)} 个执行中的采集")
+
+    async def _run(
+        self,
+        user_id: Optional[int],
+        stat_date: Optional[date],
+        ran_before: Optional[datetime]
+    ) -> CollectSummary:
+        """执行一次采集（见 run）"""
+        start = time.perf_counter()
+        fetchers = self.fetchers if self.fetchers is not None else FetcherRegistry.snapshot()
+        summary = CollectSummary()
+        sink = StatsSink(stat_date or date.today())
+        global_limit = asyncio.Semaphore(self.concurrency)
+        queues: Dict[int, asyncio.Queue] = {}
+        workers: List[asyncio.Task] = []
+
+        async def worker(queue: asyncio.Queue, fetcher: BaseStatsFetcher):
+            while True:
+                config = await queue.get()
+                if config is _DONE:
+                    return
+                async with global_limit:
+                    await self._collect_one(config, fetcher, sink, summary)
+
+        try:
+            async for chunk in monitor_config_repository.iter_active_chunks(
+                self.chunk_size, user_id, ran_before
+            ):
+                for config in chunk:
+                    summary.total += 1
+                    fetcher = fetchers.get(config.channel_code)
+                    if fetcher is None:
+                        summary.skipped += 1
+                        continue
+
+                    queue = queues.get(config.channel_code)
+                    if queue is None:
+                        queue = queues[config.channel_code] = asyncio.Queue()
+                        workers.extend(
+                            asyncio.create_task(worker(queue, fetcher))
+                            for _ in range(self.channel_concurrency)
+                        )
+                    queue.put_nowait(config)
+                # 采集协程异常退出时尽早失败，不再继续读取
+                self._raise_worker_error(workers)
+
+            for queue in queues.values():
+                for _ in range(self.channel_concurrency):
+                    queue.put_nowait(_DONE)
+            await asyncio.gather(*workers)
+        finally:
+            # 收尾期间被取消（如应用关闭）时仍等待缓冲区写完
+            closing = asyncio.ensure_future(self._close(workers, sink))
+            try:
+                await asyncio.shield(closing)
+            except asyncio.CancelledError:
+                await closing
+                raise
+
+        summary.inserted = sink.inserted
+        summary.updated = sink.updated
+        summary.elapsed_ms = int((time.perf_counter() - start) * 1000)
+        log.info(
+            f"[监控采集] user_id={user_id}, 配置={summary.total}, 成功={summary.success}, "
+            f"失败={summary.failed}, 跳过={summary.skipped}, 耗时={summary.elapsed_ms}ms"
+        )
+        return summary
+
+    @staticmethod
+    async def _close(workers: List[asyncio.Task], sink: StatsSink) -> None:
+        """停止采集协程并写入缓冲区中的结果"""
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await sink.flush()
+
+    @staticmethod
+    def _raise_worker_error(workers: List[asyncio.Task]) -> None:
+        """存在异常退出的采集协程时抛出其异常"""
+        for task in workers:
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+    async def _collect_one(
+        self,
+        config: MonitorConfig,
+        fetcher: BaseStatsFetcher,
+        sink: StatsSink,
+        summary: CollectSummary
+    ) -> None:
+        """采集单个账号并写入缓冲区"""
+        task = task_recorder.start(
+            config.channel_code, TaskTypeEnum.DAILY_COLLECTION.code, config.id, sink.stat_date
+        )
+        try:
+            stats = await asyncio.wait_for(fetcher.fetch(config), self.timeout)
+        except Exception as e:
+            log.warning(f"[监控采集] 配置 {config.id} 采集失败: {e}")
+            summary.failed += 1
+            await task_recorder.finish(task, error=e)
+            await sink.fail(config.id)
+            return
+        except BaseException as e:
+            # 被取消（如采集引擎停止）时同样结束任务记录，避免任务滞留在记录器中
+            await task_recorder.finish(task, error=e)
+            raise
+
+        summary.success += 1
+        await task_recorder.finish(task)
+        await sink.add(config.id, stats)
+
+
+# 全局采集引擎实例
+monitor_collect_engine = MonitorCollectEngine()
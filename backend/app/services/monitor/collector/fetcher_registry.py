@@ -0,0 +1,44 @@
+"""采集器注册表"""
+
+from typing import Dict, List, Optional
+
+from app.enums.common.channel import ChannelEnum
+from app.services.monitor.collector.fetchers.base import BaseStatsFetcher
+from app.services.monitor.collector.fetchers.yt_dlp_fetcher import YtDlpStatsFetcher
+
+
+class FetcherRegistry:
+    """采集器注册表，根据渠道编码选择采集器"""
+
+    _fetchers: Dict[int, BaseStatsFetcher] = {}
+
+    @classmethod
+    def register(cls, fetcher: BaseStatsFetcher, channels: Optional[List[ChannelEnum]] = None) -> None:
+        """
+        注册采集器（同一渠道后注册的覆盖先注册的）
+
+        Args:
+            fetcher: 采集器实例
+            channels: 渠道列表，默认使用采集器声明的 channels
+        """
+        for channel in channels or fetcher.channels:
+            cls._fetchers[channel.code] = fetcher
+
+    @classmethod
+    def unregister(cls, channel: ChannelEnum) -> None:
+        """移除渠道的采集器"""
+        cls._fetchers.pop(channel.code, None)
+
+    @classmethod
+    def get_fetcher(cls, channel_code: int) -> Optional[BaseStatsFetcher]:
+        """根据渠道编码获取采集器"""
+        return cls._fetchers.get(channel_code)
+
+    @classmethod
+    def snapshot(cls) -> Dict[int, BaseStatsFetcher]:
+        """获取当前渠道编码 -> 采集器映射的副本"""
+        return dict(cls._fetchers)
+
+
+# 注册默认采集器
+FetcherRegistry.register(YtDlpStatsFetcher())
@@ -0,0 +1,10 @@
+"""监控数据采集器模块"""
+
+from app.services.monitor.collector.fetchers.base import BaseStatsFetcher, CollectedStats
+from app.services.monitor.collector.fetchers.yt_dlp_fetcher import YtDlpStatsFetcher
+
+__all__ = [
+    "BaseStatsFetcher",
+    "CollectedStats",
+    "YtDlpStatsFetcher",
+]
@@ -0,0 +1,50 @@
+"""监控数据采集器基类"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.enums.common.channel import ChannelEnum
+from app.models.monitor.monitor_config import MonitorConfig
+
+
+@dataclass
+class CollectedStats:
+    """
+    单个监控账号一次采集得到的数据快照
+
+    数据源不提供的指标为 None，写库时新记录按 0 写入，已有记录保留原值
+    """
+    follower_count: Optional[int] = None
+    liked_count: Optional[int] = None
+    view_count: Optional[int] = None
+    content_count: Optional[int] = None
+    extra_data: Optional[Dict[str, Any]] = None
+
+
+class BaseStatsFetcher(ABC):
+    """
+    监控数据采集器基类
+
+    每个渠道一个采集器，由 FetcherRegistry 按 ChannelEnum 选择。
+    采集器只负责获取数据，写库、并发控制和执行状态由采集引擎统一处理。
+    """
+
+    # 支持的渠道，子类必须定义
+    channels: List[ChannelEnum] = []
+
+    @abstractmethod
+    async def fetch(self, config: MonitorConfig) -> CollectedStats:
+        """
+        采集监控账号数据
+
+        Args:
+            config: 监控配置
+
+        Returns:
+            数据快照
+
+        Raises:
+            Exception: 采集失败时抛出，由采集引擎记录为失败
+        """
+        pass
@@ -0,0 +1,57 @@
+"""基于 yt-dlp 元数据解析的采集器"""
+
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from app.enums.common.channel import ChannelEnum
+from app.models.monitor.monitor_config import MonitorConfig
+from app.services.monitor.collector.fetchers.base import BaseStatsFetcher, CollectedStats
+from app.util import yt_dlp_util
+
+# YouTube 频道主页路径（未指定标签页），解析结果是各标签页而不是视频
+_YOUTUBE_CHANNEL_HOME = re.compile(r"^/(@[^/]+|channel/[^/]+|c/[^/]+|user/[^/]+)/?$")
+
+
+class YtDlpStatsFetcher(BaseStatsFetcher):
+    """
+    yt-dlp 采集器
+
+    平铺解析账号主页（频道/用户空间），只请求列表页不下载视频：
+    粉丝数取频道信息，内容数取列表条目数，播放量 / 点赞数为各条目之和。
+
+    只注册 yt-dlp 有对应列表解析器的渠道：YouTube 频道（YoutubeTab）和哔哩哔哩空间（BilibiliSpaceVideo）。
+    抖音只有单个视频的解析器，用户主页会落到通用解析器，无法采集。
+    数据源不提供的指标返回 None（如平铺条目没有点赞数，哔哩哔哩空间没有粉丝数和播放量），不写入 0 覆盖原值。
+    """
+
+    channels = [ChannelEnum.YOUTUBE, ChannelEnum.BILIBILI]
+
+    async def fetch(self, config: MonitorConfig) -> CollectedStats:
+        """解析账号主页元数据（不使用缓存，每次采集取最新数据）"""
+        url = self._content_url(config)
+        metadata = await yt_dlp_util.extract_metadata(url, use_cache=False)
+        entries = metadata.get("entries") or []
+
+        return CollectedStats(
+            follower_count=metadata.get("channel_follower_count"),
+            liked_count=self._sum_field(entries, "like_count"),
+            view_count=self._sum_field(entries, "view_count"),
+            content_count=metadata.get("playlist_count") or len(entries),
+        )
+
+    @staticmethod
+    def _content_url(config: MonitorConfig) -> str:
+        """YouTube 频道主页改为解析视频标签页，其他地址原样返回"""
+        if config.channel_code != ChannelEnum.YOUTUBE.code:
+            return config.target_url
+        parts = urlsplit(config.target_url)
+        if not _YOUTUBE_CHANNEL_HOME.match(parts.path):
+            return config.target_url
+        return urlunsplit(parts._replace(path=parts.path.rstrip("/") + "/videos"))
+
+    @staticmethod
+    def _sum_field(entries: List[Dict[str, Any]], field: str) -> Optional[int]:
+        """各条目指定字段之和，所有条目都没有该字段时返回 None"""
+        values = [entry[field] for entry in entries if entry.get(field) is not None]
+        return sum(values) if values else None
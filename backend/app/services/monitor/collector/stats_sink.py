@@ -0,0 +1,83 @@
+"""采集结果批量写入"""
+
+import asyncio
+from dataclasses import asdict
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.enums.monitor.task_status import TaskStatusEnum
+from app.repositories.monitor.monitor_config_repository import monitor_config_repository
+from app.repositories.monitor.monitor_daily_stats_repository import monitor_daily_stats_repository
+from app.services.monitor.collector.fetchers.base import CollectedStats
+from app.util.time_util import get_utc_now
+
+
+class StatsSink:
+    """
+    采集结果缓冲区
+
+    - 每日数据累积到批量大小后通过 bulk_upsert_daily_stats 一次写入
+    - 配置的 last_run_at / last_run_status 按状态分组，每组一条 UPDATE ... WHERE id IN
+    - 多个采集协程并发写入，flush 串行执行
+    """
+
+    def __init__(self, stat_date: date, batch_size: Optional[int] = None):
+        """
+        初始化缓冲区
+
+        Args:
+            stat_date: 统计日期
+            batch_size: 累积多少条结果后写库，默认读取配置
+        """
+        self.stat_date = stat_date
+        self.batch_size = batch_size or settings.monitor_stats_upsert_batch_size
+        self.inserted = 0
+        self.updated = 0
+        self._records: List[Dict[str, Any]] = []
+        self._last_run: Dict[int, List[int]] = {}
+        self._pending = 0
+        self._lock = asyncio.Lock()
+
+    async def add(self, config_id: int, stats: CollectedStats) -> None:
+        """
+        写入一条采集成功的结果
+
+        Args:
+            config_id: 配置 ID
+            stats: 数据快照
+        """
+        self._records.append({"config_id": config_id, "stat_date": self.stat_date, **asdict(stats)})
+        await self._mark(config_id, TaskStatusEnum.SUCCESS)
+
+    async def fail(self, config_id: int) -> None:
+        """
+        记录一条采集失败的配置
+
+        Args:
+            config_id: 配置 ID
+        """
+        await self._mark(config_id, TaskStatusEnum.FAILED)
+
+    async def _mark(self, config_id: int, status: TaskStatusEnum) -> None:
+        """记录执行状态，达到批量大小时写库"""
+        self._last_run.setdefault(status.code, []).append(config_id)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """写入缓冲区中的全部结果"""
+        async with self._lock:
+            records, self._records = self._records, []
+            last_run, self._last_run = self._last_run, {}
+            self._pending = 0
+
+            if records:
+                result = await monitor_daily_stats_repository.bulk_upsert_daily_stats(records)
+                self.inserted += result["inserted"]
+                self.updated += result["updated"]
+
+            now = get_utc_now()
+            for status_code, config_ids in last_run.items():
+                await monitor_config_repository.bulk_update_last_run(config_ids, now, status_code)
@@ -2,8 +2,10 @@ from typing import List
 
 from app.core.exceptions import BusinessException
 from app.core.logging import log
+from app.enums.monitor.stats_granularity import StatsGranularityEnum
 from app.repositories.monitor.monitor_config_repository import monitor_config_repository
 from app.repositories.monitor.monitor_daily_stats_repository import monitor_daily_stats_repository
+from app.repositories.monitor.monitor_stats_rollup_repository import ROLLUP_DELTA_FIELDS, ROLLUP_METRIC_FIELDS, ROLLUP_REPOSITORIES
 from app.schemas.monitor.monitor import (
     MonitorConfigCreateRequest,
     MonitorConfigUpdateRequest,
@@ -11,7 +13,13 @@ from app.schemas.monitor.monitor import (
     MonitorConfigQueryRequest,
     MonitorConfigResponse,
     MonitorDailyStatsQueryRequest,
-    MonitorDailyStatsResponse
+    MonitorDailyStatsResponse,
+    MonitorStatsTrendQueryRequest,
+    MonitorStatsPointResponse,
+    MonitorStatsTrendResponse,
+    MonitorStatsBatchQueryRequest,
+    MonitorStatsSeriesResponse,
+    MonitorStatsBatchResponse
 )
 from app.util.time_util import get_utc_now
 
@@ -184,6 +192,137 @@ class MonitorService:
 
         return [MonitorDailyStatsResponse.model_validate(stat, from_attributes=True) for stat in stats]
 
+    async def get_stats_trend(
+        self,
+        user_id: int,
+        request: MonitorStatsTrendQueryRequest
+    ) -> MonitorStatsTrendResponse:
+        """
+        查询趋势数据
+
+        按不超过 resolution_days 的最粗粒度返回：日粒度读取每日数据，周 / 月粒度直接读取汇总表，
+        区间较长时返回的数据点数量大幅减少。周 / 月粒度包含开始日期所在的整个周期。
+
+        Args:
+            user_id: 用户 ID
+            request: 查询请求
+
+        Returns:
+            趋势数据
+
+        Raises:
+            BusinessException: 监控配置不存在
+        """
+        granularity = StatsGranularityEnum.coarsest_for(request.resolution_days)
+        log.info(
+            f"用户{user_id}查询配置{request.config_id}的{granularity.desc}趋势数据，"
+            f"时间范围：{request.start_date} ~ {request.end_date}")
+
+        # 验证配置归属
+        config = await monitor_config_repository.find_by_id(request.config_id, user_id)
+        if not config:
+            raise BusinessException(message="监控配置不存在")
+
+        rollup_repository = ROLLUP_REPOSITORIES.get(granularity)
+        if rollup_repository is not None:
+            rollups = await rollup_repository.find_by_config_and_date_range(
+                config_id=request.config_id,
+                start_date=request.start_date,
+                end_date=request.end_date
+            )
+            points = [MonitorStatsPointResponse.model_validate(rollup, from_attributes=True) for rollup in rollups]
+        else:
+            points = await self._get_daily_points(request)
+
+        return MonitorStatsTrendResponse(config_id=request.config_id, granularity=granularity.code, points=points)
+
+    @staticmethod
+    async def _get_daily_points(request: MonitorStatsTrendQueryRequest) -> List[MonitorStatsPointResponse]:
+        """按日粒度生成数据点，增量相对前一条每日数据计算"""
+        stats = await monitor_daily_stats_repository.find_by_config_and_date_range(
+            config_id=request.config_id,
+            start_date=request.start_date,
+            end_date=request.end_date
+        )
+        if not stats:
+            return []
+
+        previous = await monitor_daily_stats_repository.find_latest_before(request.config_id, request.start_date)
+        points = []
+        for stat in stats:
+            baseline = previous or stat
+            points.append(MonitorStatsPointResponse(
+                period_start=stat.stat_date,
+                period_end=stat.stat_date,
+                last_stat_date=stat.stat_date,
+                **{field: getattr(stat, field) for field in ROLLUP_METRIC_FIELDS},
+                **{
+                    delta: getattr(stat, field) - getattr(baseline, field)
+                    for field, delta in zip(ROLLUP_METRIC_FIELDS, ROLLUP_DELTA_FIELDS)
+                }
+            ))
+            previous = stat
+        return points
+
+    async def get_batch_stats(
+        self,
+        user_id: int,
+        request: MonitorStatsBatchQueryRequest
+    ) -> MonitorStatsBatchResponse:
+        """
+        批量查询多个配置的数据（列式返回）
+
+        一次查询校验全部配置归属，一次 config_id__in 查询读取全部指标，
+        所有配置共用一个日期数组，每个配置按日期下标返回各指标数组。
+
+        Args:
+            user_id: 用户 ID
+            request: 查询请求
+
+        Returns:
+            列式数据
+
+        Raises:
+            BusinessException: 存在不属于该用户或已删除的监控配置
+        """
+        config_ids = list(dict.fromkeys(request.config_ids))
+        granularity = StatsGranularityEnum.coarsest_for(request.resolution_days)
+        log.info(
+            f"用户{user_id}批量查询{len(config_ids)}个配置的{granularity.desc}数据，"
+            f"时间范围：{request.start_date} ~ {request.end_date}")
+
+        # 验证配置归属
+        owned_ids = await monitor_config_repository.find_owned_ids(config_ids, user_id)
+        missing = [config_id for config_id in config_ids if config_id not in owned_ids]
+        if missing:
+            raise BusinessException(message=f"监控配置不存在: {missing}")
+
+        repository = ROLLUP_REPOSITORIES.get(granularity, monitor_daily_stats_repository)
+        rows = await repository.find_metrics_by_configs(config_ids, request.start_date, request.end_date)
+
+        # 行按日期升序返回，按首次出现顺序即为日期下标
+        date_index = {}
+        for row in rows:
+            date_index.setdefault(row[1], len(date_index))
+
+        columns = {
+            config_id: [[None] * len(date_index) for _ in ROLLUP_METRIC_FIELDS]
+            for config_id in config_ids
+        }
+        for config_id, stat_date, *metrics in rows:
+            index = date_index[stat_date]
+            for column, value in zip(columns[config_id], metrics):
+                column[index] = value
+
+        return MonitorStatsBatchResponse(
+            granularity=granularity.code,
+            dates=list(date_index),
+            series=[
+                MonitorStatsSeriesResponse(config_id=config_id, **dict(zip(ROLLUP_METRIC_FIELDS, columns[config_id])))
+                for config_id in config_ids
+            ]
+        )
+
 
 # 创建服务实例
 monitor_service = MonitorService()
@@ -0,0 +1,174 @@
+"""任务执行记录器
+
+缓冲任务的开始/结束事件，按数量或时间阈值批量写入 tasks 表
+"""
+
+import asyncio
+import time
+import traceback
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.logging import log
+from app.enums.monitor.task_status import TaskStatusEnum
+from app.models.monitor.task import Task
+from app.repositories.monitor.task_repository import task_repository
+from app.util.time_util import get_utc_now
+
+# 任务结束时更新的字段
+_FINISH_FIELDS = ["task_status", "error_msg", "duration_ms", "finished_at", "updated_at"]
+
+
+class TaskRecorder:
+    """
+    任务执行记录器
+
+    - start() 只在内存中创建任务，不写库；finish() 填写结果后进入缓冲区
+    - 缓冲区达到 batch_size 或每隔 flush_interval 秒写库：
+      未入库的已结束任务一次 bulk_create（开始 + 结束只写一次），
+      已入库的任务结束后一次 bulk_update
+    - 运行超过 flush_interval 仍未结束的任务单独入库（状态为进行中），便于查看长任务
+    - 应用关闭时 stop() 写入全部缓冲数据，进行中的任务按进行中状态入库
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, flush_interval: Optional[float] = None):
+        """
+        初始化记录器
+
+        Args:
+            batch_size: 缓冲多少条结束事件后写库，默认读取配置
+            flush_interval: 定时写库间隔（秒），默认读取配置
+        """
+        self.batch_size = batch_size or settings.task_recorder_batch_size
+        self.flush_interval = flush_interval or settings.task_recorder_flush_interval
+        # id(task) -> (任务, 开始时间 monotonic)
+        self._running: Dict[int, Tuple[Task, float]] = {}
+        # 正在单独入库的进行中任务
+        self._persisting: Set[int] = set()
+        self._pending_create: List[Task] = []
+        self._pending_update: List[Task] = []
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def start(
+        self,
+        channel_code: int,
+        task_type: int,
+        biz_id: int,
+        schedule_date: Optional[date] = None
+    ) -> Task:
+        """
+        记录任务开始
+
+        Args:
+            channel_code: 渠道编码
+            task_type: 任务类型
+            biz_id: 业务 ID（监控配置 ID）
+            schedule_date: 调度日期，默认当天
+
+        Returns:
+            任务实例（尚未入库），结束时传给 finish()
+        """
+        task = Task(
+            channel_code=channel_code,
+            task_type=task_type,
+            biz_id=biz_id,
+            schedule_date=schedule_date or date.today(),
+            task_status=TaskStatusEnum.IN_PROGRESS.code,
+            started_at=get_utc_now()
+        )
+        self._running[id(task)] = (task, time.monotonic())
+        return task
+
+    async def finish(self, task: Task, error: Optional[BaseException] = None) -> None:
+        """
+        记录任务结束
+
+        Args:
+            task: start() 返回的任务实例
+            error: 失败时的异常，为空表示成功
+        """
+        _, started = self._running.pop(id(task), (None, None))
+        task.finished_at = task.updated_at = get_utc_now()
+        task.duration_ms = int((time.monotonic() - started) * 1000) if started else 0
+        if error is None:
+            task.task_status = TaskStatusEnum.SUCCESS.code
+        else:
+            task.task_status = TaskStatusEnum.FAILED.code
+            task.error_msg = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+
+        # 正在单独入库的任务由 flush 在入库完成后加入更新队列
+        if id(task) in self._persisting:
+            return
+
+        (self._pending_update if task.pk is not None else self._pending_create).append(task)
+        if len(self._pending_create) + len(self._pending_update) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self, include_running: bool = False) -> None:
+        """
+        写入缓冲区
+
+        Args:
+            include_running: 是否把所有未入库的进行中任务一并入库（关闭时使用）
+        """
+        async with self._lock:
+            to_create, self._pending_create = self._pending_create, []
+            to_update, self._pending_update = self._pending_update, []
+
+            cutoff = time.monotonic() - self.flush_interval
+            long_running = [
+                task for task, started in self._running.values()
+                if task.pk is None and (include_running or started <= cutoff)
+            ]
+            self._persisting.update(id(task) for task in long_running)
+
+            try:
+                if to_create:
+                    await Task.bulk_create(to_create)
+                if to_update:
+                    await task_repository.bulk_update(to_update, _FINISH_FIELDS)
+            except Exception as e:
+                log.error(f"任务记录写入失败，丢弃 {len(to_create) + len(to_update)} 条: {e}")
+
+            for task in long_running:
+                try:
+                    await task.save()
+                except Exception as e:
+                    log.error(f"进行中任务入库失败 biz_id={task.biz_id}: {e}")
+                finally:
+                    self._persisting.discard(id(task))
+                # 入库期间已结束的任务补写结束状态
+                if task.task_status != TaskStatusEnum.IN_PROGRESS.code:
+                    (self._pending_update if task.pk is not None else self._pending_create).append(task)
+
+    async def _flush_loop(self) -> None:
+        """定时写库"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error(f"任务记录定时写入失败: {e}")
+
+    def start_flusher(self) -> None:
+        """启动定时写库（应用启动时调用）"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """停止定时写库并写入全部缓冲数据（应用关闭时调用）"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+
+        await self.flush(include_running=True)
+        # 关闭前入库期间结束的任务
+        if self._pending_create or self._pending_update:
+            await self.flush()
+
+
+# 全局任务记录器实例
+task_recorder = TaskRecorder()
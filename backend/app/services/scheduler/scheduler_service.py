@@ -9,9 +9,15 @@ from typing import Dict, Callable, Any, Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from app.core.config import settings
 from app.core.logging import log
 from app.enums.settings.scheduler import SchedulerSettingEnum
 from app.models.account.setting import Setting
+from app.repositories.monitor.monitor_stats_rollup_repository import (
+    find_configs_missing_rollups,
+    rebuild_stats_rollups
+)
+from app.services.monitor.collector import monitor_collect_engine
 
 
 class SchedulerService:
@@ -85,6 +91,14 @@ class SchedulerService:
         )
         log.info("添加系统任务: 数据统计, cron=每小时整点")
 
+        # 周/月汇总回填 - 启动时执行一次（补齐汇总表上线前的历史数据，已有汇总的配置跳过）
+        self.scheduler.add_job(
+            self._rollup_backfill_task,
+            id="system_rollup_backfill",
+            replace_existing=True,
+        )
+        log.info("添加系统任务: 周/月汇总回填, 启动时执行一次")
+
     async def _load_tasks(self):
         """从数据库加载任务配置"""
         # 获取所有用户的调度配置
@@ -217,10 +231,10 @@ class SchedulerService:
     # ========== 任务执行器 ==========
 
     async def _collect_task(self, owner_id: int):
-        """采集任务执行器"""
+        """采集任务执行器：采集该用户所有启用的监控账号"""
         log.info(f"[采集任务] 开始执行, owner_id={owner_id}, time={datetime.now()}")
-        # TODO: 实现采集逻辑
-        log.info(f"[采集任务] 执行完成, owner_id={owner_id}")
+        summary = await monitor_collect_engine.run(user_id=owner_id)
+        log.info(f"[采集任务] 执行完成, owner_id={owner_id}, 成功={summary.success}, 失败={summary.failed}")
 
     async def _create_task(self, owner_id: int):
         """创作任务执行器"""
@@ -240,15 +254,28 @@ class SchedulerService:
         """
         数据统计任务执行器（系统级，与用户无关）
 
-        每小时执行一次，用于统计系统数据
+        每小时执行一次，采集所有用户启用的监控账号数据，更新当天的每日数据。
+        跳过最近已采集过的账号（如刚执行过用户的采集任务），避免重复请求平台
         """
         log.info(f"[数据统计] 开始执行, time={datetime.now()}")
-        # TODO: 实现数据统计逻辑
-        # 例如：
-        # - 统计用户活跃数
-        # - 统计任务执行情况
-        # - 生成报表数据
-        log.info(f"[数据统计] 执行完成")
+        summary = await monitor_collect_engine.run(skip_recent=settings.monitor_stats_skip_recent)
+        log.info(
+            f"[数据统计] 执行完成, 配置={summary.total}, 新增={summary.inserted}, "
+            f"更新={summary.updated}, 耗时={summary.elapsed_ms}ms"
+        )
+
+    async def _rollup_backfill_task(self):
+        """
+        周/月汇总回填任务执行器（系统级，启动时执行一次）
+
+        为有每日数据但缺少汇总的配置按全部历史数据重建汇总，之后由每日数据写入增量维护
+        """
+        config_ids = await find_configs_missing_rollups()
+        if not config_ids:
+            return
+        log.info(f"[汇总回填] 开始执行, 配置数={len(config_ids)}")
+        await rebuild_stats_rollups(config_ids)
+        log.info(f"[汇总回填] 执行完成, 配置数={len(config_ids)}")
 
 
 # 全局调度器实例
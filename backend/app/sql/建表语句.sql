@@ -70,6 +70,48 @@ CREATE TABLE `monitor_daily_stats` (
 	KEY `idx_stat_date` ( `stat_date` ) USING BTREE
 ) ENGINE = INNODB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_general_ci ROW_FORMAT = DYNAMIC COMMENT = '监控每日数据明细表';
 
+CREATE TABLE `monitor_weekly_stats` (
+	`id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT COMMENT '主键ID',
+	`config_id` BIGINT UNSIGNED NOT NULL COMMENT '关联配置ID',
+	`period_start` DATE NOT NULL COMMENT '周期开始日期 (周一)',
+	`period_end` DATE NOT NULL COMMENT '周期结束日期',
+	`last_stat_date` DATE NOT NULL COMMENT '期末数据对应的统计日期',
+	`days_count` INT UNSIGNED NOT NULL DEFAULT '0' COMMENT '周期内有数据的天数',
+	`follower_count` INT UNSIGNED NOT NULL DEFAULT '0' COMMENT '期末粉丝数',
+	`liked_count` INT UNSIGNED NOT NULL DEFAULT '0' COMMENT '期末获赞/收藏数',
+	`view_count` BIGINT UNSIGNED NOT NULL DEFAULT '0' COMMENT '期末总播放/阅读量',
+	`content_count` INT UNSIGNED NOT NULL DEFAULT '0' COMMENT '期末发布内容数量',
+	`follower_delta` INT NOT NULL DEFAULT '0' COMMENT '粉丝增量',
+	`liked_delta` INT NOT NULL DEFAULT '0' COMMENT '获赞/收藏增量',
+	`view_delta` BIGINT NOT NULL DEFAULT '0' COMMENT '播放/阅读增量',
+	`content_delta` INT NOT NULL DEFAULT '0' COMMENT '发布内容增量',
+	`created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+	`updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+	PRIMARY KEY ( `id` ) USING BTREE,
+	UNIQUE KEY `uk_config_period` ( `config_id`, `period_start` ) USING BTREE COMMENT '确保每周每配置只有一条记录'
+) ENGINE = INNODB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_general_ci ROW_FORMAT = DYNAMIC COMMENT = '监控每周汇总数据表 (由每日数据增量维护)';
+
+CREATE TABLE `monitor_monthly_stats` (
+	`id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT COMMENT '主键ID',
+	`config_id` BIGINT UNSIGNED NOT NULL COMMENT '关联配置ID',
+	`period_start` DATE NOT NULL COMMENT '周期开始日期 (每月1日)',
+	`period_end` DATE NOT NULL COMMENT '周期结束日期',
+	`last_stat_date` DATE NOT NULL COMMENT '期末数据对应的统计日期',
+	`days_count` INT UNSIGNED NOT NULL DEFAULT '0' COMMENT '周期内有数据的天数',
+	`follower_count` INT UNSIGNED NOT NULL DEFAULT '0' COMMENT '期末粉丝数',
+	`liked_count` INT UNSIGNED NOT NULL DEFAULT '0' COMMENT '期末获赞/收藏数',
+	`view_count` BIGINT UNSIGNED NOT NULL DEFAULT '0' COMMENT '期末总播放/阅读量',
+	`content_count` INT UNSIGNED NOT NULL DEFAULT '0' COMMENT '期末发布内容数量',
+	`follower_delta` INT NOT NULL DEFAULT '0' COMMENT '粉丝增量',
+	`liked_delta` INT NOT NULL DEFAULT '0' COMMENT '获赞/收藏增量',
+	`view_delta` BIGINT NOT NULL DEFAULT '0' COMMENT '播放/阅读增量',
+	`content_delta` INT NOT NULL DEFAULT '0' COMMENT '发布内容增量',
+	`created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+	`updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+	PRIMARY KEY ( `id` ) USING BTREE,
+	UNIQUE KEY `uk_config_period` ( `config_id`, `period_start` ) USING BTREE COMMENT '确保每月每配置只有一条记录'
+) ENGINE = INNODB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_general_ci ROW_FORMAT = DYNAMIC COMMENT = '监控每月汇总数据表 (由每日数据增量维护)';
+
 CREATE TABLE `tasks` (
 	`id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT COMMENT '任务ID',
 	`channel_code` INT UNSIGNED NOT NULL COMMENT '渠道编码 (ChannelEnum)',
@@ -2,6 +2,7 @@
 import asyncio
 import os
 import sys
+import timeit
 from typing import List, Dict, Any
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -93,6 +94,42 @@ class AccountTester:
         except Exception as e:
             self.log_test_result("项目枚举序列化", False, str(e))
 
+    async def test_binding_response_enum_lookup_benchmark(self):
+        """测试3.1: 绑定响应转换中枚举查找的性能"""
+        print("\n测试3.1: 绑定响应转换中枚举查找的性能")
+        try:
+            def linear_from_code(enum_cls, code):
+                for member in enum_cls:
+                    if member.code == code:
+                        return member
+                raise ValueError(code)
+
+            channel_codes = [c.code for c in ChannelEnum]
+            number = 20000
+            linear_cost = timeit.timeit(
+                lambda: [linear_from_code(ChannelEnum, c) for c in channel_codes], number=number
+            )
+            indexed_cost = timeit.timeit(
+                lambda: [ChannelEnum.from_code(c) for c in channel_codes], number=number
+            )
+
+            binding = AccountProjectChannel(
+                id=1, account_id=1, project_code=ProjectEnum.AI_LANDSCAPE.code,
+                channel_codes=",".join(str(c.code) for c in ProjectEnum.AI_LANDSCAPE.channels)
+            )
+            convert_cost = timeit.timeit(
+                lambda: self.account_service._to_binding_response(binding), number=number
+            )
+
+            assert indexed_cost < linear_cost, "索引查找应快于线性扫描"
+            self.log_test_result(
+                "枚举查找性能", True,
+                f"线性 {linear_cost / number * 1e6:.2f}us/次，索引 {indexed_cost / number * 1e6:.2f}us/次，"
+                f"_to_binding_response {convert_cost / number * 1e6:.2f}us/次"
+            )
+        except Exception as e:
+            self.log_test_result("枚举查找性能", False, str(e))
+
     # ========== 账号管理测试 ==========
 
     async def test_create_account(self):
@@ -277,6 +314,27 @@ class AccountTester:
         except Exception as e:
             self.log_test_result("获取有效配置", False, str(e))
 
+    async def test_resolve_effective_settings(self):
+        """测试14.1: 批量获取有效配置"""
+        print("\n测试14.1: 批量获取有效配置")
+        try:
+            setting_key = GeneralSettingEnum.AUTO_DOWNLOAD.code
+            result = await self.setting_service.resolve_effective_settings(
+                [self.created_account_id, 99999999], [setting_key]
+            )
+            assert 99999999 not in result, "不存在的账号不应出现在结果中"
+            expected = await self.setting_service.get_effective_setting(
+                self.created_account_id, self.test_user_id, setting_key
+            )
+            assert result[self.created_account_id] == {setting_key: expected}
+
+            # 不传 keys 时返回全部配置项
+            result = await self.setting_service.resolve_effective_settings([self.created_account_id])
+            assert setting_key in result[self.created_account_id]
+            self.log_test_result("批量获取有效配置", True, f"共{len(result[self.created_account_id])}个配置项")
+        except Exception as e:
+            self.log_test_result("批量获取有效配置", False, str(e))
+
     # ========== 删除测试 ==========
 
     async def test_delete_account(self):
@@ -304,6 +362,7 @@ class AccountTester:
             await self.test_channel_enum()
             await self.test_project_enum()
             await self.test_project_to_dict()
+            await self.test_binding_response_enum_lookup_benchmark()
 
             # 账号管理测试
             await self.test_create_account()
@@ -321,6 +380,7 @@ class AccountTester:
             await self.test_account_setting_override()
             await self.test_account_setting_reset()
             await self.test_effective_setting()
+            await self.test_resolve_effective_settings()
 
             # 删除测试
             await self.test_delete_account()
@@ -1,7 +1,9 @@
 # 激活码模块测试文件
 import asyncio
 import os
+import re
 import sys
+import timeit
 from datetime import datetime
 from typing import List, Dict, Any
 
@@ -15,11 +17,15 @@ from app.schemas.account.activation import (
     ActivationCodeCreateItem,
     ActivationCodeGetRequest,
     ActivationCodeInvalidateRequest,
-    ActivationCodeQueryRequest
+    ActivationCodeQueryRequest,
+    ActivationCodeResponse
 )
-from app.services.account.activation_service import ActivationCodeService
+from app.schemas.common.response import paginated_response
+from app.services.account.activation_service import activation_service
 from app.enums.account.activation_type import ActivationTypeEnum
 from app.enums.account.activation_status import ActivationCodeStatusEnum
+from app.util.activation_code_generator import code_generator
+from app.util.pagination import clear_count_cache
 
 
 class ActivationCodeTester:
@@ -76,7 +82,7 @@ class ActivationCodeTester:
             )
 
             # 执行初始化
-            result = await ActivationCodeService.init_activation_codes(request)
+            result = await activation_service.init_activation_codes(request)
 
             # 验证结果
             assert result.total_count == 6, f"期望创建6个激活码，实际创建{result.total_count}个"
@@ -106,7 +112,7 @@ class ActivationCodeTester:
         try:
             # 分发日卡激活码
             request = ActivationCodeGetRequest(type=ActivationTypeEnum.DAY.code, count=2)
-            distributed_codes = await ActivationCodeService.distribute_activation_codes(request)
+            distributed_codes = await activation_service.distribute_activation_codes(request)
 
             # 验证分发结果
             assert len(distributed_codes) == 2, f"期望分发2个激活码，实际分发{len(distributed_codes)}个"
@@ -142,7 +148,7 @@ class ActivationCodeTester:
             assert distributed_code is not None, "没有找到已分发的激活码"
 
             # 执行激活
-            result = await ActivationCodeService.activate_activation_code(distributed_code.activation_code)
+            result = await activation_service.activate_activation_code(distributed_code.activation_code)
 
             # 验证激活结果
             assert result.activation_code == distributed_code.activation_code, "激活码不匹配"
@@ -180,14 +186,14 @@ class ActivationCodeTester:
             if distributed_code is None:
                 # 如果没有已分发的激活码，先分发一个
                 request = ActivationCodeGetRequest(type=ActivationTypeEnum.MONTH.code, count=1)
-                codes = await ActivationCodeService.distribute_activation_codes(request)
+                codes = await activation_service.distribute_activation_codes(request)
                 distributed_code = await ActivationCode.get(activation_code=codes[0])
 
             # 执行作废
             invalidate_request = ActivationCodeInvalidateRequest(
                 activation_code=distributed_code.activation_code
             )
-            result = await ActivationCodeService.invalidate_activation_code(invalidate_request)
+            result = await activation_service.invalidate_activation_code(invalidate_request)
 
             # 验证作废结果
             assert result is True, "作废操作失败"
@@ -219,7 +225,7 @@ class ActivationCodeTester:
                 status=ActivationCodeStatusEnum.UNUSED.code
             )
 
-            queryset = ActivationCodeService.get_activation_code_queryset(query_request)
+            queryset = activation_service.get_activation_code_list(query_request)
             results = await queryset
 
             # 验证查询结果
@@ -232,7 +238,7 @@ class ActivationCodeTester:
                 single_query = ActivationCodeQueryRequest(
                     activation_code=self.created_codes[0]
                 )
-                single_queryset = ActivationCodeService.get_activation_code_queryset(single_query)
+                single_queryset = activation_service.get_activation_code_list(single_query)
                 single_results = await single_queryset
 
                 assert len(single_results) <= 1, "精确查询结果过多"
@@ -249,6 +255,111 @@ class ActivationCodeTester:
         except Exception as e:
             self.log_test_result("激活码查询", False, str(e))
 
+    async def test_cursor_pagination(self):
+        """测试游标分页与偏移分页结果一致"""
+        print("\n测试5.1: 激活码游标分页")
+
+        try:
+            type_code = ActivationTypeEnum.DAY.code
+            await activation_service.init_activation_codes(
+                ActivationCodeBatchCreateRequest(items=[ActivationCodeCreateItem(type=type_code, count=7)])
+            )
+
+            offset_request = ActivationCodeQueryRequest(page=1, size=100, type=type_code)
+            offset_page = (await paginated_response(
+                activation_service.get_activation_code_list(offset_request), offset_request
+            )).data
+
+            cursor_ids = []
+            cursor = None
+            while True:
+                cursor_request = ActivationCodeQueryRequest(
+                    size=3, type=type_code, cursor_mode=True, cursor=cursor, count_mode=3
+                )
+                page = (await paginated_response(
+                    activation_service.get_activation_code_list(cursor_request), cursor_request
+                )).data
+                assert page.total is None, "不统计模式不应返回总数"
+                cursor_ids.extend(item.id for item in page.items)
+                if not page.has_more:
+                    break
+                cursor = page.next_cursor
+
+            assert len(cursor_ids) == len(set(cursor_ids)), "游标分页出现重复记录"
+            assert set(cursor_ids) == {item.id for item in offset_page.items}, "游标分页与偏移分页结果不一致"
+
+            self.log_test_result(
+                "激活码游标分页",
+                True,
+                f"游标分页遍历{len(cursor_ids)}条记录，与偏移分页一致"
+            )
+
+        except Exception as e:
+            self.log_test_result("激活码游标分页", False, str(e))
+
+    async def test_cached_page_count(self):
+        """测试分页总数缓存：第一页重新统计，后续翻页复用"""
+        print("\n测试5.2: 分页总数缓存")
+
+        try:
+            clear_count_cache()
+            type_code = ActivationTypeEnum.MONTH.code
+
+            async def page_total(page: int) -> int:
+                request = ActivationCodeQueryRequest(page=page, size=2, type=type_code)
+                response = await paginated_response(
+                    activation_service.get_activation_code_list(request), request, cache_count=True
+                )
+                return response.data.total
+
+            first_total = await page_total(1)
+            await activation_service.init_activation_codes(
+                ActivationCodeBatchCreateRequest(items=[ActivationCodeCreateItem(type=type_code, count=3)])
+            )
+
+            cached_total = await page_total(2)
+            assert cached_total == first_total, f"第二页应复用缓存总数{first_total}，实际{cached_total}"
+
+            refreshed_total = await page_total(1)
+            assert refreshed_total == first_total + 3, f"第一页应重新统计为{first_total + 3}，实际{refreshed_total}"
+
+            self.log_test_result(
+                "分页总数缓存",
+                True,
+                f"翻页复用缓存总数{cached_total}，回到第一页刷新为{refreshed_total}"
+            )
+
+        except Exception as e:
+            self.log_test_result("分页总数缓存", False, str(e))
+        finally:
+            clear_count_cache()
+
+    async def test_projected_pagination(self):
+        """测试投影分页与完整加载结果一致"""
+        print("\n测试5.3: 激活码投影分页")
+
+        try:
+            request = ActivationCodeQueryRequest(page=1, size=100)
+            full_page = (await paginated_response(
+                activation_service.get_activation_code_list(request), request
+            )).data
+            projected_page = (await paginated_response(
+                activation_service.get_activation_code_list(request), request, schema=ActivationCodeResponse
+            )).data
+
+            full_items = [ActivationCodeResponse.model_validate(item).model_dump() for item in full_page.items]
+            projected_items = [ActivationCodeResponse.model_validate(item).model_dump() for item in projected_page.items]
+            assert projected_items == full_items, "投影分页结果与完整加载不一致"
+
+            self.log_test_result(
+                "激活码投影分页",
+                True,
+                f"投影分页返回{len(projected_items)}条记录，与完整加载一致"
+            )
+
+        except Exception as e:
+            self.log_test_result("激活码投影分页", False, str(e))
+
     async def test_complete_business_flow(self):
         """测试完整的业务流程"""
         print("\n测试6: 完整业务流程测试")
@@ -258,7 +369,7 @@ class ActivationCodeTester:
             batch_request = ActivationCodeBatchCreateRequest(
                 items=[ActivationCodeCreateItem(type=ActivationTypeEnum.PERMANENT.code, count=1)]
             )
-            batch_result = await ActivationCodeService.init_activation_codes(batch_request)
+            batch_result = await activation_service.init_activation_codes(batch_request)
 
             test_code = batch_result.results[0].activation_codes[0]
 
@@ -267,17 +378,17 @@ class ActivationCodeTester:
                 type=ActivationTypeEnum.PERMANENT.code,
                 count=1
             )
-            distributed_codes = await ActivationCodeService.distribute_activation_codes(get_request)
+            distributed_codes = await activation_service.distribute_activation_codes(get_request)
 
             assert test_code in distributed_codes, "分发失败"
 
             # 3. 激活激活码
-            activate_result = await ActivationCodeService.activate_activation_code(test_code)
+            activate_result = await activation_service.activate_activation_code(test_code)
 
             assert activate_result.status == ActivationCodeStatusEnum.ACTIVATED.code, "激活失败"
 
             # 4. 查询激活码详情
-            detail_result = await ActivationCodeService.get_activation_code_by_code(test_code)
+            detail_result = await activation_service.get_activation_code_by_code(test_code)
 
             assert detail_result.activation_code == test_code, "详情查询失败"
             assert detail_result.distributed_at is not None, "分发时间缺失"
@@ -286,7 +397,7 @@ class ActivationCodeTester:
 
             # 5. 作废激活码
             invalidate_request = ActivationCodeInvalidateRequest(activation_code=test_code)
-            invalidate_result = await ActivationCodeService.invalidate_activation_code(invalidate_request)
+            invalidate_result = await activation_service.invalidate_activation_code(invalidate_request)
 
             assert invalidate_result is True, "作废失败"
 
@@ -315,7 +426,7 @@ class ActivationCodeTester:
         # 测试1: 分发不存在的激活码类型
         try:
             request = ActivationCodeGetRequest(type=999, count=1)
-            await ActivationCodeService.distribute_activation_codes(request)
+            await activation_service.distribute_activation_codes(request)
             exception_tests.append({"test": "分发不存在类型", "success": False, "reason": "应该抛出异常但没有"})
         except Exception:
             exception_tests.append({"test": "分发不存在类型", "success": True})
@@ -326,7 +437,7 @@ class ActivationCodeTester:
                 status=ActivationCodeStatusEnum.UNUSED.code
             ).first()
             if unused_code:
-                await ActivationCodeService.activate_activation_code(unused_code.activation_code)
+                await activation_service.activate_activation_code(unused_code.activation_code)
                 exception_tests.append({"test": "激活未分发激活码", "success": False, "reason": "应该抛出异常但没有"})
             else:
                 exception_tests.append({"test": "激活未分发激活码", "success": True, "reason": "没有未分发的激活码"})
@@ -340,7 +451,7 @@ class ActivationCodeTester:
             ).first()
             if unused_code:
                 request = ActivationCodeInvalidateRequest(activation_code=unused_code.activation_code)
-                await ActivationCodeService.invalidate_activation_code(request)
+                await activation_service.invalidate_activation_code(request)
                 exception_tests.append({"test": "作废未分发激活码", "success": False, "reason": "应该抛出异常但没有"})
             else:
                 exception_tests.append({"test": "作废未分发激活码", "success": True, "reason": "没有未分发的激活码"})
@@ -349,7 +460,7 @@ class ActivationCodeTester:
 
         # 测试4: 激活不存在的激活码
         try:
-            await ActivationCodeService.activate_activation_code("non_existent_code")
+            await activation_service.activate_activation_code("non_existent_code")
             exception_tests.append({"test": "激活不存在激活码", "success": False, "reason": "应该抛出异常但没有"})
         except Exception:
             exception_tests.append({"test": "激活不存在激活码", "success": True})
@@ -420,6 +531,126 @@ class ActivationCodeTester:
         except Exception as e:
             self.log_test_result("库存管理", False, str(e))
 
+    async def test_generate_batch_benchmark(self):
+        """测试激活码批量生成器的格式与性能"""
+        print("\n测试8.1: 激活码生成器性能")
+
+        try:
+            n = 20000
+            codes = code_generator.generate_batch(n)
+            pattern = re.compile(r'[0-9a-f]{32}[A-Za-z0-9]{16}')
+            assert len(codes) == n, f"期望生成{n}个激活码，实际{len(codes)}个"
+            assert all(pattern.fullmatch(code) for code in codes), "激活码格式与 generate() 不一致"
+            assert len(set(codes)) == n, "激活码存在重复"
+
+            single_cost = timeit.timeit(lambda: [code_generator.generate() for _ in range(n)], number=1)
+            batch_cost = timeit.timeit(lambda: code_generator.generate_batch(n), number=1)
+            single_us = single_cost / n * 1e6
+            batch_us = batch_cost / n * 1e6
+
+            self.log_test_result(
+                "激活码生成器性能",
+                True,
+                f"单个生成{single_us:.2f}µs/个，批量生成{batch_us:.2f}µs/个，"
+                f"加速{single_cost / batch_cost:.1f}倍",
+                {"single_us": single_us, "batch_us": batch_us}
+            )
+
+        except Exception as e:
+            self.log_test_result("激活码生成器性能", False, str(e))
+
+    async def test_bulk_initialization(self):
+        """测试激活码批量生成（分块批量写入）"""
+        print("\n测试9: 激活码批量生成")
+
+        try:
+            count = 5000
+            request = ActivationCodeBatchCreateRequest(
+                items=[ActivationCodeCreateItem(type=ActivationTypeEnum.PERMANENT.code, count=count)]
+            )
+            result = await activation_service.init_activation_codes(request)
+
+            codes = result.results[0].activation_codes
+            assert result.total_count == count, f"期望创建{count}个激活码，实际创建{result.total_count}个"
+            assert len(set(codes)) == count, "激活码存在重复"
+            assert all(len(code) == 48 for code in codes), "激活码长度错误"
+
+            saved_count = await ActivationCode.filter(activation_code__in=codes).count()
+            assert saved_count == count, f"数据库中应有{count}个激活码，实际{saved_count}个"
+
+            self.log_test_result(
+                "激活码批量生成",
+                True,
+                f"生成{count}个激活码，耗时{result.elapsed_ms}ms，吞吐量{result.codes_per_second}个/秒",
+                {"elapsed_ms": result.elapsed_ms, "codes_per_second": result.codes_per_second}
+            )
+
+        except Exception as e:
+            self.log_test_result("激活码批量生成", False, str(e))
+
+    async def test_concurrent_distribution(self):
+        """测试并发派发激活码不重复"""
+        print("\n测试10: 并发派发激活码")
+
+        try:
+            type_code = ActivationTypeEnum.PERMANENT.code
+            requests = [ActivationCodeGetRequest(type=type_code, count=20) for _ in range(5)]
+            results = await asyncio.gather(
+                *(activation_service.distribute_activation_codes(request) for request in requests)
+            )
+
+            distributed = [code for codes in results for code in codes]
+            assert len(distributed) == 100, f"期望派发100个激活码，实际{len(distributed)}个"
+            assert len(set(distributed)) == len(distributed), "同一激活码被重复派发"
+
+            saved_count = await ActivationCode.filter(
+                activation_code__in=distributed,
+                status=ActivationCodeStatusEnum.DISTRIBUTED.code,
+                distributed_at__isnull=False
+            ).count()
+            assert saved_count == len(distributed), "激活码状态或分发时间未更新"
+
+            self.log_test_result(
+                "并发派发激活码",
+                True,
+                f"5个并发请求共派发{len(distributed)}个激活码，无重复"
+            )
+
+        except Exception as e:
+            self.log_test_result("并发派发激活码", False, str(e))
+
+    async def test_distribution_contention(self):
+        """测试并发冲突重试用尽时返回可重试错误"""
+        print("\n测试11: 派发并发冲突")
+
+        try:
+            from app.core.exceptions import BusinessException
+            from app.repositories.account.activation_repository import (
+                ActivationCodeClaimConflict,
+                activation_repository
+            )
+
+            async def always_conflict(type_code: int, count: int, max_retries: int = 3):
+                raise ActivationCodeClaimConflict(f"派发激活码并发冲突，已重试{max_retries}次")
+
+            # 模拟每次领取都被并发请求抢先修改，重试用尽
+            activation_repository.claim_unused_codes = always_conflict
+            try:
+                await activation_service.distribute_activation_codes(
+                    ActivationCodeGetRequest(type=ActivationTypeEnum.DAY.code, count=1)
+                )
+                raise Exception("重试用尽时应该抛出异常")
+            except BusinessException as e:
+                assert e.code == 409, f"应返回可重试的冲突错误，实际: {e.code} {e.message}"
+                assert "不足" not in e.message, f"不应提示数量不足: {e.message}"
+            finally:
+                del activation_repository.claim_unused_codes
+
+            self.log_test_result("派发并发冲突", True, "重试用尽时返回409，不误报激活码不足")
+
+        except Exception as e:
+            self.log_test_result("派发并发冲突", False, str(e))
+
     async def run_all_tests(self):
         """运行所有测试"""
         print("=" * 80)
@@ -436,9 +667,16 @@ class ActivationCodeTester:
             await self.test_activation_code_activation()
             await self.test_activation_code_invalidation()
             await self.test_activation_code_query()
+            await self.test_cursor_pagination()
+            await self.test_cached_page_count()
+            await self.test_projected_pagination()
             await self.test_complete_business_flow()
             await self.test_exception_scenarios()
             await self.test_inventory_management()
+            await self.test_generate_batch_benchmark()
+            await self.test_bulk_initialization()
+            await self.test_concurrent_distribution()
+            await self.test_distribution_contention()
 
             # 统计测试结果
             total_tests = len(self.test_results)
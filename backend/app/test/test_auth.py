@@ -2,6 +2,7 @@
 import asyncio
 import os
 import sys
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Any
 
@@ -15,9 +16,12 @@ from app.models.account.activation_code import ActivationCode
 from app.schemas.account.user import UserRegisterRequest
 from app.schemas.account.auth import LoginRequest
 from app.schemas.account.activation import ActivationCodeBatchCreateRequest, ActivationCodeCreateItem, ActivationCodeGetRequest
-from app.services.account.user_service import UserService
-from app.services.account.activation_service import ActivationCodeService
+from app.services.account.user_service import user_service
+from app.services.account.activation_service import activation_service
+from app.repositories.account.user_repository import user_repository
+from app.util.auth_context import get_current_user
 from app.util.jwt import jwt_manager
+from app.util.password import verify_password
 from app.enums.account.activation_type import ActivationTypeEnum
 from app.enums.account.activation_status import ActivationCodeStatusEnum
 
@@ -75,11 +79,11 @@ class AuthModuleTester:
             ]
         )
 
-        batch_result = await ActivationCodeService.init_activation_codes(batch_request)
+        batch_result = await activation_service.init_activation_codes(batch_request)
 
         # 派发所有激活码
         distribute_request = ActivationCodeGetRequest(type=ActivationTypeEnum.DAY.code, count=20)
-        day_codes = await ActivationCodeService.distribute_activation_codes(distribute_request)
+        day_codes = await activation_service.distribute_activation_codes(distribute_request)
 
         self.test_activation_codes = day_codes
         print(f"成功设置 {len(self.test_activation_codes)} 个测试激活码")
@@ -95,7 +99,7 @@ class AuthModuleTester:
                 password="TestPass123",
                 activation_code=self.test_activation_codes[i]
             )
-            user = await UserService.register_user(register_request)
+            user = await user_service.register_user(register_request)
             self.test_users.append({
                 "id": user.id,
                 "username": user.username,
@@ -176,6 +180,62 @@ class AuthModuleTester:
         except Exception as e:
             self.log_test_result("JWT Token验证", False, str(e))
 
+    async def test_current_user_cache(self):
+        """测试认证用户缓存与 Token 载荷缓存"""
+        print("\n测试2.1: 认证用户缓存")
+
+        try:
+            from app.services.account.auth_service import auth_service
+
+            if not self.test_users:
+                raise Exception("没有可用的测试用户")
+
+            test_user = self.test_users[2]
+            token = jwt_manager.create_access_token(test_user["id"])["access_token"]
+
+            # Token 载荷按 token 缓存
+            hits = jwt_manager._payload_cache.hits
+            first_payload = jwt_manager.verify_token(token)
+            second_payload = jwt_manager.verify_token(token)
+            assert first_payload == second_payload, "缓存的载荷与首次验证结果不一致"
+            assert jwt_manager._payload_cache.hits == hits + 1, "第二次验证未命中载荷缓存"
+
+            # 同一用户在有效期内命中缓存，每次返回副本，修改返回值不影响缓存
+            user_repository.clear_cache()
+            first_user = await get_current_user(token)
+            hits = user_repository._cache.hits
+            second_user = await get_current_user(token)
+            assert user_repository._cache.hits == hits + 1, "第二次获取用户未命中缓存"
+            assert first_user is not second_user, "缓存直接返回了共享实例"
+            original_email = second_user.email
+            second_user.email = "unsaved@example.com"
+            assert (await get_current_user(token)).email == original_email, "修改返回值影响了缓存"
+
+            # 修改密码基于重新读取的用户，不会把缓存副本上未保存的修改写入数据库
+            # （新密码与原密码相同，后续登录测试仍可使用）
+            old_hash = (await user_repository.get_by_id(test_user["id"])).password
+            await auth_service.change_password(second_user, test_user["password"])
+            saved_user = await user_repository.get_by_id(test_user["id"])
+            assert saved_user.email == original_email, "修改密码写入了缓存副本上的旧数据"
+            assert saved_user.password != old_hash, "密码未更新"
+            assert verify_password(test_user["password"], saved_user.password), "新密码校验失败"
+
+            # 更新用户后缓存失效，重新读取到新值
+            new_phone = "13900000021"
+            await user_repository.update_user(first_user, phone=new_phone)
+            refreshed_user = await get_current_user(token)
+            assert refreshed_user is not first_user, "更新用户后缓存未失效"
+            assert refreshed_user.phone == new_phone, "更新后读取到旧数据"
+
+            self.log_test_result(
+                "认证用户缓存",
+                True,
+                "Token 载荷与用户缓存命中正常，更新用户后缓存失效"
+            )
+
+        except Exception as e:
+            self.log_test_result("认证用户缓存", False, str(e))
+
     async def test_user_login(self):
         """测试用户登录"""
         print("\n测试3: 用户登录功能")
@@ -296,6 +356,77 @@ class AuthModuleTester:
         except Exception as e:
             self.log_test_result("密码认证", False, str(e))
 
+    @staticmethod
+    def _p99(samples: list) -> float:
+        """计算 p99（毫秒）"""
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+
+    async def _run_login_load(self, login, concurrency: int) -> Dict[str, float]:
+        """并发执行登录，同时持续请求轻量接口，返回登录与轻量接口的 p99"""
+        login_latencies = []
+        probe_latencies = []
+        finished = asyncio.Event()
+
+        async def timed_login():
+            start = time.perf_counter()
+            await login()
+            login_latencies.append(time.perf_counter() - start)
+
+        async def probe():
+            # 模拟并发的其他接口：一次轻量数据库查询
+            while not finished.is_set():
+                start = time.perf_counter()
+                await User.filter(id=self.test_users[0]["id"]).exists()
+                probe_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+
+        probe_task = asyncio.create_task(probe())
+        await asyncio.gather(*(timed_login() for _ in range(concurrency)))
+        finished.set()
+        await probe_task
+
+        return {
+            "login_p99_ms": self._p99(login_latencies),
+            "probe_p99_ms": self._p99(probe_latencies)
+        }
+
+    async def test_login_load_benchmark(self):
+        """测试并发登录时 bcrypt 对其他请求的影响"""
+        print("\n测试5.1: 并发登录负载")
+
+        try:
+            if not self.test_users:
+                raise Exception("没有可用的测试用户")
+
+            test_user = self.test_users[0]
+            from app.services.account.auth_service import auth_service
+            hashed = (await User.get(id=test_user["id"])).password
+            concurrency = 16
+
+            async def blocking_login():
+                # 旧实现：在事件循环中同步执行 bcrypt
+                await User.get(username=test_user["username"])
+                verify_password(test_user["password"], hashed)
+
+            async def pooled_login():
+                await auth_service.authenticate_user(test_user["username"], test_user["password"])
+
+            blocking = await self._run_login_load(blocking_login, concurrency)
+            pooled = await self._run_login_load(pooled_login, concurrency)
+
+            self.log_test_result(
+                "并发登录负载",
+                True,
+                f"{concurrency}个并发登录，同步bcrypt: 登录p99 {blocking['login_p99_ms']:.0f}ms / "
+                f"其他请求p99 {blocking['probe_p99_ms']:.0f}ms；"
+                f"线程池: 登录p99 {pooled['login_p99_ms']:.0f}ms / 其他请求p99 {pooled['probe_p99_ms']:.0f}ms",
+                {"blocking": blocking, "pooled": pooled}
+            )
+
+        except Exception as e:
+            self.log_test_result("并发登录负载", False, str(e))
+
     async def test_complete_auth_flow(self):
         """测试完整认证流程"""
         print("\n测试6: 完整认证流程测试")
@@ -310,7 +441,7 @@ class AuthModuleTester:
                 password="FlowTest123",
                 activation_code=self.test_activation_codes[10]
             )
-            user = await UserService.register_user(register_request)
+            user = await user_service.register_user(register_request)
 
             # 1. 用户登录
             mock_request = self.create_mock_request()
@@ -355,9 +486,11 @@ class AuthModuleTester:
             # 运行所有测试
             await self.test_jwt_token_generation()
             await self.test_jwt_token_verification()
+            await self.test_current_user_cache()
             await self.test_user_login()
             await self.test_user_logout()
             await self.test_password_authentication()
+            await self.test_login_load_benchmark()
             await self.test_complete_auth_flow()
 
             # 统计测试结果
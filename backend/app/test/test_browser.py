@@ -0,0 +1,230 @@
+# 比特浏览器服务测试文件
+import asyncio
+import json
+import os
+import sys
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.core.config import settings
+from app.core.exceptions import BusinessException
+from app.schemas.monitor.browser import BrowserOpenRequest
+from app.services.monitor.browser_service import BitBrowserService
+
+
+def start_bit_browser_server(fail_plan: Dict[str, List[int]] = None):
+    """
+    启动本地模拟的比特浏览器 API（测试夹具）
+
+    Args:
+        fail_plan: 窗口ID -> 依次返回的 HTTP 状态码，用完后返回成功；状态码 200 表示返回业务错误
+
+    Returns:
+        (server, base_url, stats) 其中 stats 统计各路径请求次数和客户端连接数
+    """
+    fail_plan = {browser_id: list(codes) for browser_id, codes in (fail_plan or {}).items()}
+    stats: Counter = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        # 支持长连接，便于统计连接复用
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            stats["connections"] += 1
+
+        def do_POST(self):
+            stats[self.path] += 1
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            codes = fail_plan.get(body.get("id"))
+            status = codes.pop(0) if codes else None
+            if status is not None and status != 200:
+                self._reply(status, {"success": False, "msg": "服务繁忙"})
+            elif status == 200:
+                self._reply(200, {"success": False, "msg": "窗口不存在"})
+            else:
+                self._reply(200, {"success": True, "data": {
+                    "ws": f"ws://127.0.0.1/{body.get('id')}", "http": "127.0.0.1:9222",
+                    "name": str(body.get("id")), "remark": ""
+                }})
+
+        def _reply(self, status: int, payload: Dict[str, Any]):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", stats
+
+
+class BrowserServiceTester:
+    """比特浏览器服务测试类（不依赖真实的比特浏览器）"""
+
+    def __init__(self):
+        self.test_results: List[Dict[str, Any]] = []
+
+    def log_test_result(self, test_name: str, success: bool, message: str = ""):
+        status = "✓ 成功" if success else "✗ 失败"
+        print(f"  {status}: {test_name}")
+        if message:
+            print(f"    {message}")
+        self.test_results.append({"test_name": test_name, "success": success})
+
+    async def test_batch_open(self):
+        """测试1: 批量打开窗口的结果顺序、重试次数、并发上限与业务错误不重试"""
+        print("\n测试1: 批量打开窗口的结果顺序、重试次数、并发上限与业务错误不重试")
+        original_backoff = settings.bit_browser_open_backoff
+        try:
+            settings.bit_browser_open_backoff = 0.01
+            service = BitBrowserService()
+            calls: Counter = Counter()
+            running = {"now": 0, "peak": 0}
+            # 打开耗时倒序，使后提交的窗口先完成
+            ids = [f"w{i}" for i in range(6)]
+            delays = {browser_id: 0.06 - i * 0.01 for i, browser_id in enumerate(ids)}
+
+            async def fake_make_request(endpoint: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+                browser_id = data["id"]
+                calls[browser_id] += 1
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+                try:
+                    await asyncio.sleep(delays[browser_id])
+                    if browser_id == "w1" and calls[browser_id] == 1:
+                        raise BusinessException(message="比特浏览器服务不可用", code=503) from httpx.ConnectError("连接被拒绝")
+                    if browser_id == "w2":
+                        raise asyncio.TimeoutError()
+                    if browser_id == "w3":
+                        raise BusinessException(message="比特浏览器API错误: 窗口不存在", code=400)
+                    return {"ws": f"ws://{browser_id}", "http": "", "name": browser_id, "remark": ""}
+                finally:
+                    running["now"] -= 1
+
+            service._make_request = fake_make_request
+            response = await service.open_browser(BrowserOpenRequest(ids=ids, concurrency=2, max_retries=2))
+
+            assert [result.id for result in response.results] == ids
+            attempts = {result.id: result.attempts for result in response.results}
+            # 网络错误重试后成功，超时用完重试次数，业务错误不重试
+            assert attempts == {"w0": 1, "w1": 2, "w2": 3, "w3": 1, "w4": 1, "w5": 1}, attempts
+            assert dict(calls) == attempts
+            assert response.success_count == 4 and response.fail_count == 2
+            assert running["peak"] == 2
+
+            self.log_test_result(
+                "批量打开窗口", True,
+                f"尝试次数={attempts}, 并发峰值={running['peak']}, 总耗时={response.elapsed_ms}ms"
+            )
+        except Exception as e:
+            self.log_test_result("批量打开窗口", False, str(e))
+        finally:
+            settings.bit_browser_open_backoff = original_backoff
+
+    async def test_open_retry_over_http(self):
+        """测试2: 通过真实 HTTP 请求判定是否重试（5xx 重试，业务错误不重试）"""
+        print("\n测试2: 通过真实 HTTP 请求判定是否重试（5xx 重试，业务错误不重试）")
+        original_backoff = settings.bit_browser_open_backoff
+        server, base_url, stats = start_bit_browser_server({"busy": [503], "missing": [200], "bad": [404]})
+        service = BitBrowserService()
+        service.base_url = base_url
+        try:
+            settings.bit_browser_open_backoff = 0.01
+            response = await service.open_browser(
+                BrowserOpenRequest(ids=["ok", "busy", "missing", "bad"], max_retries=2)
+            )
+
+            results = {result.id: result for result in response.results}
+            assert results["ok"].success and results["ok"].attempts == 1
+            assert results["busy"].success and results["busy"].attempts == 2
+            assert not results["missing"].success and results["missing"].attempts == 1
+            assert "窗口不存在" in results["missing"].error
+            # HTTP 4xx 不是瞬时错误，不重试
+            assert not results["bad"].success and results["bad"].attempts == 1
+            assert stats["/browser/open"] == 5
+
+            self.log_test_result(
+                "真实请求的重试判定", True,
+                f"尝试次数={ {result.id: result.attempts for result in response.results} }"
+            )
+        except Exception as e:
+            self.log_test_result("真实请求的重试判定", False, str(e))
+        finally:
+            settings.bit_browser_open_backoff = original_backoff
+            await service.stop()
+            server.shutdown()
+
+    async def test_shared_client(self):
+        """测试3: 共享 HTTP 客户端在多次请求间复用，stop() 后关闭"""
+        print("\n测试3: 共享 HTTP 客户端在多次请求间复用，stop() 后关闭")
+        server, base_url, stats = start_bit_browser_server()
+        service = BitBrowserService()
+        service.base_url = base_url
+        try:
+            await service.start()
+            client = service._client
+            for _ in range(5):
+                await service.health_check()
+                assert service._client is client
+            # 顺序请求复用同一条长连接
+            assert stats["/health"] == 5
+            assert stats["connections"] == 1, stats
+
+            # 重复调用 start() 不会替换已创建的客户端
+            await service.start()
+            assert service._client is client
+
+            await service.stop()
+            assert client.is_closed and service._client is None
+
+            # 未随应用启动时（如脚本中直接调用）按需创建新的客户端
+            await service.health_check()
+            assert service._client is not None and service._client is not client
+
+            self.log_test_result("共享HTTP客户端", True, f"请求统计={dict(stats)}")
+        except Exception as e:
+            self.log_test_result("共享HTTP客户端", False, str(e))
+        finally:
+            await service.stop()
+            server.shutdown()
+
+    async def run_all_tests(self):
+        print("=" * 80)
+        print("开始比特浏览器服务测试")
+        print("=" * 80)
+
+        try:
+            await self.test_batch_open()
+            await self.test_open_retry_over_http()
+            await self.test_shared_client()
+
+            total = len(self.test_results)
+            passed = sum(1 for r in self.test_results if r["success"])
+            print("\n" + "=" * 80)
+            print(f"测试结果: {passed}/{total} 通过，成功率 {passed/total*100:.0f}%")
+            print("=" * 80)
+
+        except Exception as e:
+            print(f"测试过程中出现错误: {e}")
+
+
+async def main():
+    """主测试入口"""
+    tester = BrowserServiceTester()
+    await tester.run_all_tests()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
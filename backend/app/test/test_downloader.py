@@ -2,11 +2,52 @@
 import asyncio
 import os
 import sys
+import threading
+from collections import Counter
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from typing import List, Dict, Any
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 
+def start_media_server(directory: str, size: int = 2 * 1024 * 1024, count: int = 1):
+    """
+    启动本地媒体文件服务器（测试夹具），yt-dlp 通过通用解析器直接下载其中的 mp4 文件
+
+    Args:
+        directory: 媒体文件目录
+        size: 每个文件大小（字节）
+        count: 生成的文件数量，文件名为 clip0.mp4、clip1.mp4 ...
+
+    Returns:
+        (server, base_url, requests) 其中 requests 统计每个路径的 GET 次数
+    """
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        with open(os.path.join(directory, f"clip{i}.mp4"), "wb") as f:
+            f.write(os.urandom(size))
+
+    requests: Counter = Counter()
+
+    class Handler(SimpleHTTPRequestHandler):
+        def do_GET(self):
+            requests[self.path] += 1
+            super().do_GET()
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        def handle_error(self, request, client_address):
+            # yt-dlp 解析时读取响应头后即断开连接，忽略 BrokenPipe
+            pass
+
+    server = Server(("127.0.0.1", 0), partial(Handler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", requests
+
+
 class DownloaderTester:
     """下载模块测试类"""
 
@@ -136,6 +177,323 @@ class DownloaderTester:
         except Exception as e:
             self.log_test_result("进度回调类型定义", False, str(e))
 
+    async def test_download_manager_queue(self):
+        """测试9: 下载队列并发上限、优先级、取消与进度广播"""
+        print("\n测试9: 下载队列并发上限、优先级、取消与进度广播")
+        try:
+            from app.enums.common.download_status import DownloadStatusEnum
+            from app.services.downloader.download_manager import DownloadManager
+
+            running = {"total": 0, "peak": 0}
+            domain_running: Dict[str, int] = {}
+            domain_peak: Dict[str, int] = {}
+            started: List[str] = []
+
+            async def fake_runner(url: str, user_id: int, on_progress):
+                # 模拟 yt-dlp：在工作线程中回调进度
+                domain = "youtube" if "youtu" in url else "douyin"
+                started.append(url)
+                running["total"] += 1
+                running["peak"] = max(running["peak"], running["total"])
+                domain_running[domain] = domain_running.get(domain, 0) + 1
+                domain_peak[domain] = max(domain_peak.get(domain, 0), domain_running[domain])
+                try:
+                    for i in range(1, 5):
+                        await asyncio.to_thread(on_progress, i * 25, 100)
+                        await asyncio.sleep(0.01)
+                    return f"/downloads/{url.rsplit('/', 1)[-1]}.mp4"
+                finally:
+                    running["total"] -= 1
+                    domain_running[domain] -= 1
+
+            manager = DownloadManager(max_concurrency=3, domain_concurrency=2, runner=fake_runner)
+
+            youtube_jobs = [manager.submit(f"https://www.youtube.com/watch/v{i}", self.test_user_id) for i in range(4)]
+            douyin_jobs = [manager.submit(f"https://www.douyin.com/video/{i}", self.test_user_id) for i in range(3)]
+            urgent = manager.submit("https://youtu.be/urgent", self.test_user_id, priority=10)
+            cancelled = manager.submit("https://www.douyin.com/video/cancelled", self.test_user_id)
+
+            progress: List[int] = []
+            urgent.subscribe(lambda downloaded, total: progress.append(downloaded))
+            assert manager.cancel(cancelled.id)
+
+            jobs = youtube_jobs + douyin_jobs + [urgent]
+            paths = await asyncio.gather(*(job.wait() for job in jobs))
+
+            assert paths[-1] == "/downloads/urgent.mp4"
+            assert all(job.status == DownloadStatusEnum.SUCCESS for job in jobs)
+            assert cancelled.status == DownloadStatusEnum.CANCELLED
+            assert "https://www.douyin.com/video/cancelled" not in started
+            assert running["peak"] <= 3
+            assert all(peak <= 2 for peak in domain_peak.values())
+            # 高优先级任务应在第一批 youtube 名额释放后立即执行，早于其余排队的 youtube 任务
+            assert started.index("https://youtu.be/urgent") < started.index("https://www.youtube.com/watch/v2")
+            assert progress == [25, 50, 75, 100]
+            assert manager.stats()["running"] == 0
+
+            self.log_test_result(
+                "下载队列并发上限、优先级、取消与进度广播", True,
+                f"全局峰值={running['peak']}, 站点峰值={domain_peak}, 执行顺序={len(started)}个任务"
+            )
+        except Exception as e:
+            self.log_test_result("下载队列并发上限、优先级、取消与进度广播", False, str(e))
+
+    async def test_download_dedup_cache(self):
+        """测试10: 下载去重缓存（本地媒体服务器）"""
+        print("\n测试10: 下载去重缓存（本地媒体服务器）")
+        import shutil
+        import tempfile
+        from app.util import yt_dlp_util
+        from app.util.download_cache import DownloadCache
+
+        workdir = tempfile.mkdtemp(prefix="download_cache_")
+        server, base_url, requests = start_media_server(os.path.join(workdir, "media"), count=2)
+        original_cache = yt_dlp_util.download_cache
+        try:
+            cache = DownloadCache(cache_dir=os.path.join(workdir, "cache"), max_entries=1)
+            yt_dlp_util.download_cache = cache
+
+            # 第一次下载：解析 + 下载
+            url = f"{base_url}/clip0.mp4"
+            path_a = await yt_dlp_util.download(url, os.path.join(workdir, "user_a"))
+            assert requests["/clip0.mp4"] == 2
+
+            # 其他用户重复下载：只解析，硬链接缓存文件
+            path_b = await yt_dlp_util.download(url, os.path.join(workdir, "user_b"))
+            assert requests["/clip0.mp4"] == 3
+            assert os.path.samefile(path_a, path_b) and path_a != path_b
+
+            # 并发请求同一视频：两次解析，只下载一次（后到的请求合并到进行中的下载，或直接命中缓存）
+            progress: List[int] = []
+            url = f"{base_url}/clip1.mp4"
+            path_c, path_d = await asyncio.gather(
+                yt_dlp_util.download(url, os.path.join(workdir, "user_c"),
+                                     on_progress=lambda downloaded, total: progress.append(downloaded)),
+                yt_dlp_util.download(url, os.path.join(workdir, "user_d"),
+                                     on_progress=lambda downloaded, total: progress.append(downloaded)),
+            )
+            assert requests["/clip1.mp4"] == 3
+            assert os.path.samefile(path_c, path_d)
+            assert progress and progress[-1] == 2 * 1024 * 1024
+
+            # 条目上限为 1：clip0 被淘汰，已链接到用户目录的文件不受影响
+            assert len(cache) == 1
+            assert os.path.isfile(path_a) and os.path.isfile(path_b)
+
+            self.log_test_result(
+                "下载去重缓存", True,
+                f"请求次数={dict(requests)}, 命中={cache.hits}, 未命中={cache.misses}"
+            )
+        except Exception as e:
+            self.log_test_result("下载去重缓存", False, str(e))
+        finally:
+            yt_dlp_util.download_cache = original_cache
+            server.shutdown()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    async def test_download_dedup_cancel(self):
+        """测试10.1: 合并下载中取消部分等待者（本地媒体服务器）"""
+        print("\n测试10.1: 合并下载中取消部分等待者（本地媒体服务器）")
+        import shutil
+        import tempfile
+        from app.enums.common.download_status import DownloadStatusEnum
+        from app.services.downloader.download_manager import DownloadManager
+        from app.util import yt_dlp_util
+        from app.util.download_cache import DownloadCache
+
+        size = 4 * 1024 * 1024
+        workdir = tempfile.mkdtemp(prefix="download_cancel_")
+        server, base_url, requests = start_media_server(os.path.join(workdir, "media"), size=size, count=3)
+        original_cache = yt_dlp_util.download_cache
+        # 限速使下载持续约 1 秒，保证两个请求合并到同一次下载
+        slow_opts = {"ratelimit": 4 * 1024 * 1024}
+
+        async def wait_until(predicate, timeout: float = 10):
+            deadline = asyncio.get_running_loop().time() + timeout
+            while not predicate():
+                assert asyncio.get_running_loop().time() < deadline, "等待超时"
+                await asyncio.sleep(0.01)
+
+        try:
+            cache = DownloadCache(cache_dir=os.path.join(workdir, "cache"))
+            yt_dlp_util.download_cache = cache
+
+            # 1. 下载队列中两个任务合并下载，取消其中一个，另一个正常完成
+            async def runner(url: str, user_id: int, on_progress):
+                # 队列按站点限流，提交 YouTube 地址，实际下载本地媒体文件
+                return await yt_dlp_util.download(
+                    f"{base_url}/clip0.mp4", os.path.join(workdir, f"user_{user_id}"),
+                    on_progress=on_progress, extra_opts=slow_opts
+                )
+
+            manager = DownloadManager(max_concurrency=2, domain_concurrency=2, runner=runner)
+            job_a = manager.submit("https://www.youtube.com/watch?v=a", 1)
+            job_b = manager.submit("https://www.youtube.com/watch?v=b", 2)
+            # 收到进度说明已加入合并下载，此时取消 B
+            job_b.subscribe(lambda downloaded, total: manager.cancel(job_b.id))
+
+            path_a = await job_a.wait()
+            assert job_b.status == DownloadStatusEnum.CANCELLED
+            assert job_a.status == DownloadStatusEnum.SUCCESS
+            assert os.path.getsize(path_a) == size
+            assert requests["/clip0.mp4"] == 3
+            await wait_until(lambda: manager.stats()["running"] == 0)
+
+            # 2. 取消先发起下载的请求，合并进来的请求不受影响
+            progress = {"c": 0, "d": 0}
+
+            def track(name: str):
+                def on_progress(downloaded: int, total: int):
+                    progress[name] = downloaded
+                return on_progress
+
+            url = f"{base_url}/clip1.mp4"
+            task_c = asyncio.create_task(yt_dlp_util.download(
+                url, os.path.join(workdir, "user_c"), on_progress=track("c"), extra_opts=slow_opts
+            ))
+            await wait_until(lambda: progress["c"] > 0)
+            task_d = asyncio.create_task(yt_dlp_util.download(
+                url, os.path.join(workdir, "user_d"), on_progress=track("d"), extra_opts=slow_opts
+            ))
+            await wait_until(lambda: progress["d"] > 0)
+            task_c.cancel()
+            path_d = await task_d
+            assert task_c.cancelled()
+            assert os.path.getsize(path_d) == size
+            assert requests["/clip1.mp4"] == 3
+
+            # 3. 所有等待者都取消后中止下载，不写入缓存
+            entries = len(cache)
+            url = f"{base_url}/clip2.mp4"
+            progress = {"e": 0, "f": 0}
+            tasks = [
+                asyncio.create_task(yt_dlp_util.download(
+                    url, os.path.join(workdir, f"user_{name}"), on_progress=track(name), extra_opts=slow_opts
+                ))
+                for name in progress
+            ]
+            await wait_until(lambda: all(progress.values()))
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            assert not yt_dlp_util._inflight
+            await asyncio.sleep(0.5)
+            assert len(cache) == entries
+
+            self.log_test_result(
+                "合并下载中取消部分等待者", True,
+                f"请求次数={dict(requests)}, 缓存条目={len(cache)}"
+            )
+        except Exception as e:
+            self.log_test_result("合并下载中取消部分等待者", False, str(e))
+        finally:
+            yt_dlp_util.download_cache = original_cache
+            server.shutdown()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    async def test_extract_metadata(self):
+        """测试11: 只解析元数据（平铺列表、批量、缓存）"""
+        print("\n测试11: 只解析元数据（平铺列表、批量、缓存）")
+        import shutil
+        import tempfile
+        from app.util import yt_dlp_util
+
+        workdir = tempfile.mkdtemp(prefix="metadata_")
+        server, base_url, requests = start_media_server(workdir, count=2)
+        try:
+            # 含两个视频的页面，作为播放列表平铺解析：只请求列表页，不请求视频文件
+            with open(os.path.join(workdir, "list.html"), "w") as f:
+                f.write('<html><head><title>list</title></head><body>'
+                        '<video src="clip0.mp4"></video><video src="clip1.mp4"></video></body></html>')
+
+            playlist = await yt_dlp_util.extract_metadata(f"{base_url}/list.html")
+            assert playlist["_type"] == "playlist"
+            assert [entry["url"] for entry in playlist["entries"]] == [f"{base_url}/clip0.mp4", f"{base_url}/clip1.mp4"]
+            assert requests["/list.html"] == 1 and requests["/clip0.mp4"] == 0
+
+            # 批量解析：重复 URL 只解析一次，失败位置为 None
+            urls = [f"{base_url}/clip0.mp4", f"{base_url}/missing.mp4", f"{base_url}/clip0.mp4"]
+            results = await yt_dlp_util.extract_batch(urls)
+            assert results[0]["id"] == "clip0" and results[1] is None and results[2] is results[0]
+            assert requests["/clip0.mp4"] == 1
+
+            # 缓存命中不再请求
+            await yt_dlp_util.extract_metadata(f"{base_url}/list.html")
+            await yt_dlp_util.extract_metadata(f"{base_url}/clip0.mp4")
+            assert requests["/list.html"] == 1 and requests["/clip0.mp4"] == 1
+
+            # 使用 cookies 的解析结果单独缓存，不复用未登录的结果
+            cookies_file = os.path.join(workdir, "cookies.txt")
+            with open(cookies_file, "w") as f:
+                f.write("# Netscape HTTP Cookie File\n")
+            await yt_dlp_util.extract_metadata(f"{base_url}/list.html", cookies_file=cookies_file)
+            await yt_dlp_util.extract_metadata(f"{base_url}/list.html", cookies_file=cookies_file)
+            assert requests["/list.html"] == 2
+
+            self.log_test_result("只解析元数据", True, f"请求次数={dict(requests)}")
+        except Exception as e:
+            self.log_test_result("只解析元数据", False, str(e))
+        finally:
+            yt_dlp_util.clear_metadata_cache()
+            server.shutdown()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    async def test_youtube_dl_pool_benchmark(self):
+        """测试12: YoutubeDL 实例复用批量下载耗时对比（本地媒体服务器）"""
+        print("\n测试12: YoutubeDL 实例复用批量下载耗时对比（本地媒体服务器）")
+        import shutil
+        import tempfile
+        import time
+        from app.util import yt_dlp_util
+        from app.util.yt_dlp_pool import YoutubeDLPool
+
+        workdir = tempfile.mkdtemp(prefix="ydl_pool_")
+        clip_count = 20
+        server, base_url, requests = start_media_server(
+            os.path.join(workdir, "media"), size=64 * 1024, count=clip_count
+        )
+        with open(os.path.join(workdir, "media", "large.mp4"), "wb") as f:
+            f.write(os.urandom(256 * 1024))
+        original_pool = yt_dlp_util.youtube_dl_pool
+        try:
+            elapsed = {}
+            created = {}
+            for label, max_idle in (("每次新建", 0), ("实例复用", 4)):
+                pool = YoutubeDLPool(max_idle=max_idle)
+                yt_dlp_util.youtube_dl_pool = pool
+                output_dir = os.path.join(workdir, f"out_{max_idle}")
+                start = time.perf_counter()
+                for i in range(clip_count):
+                    await yt_dlp_util.download(f"{base_url}/clip{i}.mp4", output_dir, use_cache=False)
+                elapsed[label] = time.perf_counter() - start
+                created[label] = pool.created
+
+            assert created["每次新建"] == clip_count and created["实例复用"] == 1
+
+            # 并发任务借出不同实例，进度只回调给各自的任务
+            progress = {"small": [], "large": []}
+            await asyncio.gather(
+                yt_dlp_util.download(f"{base_url}/clip0.mp4", os.path.join(workdir, "concurrent"), use_cache=False,
+                                     on_progress=lambda d, t: progress["small"].append(t)),
+                yt_dlp_util.download(f"{base_url}/large.mp4", os.path.join(workdir, "concurrent"), use_cache=False,
+                                     on_progress=lambda d, t: progress["large"].append(t)),
+            )
+            assert set(progress["small"]) == {64 * 1024}
+            assert set(progress["large"]) == {256 * 1024}
+
+            summary = ", ".join(
+                f"{label} {seconds * 1000 / clip_count:.0f}ms/个（创建实例 {created[label]} 次）"
+                for label, seconds in elapsed.items()
+            )
+            self.log_test_result("YoutubeDL 实例复用", True, summary)
+        except Exception as e:
+            self.log_test_result("YoutubeDL 实例复用", False, str(e))
+        finally:
+            yt_dlp_util.youtube_dl_pool.close_all()
+            yt_dlp_util.youtube_dl_pool = original_pool
+            server.shutdown()
+            shutil.rmtree(workdir, ignore_errors=True)
+
     async def run_all_tests(self):
         print("=" * 80)
         print("开始下载模块测试")
@@ -150,6 +508,11 @@ class DownloaderTester:
             await self.test_downloader_service_unsupported_url()
             await self.test_yt_dlp_util_import()
             await self.test_progress_callback()
+            await self.test_download_manager_queue()
+            await self.test_download_dedup_cache()
+            await self.test_download_dedup_cancel()
+            await self.test_extract_metadata()
+            await self.test_youtube_dl_pool_benchmark()
 
             total = len(self.test_results)
             passed = sum(1 for r in self.test_results if r["success"])
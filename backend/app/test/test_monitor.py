@@ -1,7 +1,10 @@
 # 监控模块测试文件
 import asyncio
+import logging
 import os
 import sys
+import time
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any
 
@@ -11,22 +14,51 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 from app.db.config import init_db, close_db
 from app.models.monitor.monitor_config import MonitorConfig
 from app.models.monitor.monitor_daily_stats import MonitorDailyStats
-from app.models.monitor_task import MonitorTask
+from app.models.monitor.monitor_stats_rollup import MonitorMonthlyStats, MonitorWeeklyStats
+from app.models.monitor.task import Task
 from app.schemas.monitor.monitor import (
     MonitorConfigCreateRequest,
     MonitorConfigUpdateRequest,
     MonitorConfigToggleRequest,
     MonitorConfigQueryRequest,
-    MonitorDailyStatsQueryRequest,
-    MonitorTaskQueryRequest
+    MonitorDailyStatsQueryRequest
 )
-from app.services.monitor.monitor_service import MonitorService
-from app.services.monitor_task_service import MonitorTaskService
+from app.schemas.monitor.task import MonitorTaskQueryRequest
+from app.services.monitor.monitor_service import monitor_service
+from app.services.monitor.task_service import task_service
 from app.enums.common.channel import ChannelEnum
 from app.enums.monitor.task_type import TaskTypeEnum
 from app.enums.monitor.task_status import TaskStatusEnum
 
 
+@contextmanager
+def capture_sql():
+    """收集期间执行的 SQL 语句（Tortoise 在 DEBUG 级别记录每次执行）"""
+    statements: List[str] = []
+
+    class Collector(logging.Handler):
+        def emit(self, record: logging.LogRecord):
+            statements.append(str(record.args[0]) if record.args else record.getMessage())
+
+    logger = logging.getLogger("tortoise.db_client")
+    handler, level = Collector(logging.DEBUG), logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    try:
+        yield statements
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+
+def count_inserts(statements: List[str], table: str) -> int:
+    """统计写入指定表的 INSERT 语句条数"""
+    return sum(
+        1 for sql in statements
+        if sql.lstrip().upper().startswith("INSERT") and table in sql.split("(", 1)[0]
+    )
+
+
 class MonitorTester:
     """监控模块测试类"""
 
@@ -49,7 +81,9 @@ class MonitorTester:
         # 清理所有测试数据
         await MonitorConfig.all().delete()
         await MonitorDailyStats.all().delete()
-        await MonitorTask.all().delete()
+        await MonitorWeeklyStats.all().delete()
+        await MonitorMonthlyStats.all().delete()
+        await Task.all().delete()
         await close_db()
         print("测试数据库清理完成")
 
@@ -80,7 +114,7 @@ class MonitorTester:
                 target_url="https://www.douyin.com/user/test123"
             )
 
-            result = await MonitorService.create_monitor_config(self.test_user_id, request)
+            result = await monitor_service.create_monitor_config(self.test_user_id, request)
 
             # 验证结果
             assert result.user_id == self.test_user_id, "用户ID不匹配"
@@ -117,7 +151,7 @@ class MonitorTester:
                     channel_code=channel_code,
                     target_url=url
                 )
-                result = await MonitorService.create_monitor_config(self.test_user_id, request)
+                result = await monitor_service.create_monitor_config(self.test_user_id, request)
                 self.created_config_ids.append(result.id)
                 created_count += 1
 
@@ -138,7 +172,7 @@ class MonitorTester:
         try:
             # 测试基础分页查询
             params = MonitorConfigQueryRequest(page=1, size=10)
-            queryset = MonitorService.get_monitor_config_queryset(self.test_user_id, params)
+            queryset = monitor_service.get_monitor_config_queryset(self.test_user_id, params)
             results = await queryset
 
             assert len(results) > 0, "应该有配置记录"
@@ -149,7 +183,7 @@ class MonitorTester:
                 size=10,
                 channel_code=ChannelEnum.DOUYIN.code
             )
-            queryset_channel = MonitorService.get_monitor_config_queryset(self.test_user_id, params_channel)
+            queryset_channel = monitor_service.get_monitor_config_queryset(self.test_user_id, params_channel)
             results_channel = await queryset_channel
 
             for config in results_channel:
@@ -161,7 +195,7 @@ class MonitorTester:
                 size=10,
                 is_active=1
             )
-            queryset_active = MonitorService.get_monitor_config_queryset(self.test_user_id, params_active)
+            queryset_active = monitor_service.get_monitor_config_queryset(self.test_user_id, params_active)
             results_active = await queryset_active
 
             for config in results_active:
@@ -188,12 +222,8 @@ class MonitorTester:
             config_id = self.created_config_ids[0]
             new_url = "https://www.douyin.com/user/updated123"
 
-            request = MonitorConfigUpdateRequest(target_url=new_url)
-            result = await MonitorService.update_monitor_config(
-                self.test_user_id,
-                config_id,
-                request
-            )
+            request = MonitorConfigUpdateRequest(id=config_id, target_url=new_url)
+            result = await monitor_service.update_monitor_config(self.test_user_id, request)
 
             # 验证更新结果
             assert result.id == config_id, "配置ID不匹配"
@@ -224,22 +254,14 @@ class MonitorTester:
             config_id = self.created_config_ids[0]
 
             # 禁用监控
-            disable_request = MonitorConfigToggleRequest(is_active=0)
-            result = await MonitorService.toggle_monitor_config(
-                self.test_user_id,
-                config_id,
-                disable_request
-            )
+            disable_request = MonitorConfigToggleRequest(id=config_id, is_active=0)
+            result = await monitor_service.toggle_monitor_config(self.test_user_id, disable_request)
 
             assert result.is_active == 0, "禁用失败"
 
             # 启用监控
-            enable_request = MonitorConfigToggleRequest(is_active=1)
-            result = await MonitorService.toggle_monitor_config(
-                self.test_user_id,
-                config_id,
-                enable_request
-            )
+            enable_request = MonitorConfigToggleRequest(id=config_id, is_active=1)
+            result = await monitor_service.toggle_monitor_config(self.test_user_id, enable_request)
 
             assert result.is_active == 1, "启用失败"
 
@@ -264,7 +286,7 @@ class MonitorTester:
             config_id = self.created_config_ids[-1]
 
             # 执行软删除
-            result = await MonitorService.delete_monitor_config(
+            result = await monitor_service.delete_monitor_config(
                 self.test_user_id,
                 config_id
             )
@@ -277,7 +299,7 @@ class MonitorTester:
 
             # 验证查询时不包含已删除的配置
             params = MonitorConfigQueryRequest(page=1, size=100)
-            queryset = MonitorService.get_monitor_config_queryset(self.test_user_id, params)
+            queryset = monitor_service.get_monitor_config_queryset(self.test_user_id, params)
             results = await queryset
 
             for config in results:
@@ -327,7 +349,7 @@ class MonitorTester:
                 end_date=today
             )
 
-            results = await MonitorService.get_daily_stats(self.test_user_id, request)
+            results = await monitor_service.get_daily_stats(self.test_user_id, request)
 
             # 验证查询结果
             assert len(results) == 7, f"期望7条记录，实际{len(results)}条"
@@ -373,7 +395,7 @@ class MonitorTester:
 
             created_count = 0
             for task_data in tasks_data:
-                await MonitorTask.create(
+                await Task.create(
                     channel_code=task_data["channel_code"],
                     task_type=task_data["task_type"],
                     biz_id=config_id,
@@ -387,7 +409,7 @@ class MonitorTester:
 
             # 测试基础查询
             params = MonitorTaskQueryRequest(page=1, size=10)
-            queryset = MonitorTaskService.get_monitor_task_queryset(params)
+            queryset = task_service.get_monitor_task_queryset(params)
             results = await queryset
 
             assert len(results) >= created_count, f"期望至少{created_count}条记录"
@@ -398,7 +420,7 @@ class MonitorTester:
                 size=10,
                 channel_code=ChannelEnum.DOUYIN.code
             )
-            queryset_channel = MonitorTaskService.get_monitor_task_queryset(params_channel)
+            queryset_channel = task_service.get_monitor_task_queryset(params_channel)
             results_channel = await queryset_channel
 
             for task in results_channel:
@@ -410,7 +432,7 @@ class MonitorTester:
                 size=10,
                 task_type=TaskTypeEnum.DAILY_COLLECTION.code
             )
-            queryset_type = MonitorTaskService.get_monitor_task_queryset(params_type)
+            queryset_type = task_service.get_monitor_task_queryset(params_type)
             results_type = await queryset_type
 
             for task in results_type:
@@ -422,7 +444,7 @@ class MonitorTester:
                 size=10,
                 task_status=TaskStatusEnum.SUCCESS.code
             )
-            queryset_status = MonitorTaskService.get_monitor_task_queryset(params_status)
+            queryset_status = task_service.get_monitor_task_queryset(params_status)
             results_status = await queryset_status
 
             for task in results_status:
@@ -454,7 +476,7 @@ class MonitorTester:
                 channel_code=ChannelEnum.YOUTUBE.code,
                 target_url="https://www.youtube.com/@testflow"
             )
-            config = await MonitorService.create_monitor_config(self.test_user_id, create_request)
+            config = await monitor_service.create_monitor_config(self.test_user_id, create_request)
             flow_config_id = config.id
 
             # 2. 查询配置列表
@@ -463,19 +485,16 @@ class MonitorTester:
                 size=10,
                 channel_code=ChannelEnum.YOUTUBE.code
             )
-            queryset = MonitorService.get_monitor_config_queryset(self.test_user_id, query_params)
+            queryset = monitor_service.get_monitor_config_queryset(self.test_user_id, query_params)
             configs = await queryset
             assert any(c.id == flow_config_id for c in configs), "新建配置未出现在列表中"
 
             # 3. 修改配置
             update_request = MonitorConfigUpdateRequest(
+                id=flow_config_id,
                 target_url="https://www.youtube.com/@testflow_updated"
             )
-            updated_config = await MonitorService.update_monitor_config(
-                self.test_user_id,
-                flow_config_id,
-                update_request
-            )
+            updated_config = await monitor_service.update_monitor_config(self.test_user_id, update_request)
             assert updated_config.target_url == update_request.target_url, "配置未更新"
 
             # 4. 创建每日数据
@@ -496,11 +515,11 @@ class MonitorTester:
                 start_date=today - timedelta(days=2),
                 end_date=today
             )
-            stats = await MonitorService.get_daily_stats(self.test_user_id, stats_request)
+            stats = await monitor_service.get_daily_stats(self.test_user_id, stats_request)
             assert len(stats) == 3, "每日数据查询失败"
 
             # 6. 创建任务记录
-            await MonitorTask.create(
+            await Task.create(
                 channel_code=ChannelEnum.YOUTUBE.code,
                 task_type=TaskTypeEnum.DAILY_COLLECTION.code,
                 biz_id=flow_config_id,
@@ -510,16 +529,12 @@ class MonitorTester:
             )
 
             # 7. 禁用配置
-            toggle_request = MonitorConfigToggleRequest(is_active=0)
-            toggled_config = await MonitorService.toggle_monitor_config(
-                self.test_user_id,
-                flow_config_id,
-                toggle_request
-            )
+            toggle_request = MonitorConfigToggleRequest(id=flow_config_id, is_active=0)
+            toggled_config = await monitor_service.toggle_monitor_config(self.test_user_id, toggle_request)
             assert toggled_config.is_active == 0, "禁用失败"
 
             # 8. 删除配置
-            delete_result = await MonitorService.delete_monitor_config(
+            delete_result = await monitor_service.delete_monitor_config(
                 self.test_user_id,
                 flow_config_id
             )
@@ -551,15 +566,15 @@ class MonitorTester:
 
         # 测试1: 修改不存在的配置
         try:
-            request = MonitorConfigUpdateRequest(target_url="https://test.com")
-            await MonitorService.update_monitor_config(self.test_user_id, 999999, request)
+            request = MonitorConfigUpdateRequest(id=999999, target_url="https://test.com")
+            await monitor_service.update_monitor_config(self.test_user_id, request)
             exception_tests.append({"test": "修改不存在的配置", "success": False, "reason": "应该抛出异常"})
         except Exception:
             exception_tests.append({"test": "修改不存在的配置", "success": True})
 
         # 测试2: 删除不存在的配置
         try:
-            await MonitorService.delete_monitor_config(self.test_user_id, 999999)
+            await monitor_service.delete_monitor_config(self.test_user_id, 999999)
             exception_tests.append({"test": "删除不存在的配置", "success": False, "reason": "应该抛出异常"})
         except Exception:
             exception_tests.append({"test": "删除不存在的配置", "success": True})
@@ -571,7 +586,7 @@ class MonitorTester:
                 start_date=date.today() - timedelta(days=7),
                 end_date=date.today()
             )
-            await MonitorService.get_daily_stats(self.test_user_id, request)
+            await monitor_service.get_daily_stats(self.test_user_id, request)
             exception_tests.append({"test": "查询不存在配置的数据", "success": False, "reason": "应该抛出异常"})
         except Exception:
             exception_tests.append({"test": "查询不存在配置的数据", "success": True})
@@ -590,8 +605,8 @@ class MonitorTester:
         # 测试5: 操作其他用户的配置
         try:
             if self.created_config_ids:
-                request = MonitorConfigUpdateRequest(target_url="https://hack.com")
-                await MonitorService.update_monitor_config(999, self.created_config_ids[0], request)
+                request = MonitorConfigUpdateRequest(id=self.created_config_ids[0], target_url="https://hack.com")
+                await monitor_service.update_monitor_config(999, request)
                 exception_tests.append({"test": "操作其他用户配置", "success": False, "reason": "应该抛出异常"})
             else:
                 exception_tests.append({"test": "操作其他用户配置", "success": True, "reason": "无配置可测试"})
@@ -627,13 +642,13 @@ class MonitorTester:
             # 统计任务状态分布
             task_status_stats = {}
             for status in TaskStatusEnum:
-                count = await MonitorTask.filter(task_status=status.code).count()
+                count = await Task.filter(task_status=status.code).count()
                 task_status_stats[status.desc] = count
 
             # 统计任务类型分布
             task_type_stats = {}
             for task_type in TaskTypeEnum:
-                count = await MonitorTask.filter(task_type=task_type.code).count()
+                count = await Task.filter(task_type=task_type.code).count()
                 task_type_stats[task_type.desc] = count
 
             # 统计每日数据记录数
@@ -662,6 +677,798 @@ class MonitorTester:
         except Exception as e:
             self.log_test_result("数据统计功能", False, str(e))
 
+    async def test_bulk_upsert_daily_stats(self):
+        """测试批量写入每日数据"""
+        print("\n测试12: 批量写入每日数据")
+
+        try:
+            from app.repositories.monitor.monitor_daily_stats_repository import monitor_daily_stats_repository
+
+            if len(self.created_config_ids) < 2:
+                raise Exception("没有足够的配置ID")
+
+            config_ids = self.created_config_ids[:2]
+            start = date.today() - timedelta(days=30)
+
+            # 已存在一条带渠道数据的记录
+            await monitor_daily_stats_repository.upsert_daily_stats(
+                config_ids[0], start, follower_count=1, extra_data={"coin": 5}
+            )
+
+            records = [
+                {
+                    "config_id": config_id,
+                    "stat_date": start + timedelta(days=i),
+                    "follower_count": 1000 + i,
+                    "view_count": 50000 + i,
+                }
+                for config_id in config_ids
+                for i in range(10)
+            ]
+            result = await monitor_daily_stats_repository.bulk_upsert_daily_stats(records, batch_size=7)
+            assert result == {"inserted": 19, "updated": 1}, f"首次写入结果不符: {result}"
+
+            # extra_data 为空时保留原有渠道数据
+            existing = await MonitorDailyStats.get(config_id=config_ids[0], stat_date=start)
+            assert existing.follower_count == 1000 and existing.extra_data == {"coin": 5}
+
+            # 重复写入全部为更新，记录数不变
+            for record in records:
+                record["follower_count"] += 1
+            result = await monitor_daily_stats_repository.bulk_upsert_daily_stats(records)
+            assert result == {"inserted": 0, "updated": 20}, f"重复写入结果不符: {result}"
+
+            count = await MonitorDailyStats.filter(
+                config_id__in=config_ids, stat_date__gte=start, stat_date__lt=start + timedelta(days=10)
+            ).count()
+            assert count == 20, f"期望20条记录，实际{count}条"
+
+            self.log_test_result(
+                "批量写入每日数据",
+                True,
+                "批量新增/更新数量正确，重复写入不产生新记录",
+                {"records": len(records)}
+            )
+
+        except Exception as e:
+            self.log_test_result("批量写入每日数据", False, str(e))
+
+    async def test_bulk_upsert_statements(self):
+        """测试批量写入每块只执行一条多行语句"""
+        print("\n测试12.1: 批量写入每块只执行一条多行语句")
+
+        try:
+            from app.repositories.monitor.monitor_daily_stats_repository import (
+                STATS_METRIC_FIELDS, monitor_daily_stats_repository
+            )
+
+            if not self.created_config_ids:
+                raise Exception("没有可用的配置ID")
+
+            config_id = self.created_config_ids[0]
+            start = date.today() - timedelta(days=60)
+            records = [
+                {"config_id": config_id, "stat_date": start + timedelta(days=i), "follower_count": i}
+                for i in range(15)
+            ]
+
+            with capture_sql() as statements:
+                result = await monitor_daily_stats_repository.bulk_upsert_daily_stats(records, batch_size=5)
+            assert result == {"inserted": 15, "updated": 0}, f"写入结果不符: {result}"
+            inserts = count_inserts(statements, "monitor_daily_stats")
+            assert inserts == 3, f"期望每块一条 INSERT 共3条，实际{inserts}条"
+
+            # MySQL 语句：一条多行 INSERT，不使用行别名
+            instances = [
+                MonitorDailyStats(config_id=config_id, stat_date=record["stat_date"], follower_count=i)
+                for i, record in enumerate(records[:5])
+            ]
+            sql, values = monitor_daily_stats_repository.build_mysql_upsert(
+                instances, STATS_METRIC_FIELDS + ["updated_at"]
+            )
+            columns = len(values) // len(instances)
+            assert sql.count("INSERT") == 1 and " AS " not in sql
+            assert sql.count("(" + ", ".join(["%s"] * columns) + ")") == 5
+            assert sql.count("%s") == len(values)
+            assert "ON DUPLICATE KEY UPDATE `follower_count` = VALUES(`follower_count`)" in sql
+
+            self.log_test_result(
+                "批量写入语句数量",
+                True,
+                "每块一条多行 INSERT，MySQL 语句不依赖行别名",
+                {"inserts": inserts, "mysql_params": len(values)}
+            )
+
+        except Exception as e:
+            self.log_test_result("批量写入语句数量", False, str(e))
+
+    async def test_collect_engine(self):
+        """测试监控数据采集引擎"""
+        print("\n测试13: 监控数据采集引擎")
+
+        try:
+            from app.services.monitor.collector import BaseStatsFetcher, CollectedStats, MonitorCollectEngine
+
+            # 每个渠道创建若干账号，其中视频号没有采集器
+            channel_config_ids: Dict[int, List[int]] = {}
+            for channel in ChannelEnum:
+                for i in range(6):
+                    config = await MonitorConfig.create(
+                        user_id=self.test_user_id,
+                        channel_code=channel.code,
+                        target_url=f"https://example.com/{channel.code}/{i}",
+                        is_active=1
+                    )
+                    channel_config_ids.setdefault(channel.code, []).append(config.id)
+            failing_id = channel_config_ids[ChannelEnum.YOUTUBE.code][0]
+
+            running: Dict[int, int] = {}
+            peak: Dict[int, int] = {}
+
+            class StubFetcher(BaseStatsFetcher):
+                """本地桩采集器：记录各渠道并发数，指定账号采集失败"""
+
+                async def fetch(self, config):
+                    channel_code = config.channel_code
+                    running[channel_code] = running.get(channel_code, 0) + 1
+                    peak[channel_code] = max(peak.get(channel_code, 0), running[channel_code])
+                    try:
+                        await asyncio.sleep(0.01)
+                        if config.id == failing_id:
+                            raise RuntimeError("模拟采集失败")
+                        return CollectedStats(follower_count=config.id, view_count=config.id * 10)
+                    finally:
+                        running[channel_code] -= 1
+
+            stub = StubFetcher()
+            engine = MonitorCollectEngine(
+                fetchers={
+                    ChannelEnum.DOUYIN.code: stub,
+                    ChannelEnum.YOUTUBE.code: stub,
+                    ChannelEnum.BILIBILI.code: stub,
+                },
+                concurrency=4,
+                channel_concurrency=2,
+                chunk_size=5
+            )
+            stat_date = date.today() - timedelta(days=60)
+            summary = await engine.run(user_id=self.test_user_id, stat_date=stat_date)
+
+            assert summary.failed == 1, f"期望1个失败，实际{summary.failed}"
+            assert summary.skipped >= 6, f"视频号账号应被跳过，实际跳过{summary.skipped}"
+            assert all(value <= 2 for value in peak.values()), f"单渠道并发超限: {peak}"
+
+            success_config = await MonitorConfig.get(id=channel_config_ids[ChannelEnum.DOUYIN.code][0])
+            failed_config = await MonitorConfig.get(id=failing_id)
+            skipped_config = await MonitorConfig.get(id=channel_config_ids[ChannelEnum.WECHAT_VIDEO.code][0])
+            assert success_config.last_run_status == TaskStatusEnum.SUCCESS.code
+            assert failed_config.last_run_status == TaskStatusEnum.FAILED.code
+            assert skipped_config.last_run_status is None
+
+            stats = await MonitorDailyStats.get(config_id=success_config.id, stat_date=stat_date)
+            assert stats.follower_count == success_config.id
+
+            self.log_test_result(
+                "监控数据采集引擎",
+                True,
+                "按渠道限流采集，结果批量写入",
+                {"summary": summary.__dict__, "channel_peak": peak}
+            )
+
+        except Exception as e:
+            self.log_test_result("监控数据采集引擎", False, str(e))
+
+    async def test_collect_engine_isolation(self):
+        """测试慢渠道不阻塞其他渠道，采集协程异常时不挂起"""
+        print("\n测试13.1: 采集引擎渠道隔离")
+
+        try:
+            from app.services.monitor.collector import BaseStatsFetcher, CollectedStats, MonitorCollectEngine
+
+            # 独立用户：先 12 个慢渠道账号，再 4 个快渠道账号（按 ID 顺序读取）
+            user_id = self.test_user_id + 100
+            for channel_code, count in ((ChannelEnum.DOUYIN.code, 12), (ChannelEnum.BILIBILI.code, 4)):
+                for i in range(count):
+                    await MonitorConfig.create(
+                        user_id=user_id,
+                        channel_code=channel_code,
+                        target_url=f"https://example.com/isolation/{channel_code}/{i}",
+                        is_active=1
+                    )
+
+            started = time.monotonic()
+            first_fetch: Dict[int, float] = {}
+
+            class DelayFetcher(BaseStatsFetcher):
+                """本地桩采集器：按渠道模拟不同耗时"""
+
+                def __init__(self, delay: float):
+                    self.delay = delay
+
+                async def fetch(self, config):
+                    first_fetch.setdefault(config.channel_code, time.monotonic() - started)
+                    await asyncio.sleep(self.delay)
+                    return CollectedStats(follower_count=config.id)
+
+            engine = MonitorCollectEngine(
+                fetchers={ChannelEnum.DOUYIN.code: DelayFetcher(0.1), ChannelEnum.BILIBILI.code: DelayFetcher(0)},
+                concurrency=2,
+                channel_concurrency=1,
+                chunk_size=4
+            )
+            summary = await engine.run(user_id=user_id, stat_date=date.today() - timedelta(days=120))
+            fast_first = first_fetch[ChannelEnum.BILIBILI.code]
+            assert summary.success == 16, f"期望16个成功，实际{summary.success}"
+            assert fast_first < 0.5, f"快渠道被慢渠道阻塞，首次采集在 {fast_first:.2f}s"
+
+            class WorkerCrash(BaseException):
+                """模拟采集协程异常退出（不被单账号失败处理捕获）"""
+
+            class CrashFetcher(BaseStatsFetcher):
+                async def fetch(self, config):
+                    raise WorkerCrash()
+
+            crash_engine = MonitorCollectEngine(
+                fetchers={ChannelEnum.DOUYIN.code: CrashFetcher(), ChannelEnum.BILIBILI.code: DelayFetcher(0)},
+                concurrency=2,
+                channel_concurrency=1,
+                chunk_size=4
+            )
+            try:
+                await asyncio.wait_for(crash_engine.run(user_id=user_id), timeout=5)
+                raise Exception("采集协程异常退出时应该抛出异常")
+            except WorkerCrash:
+                pass
+
+            self.log_test_result(
+                "采集引擎渠道隔离",
+                True,
+                f"快渠道首次采集在 {fast_first * 1000:.0f}ms，协程异常时立即失败",
+                {"first_fetch": first_fetch}
+            )
+
+        except asyncio.TimeoutError:
+            self.log_test_result("采集引擎渠道隔离", False, "采集协程异常退出后 run() 挂起")
+        except Exception as e:
+            self.log_test_result("采集引擎渠道隔离", False, str(e))
+
+    async def test_fetcher_partial_metrics(self):
+        """测试采集器不提供的指标为 None，写库时不覆盖原值"""
+        print("\n测试13.2: 采集器缺失指标不覆盖原值")
+
+        try:
+            from app.repositories.monitor.monitor_daily_stats_repository import monitor_daily_stats_repository
+            from app.services.monitor.collector import FetcherRegistry
+            from app.services.monitor.collector.fetchers import YtDlpStatsFetcher
+            from app.util import yt_dlp_util
+
+            if not self.created_config_ids:
+                raise Exception("没有可用的配置ID")
+
+            # 抖音用户主页没有 yt-dlp 解析器，不注册默认采集器
+            registered = FetcherRegistry.snapshot()
+            assert ChannelEnum.DOUYIN.code not in registered
+            assert ChannelEnum.YOUTUBE.code in registered and ChannelEnum.BILIBILI.code in registered
+
+            requested: List[str] = []
+            responses = {
+                "youtube": {"channel_follower_count": 500, "entries": [{"view_count": 10}, {"view_count": 20}]},
+                "bilibili": {"entries": [{"id": "BV1"}, {"id": "BV2"}, {"id": "BV3"}]},
+            }
+
+            async def fake_extract_metadata(url: str, **kwargs):
+                requested.append(url)
+                return responses["youtube" if "youtube" in url else "bilibili"]
+
+            original_extract = yt_dlp_util.extract_metadata
+            yt_dlp_util.extract_metadata = fake_extract_metadata
+            try:
+                fetcher = YtDlpStatsFetcher()
+                youtube = await fetcher.fetch(MonitorConfig(
+                    channel_code=ChannelEnum.YOUTUBE.code, target_url="https://www.youtube.com/@demo"
+                ))
+                bilibili = await fetcher.fetch(MonitorConfig(
+                    channel_code=ChannelEnum.BILIBILI.code, target_url="https://space.bilibili.com/123"
+                ))
+            finally:
+                yt_dlp_util.extract_metadata = original_extract
+
+            # 频道主页解析视频标签页；平铺条目没有点赞数
+            assert requested[0] == "https://www.youtube.com/@demo/videos", requested
+            assert (youtube.follower_count, youtube.liked_count, youtube.view_count, youtube.content_count) == (
+                500, None, 30, 2
+            ), youtube
+            assert (bilibili.follower_count, bilibili.view_count, bilibili.content_count) == (None, None, 3), bilibili
+
+            # 已有记录：None 指标保留原值，新记录按 0 写入
+            config_id = self.created_config_ids[0]
+            stat_date = date.today() - timedelta(days=90)
+            await monitor_daily_stats_repository.upsert_daily_stats(
+                config_id, stat_date, follower_count=1000, liked_count=50, view_count=10, content_count=1
+            )
+            await monitor_daily_stats_repository.bulk_upsert_daily_stats([
+                {"config_id": config_id, "stat_date": stat_date, "follower_count": None,
+                 "liked_count": None, "view_count": 77, "content_count": 3},
+                {"config_id": config_id, "stat_date": stat_date + timedelta(days=1), "follower_count": None,
+                 "liked_count": None, "view_count": 80, "content_count": 3},
+            ])
+            existing = await MonitorDailyStats.get(config_id=config_id, stat_date=stat_date)
+            created = await MonitorDailyStats.get(config_id=config_id, stat_date=stat_date + timedelta(days=1))
+            assert (existing.follower_count, existing.liked_count, existing.view_count) == (1000, 50, 77)
+            assert (created.follower_count, created.liked_count, created.view_count) == (0, 0, 80)
+
+            self.log_test_result(
+                "采集器缺失指标不覆盖原值",
+                True,
+                "缺失指标为 None，已有记录保留原值",
+                {"youtube": youtube.__dict__, "bilibili": bilibili.__dict__}
+            )
+
+        except Exception as e:
+            self.log_test_result("采集器缺失指标不覆盖原值", False, str(e))
+
+    async def test_collect_engine_schedule(self):
+        """测试每小时数据统计跳过最近已采集的配置，重叠的采集排队执行"""
+        print("\n测试13.3: 采集跳过最近已采集的配置并串行执行")
+
+        try:
+            from app.services.monitor.collector import BaseStatsFetcher, CollectedStats, MonitorCollectEngine
+            from app.util.time_util import get_utc_now
+
+            user_a, user_b = self.test_user_id + 400, self.test_user_id + 401
+            now = get_utc_now()
+            configs: Dict[str, MonitorConfig] = {}
+            for name, user_id, last_run_at in (
+                ("recent", user_a, now - timedelta(minutes=5)),
+                ("stale", user_a, now - timedelta(hours=2)),
+                ("never", user_a, None),
+                ("other", user_b, None),
+            ):
+                configs[name] = await MonitorConfig.create(
+                    user_id=user_id,
+                    channel_code=ChannelEnum.YOUTUBE.code,
+                    target_url=f"https://example.com/schedule/{name}",
+                    is_active=1,
+                    last_run_at=last_run_at
+                )
+
+            fetched: List[int] = []
+            spans: Dict[int, List[float]] = {}
+
+            class RecordingFetcher(BaseStatsFetcher):
+                async def fetch(self, config):
+                    fetched.append(config.id)
+                    span = spans.setdefault(config.user_id, [time.monotonic(), 0])
+                    await asyncio.sleep(0.05)
+                    span[1] = time.monotonic()
+                    return CollectedStats(follower_count=1)
+
+            engine = MonitorCollectEngine(fetchers={ChannelEnum.YOUTUBE.code: RecordingFetcher()})
+            stat_date = date.today() - timedelta(days=170)
+
+            # 跳过 30 分钟内已采集的配置
+            summary = await engine.run(user_id=user_a, stat_date=stat_date, skip_recent=1800)
+            assert sorted(fetched) == sorted([configs["stale"].id, configs["never"].id]), fetched
+            assert summary.total == 2
+
+            # 两次采集同时发起时排队执行，不会交叠
+            spans.clear()
+            await asyncio.gather(
+                engine.run(user_id=user_a, stat_date=stat_date),
+                engine.run(user_id=user_b, stat_date=stat_date),
+            )
+            (first_start, first_end), (second_start, second_end) = sorted(spans.values())
+            assert first_end <= second_start, f"采集交叠: {spans}"
+
+            self.log_test_result(
+                "采集跳过最近已采集的配置并串行执行",
+                True,
+                "最近已采集的配置被跳过，重叠的采集排队执行",
+                {"fetched": len(fetched)}
+            )
+
+        except Exception as e:
+            self.log_test_result("采集跳过最近已采集的配置并串行执行", False, str(e))
+
+    async def test_task_recorder(self):
+        """测试任务执行记录批量写入"""
+        print("\n测试14: 任务执行记录批量写入")
+
+        try:
+            from app.models.monitor.task import Task
+            from app.services.monitor.task_recorder import TaskRecorder
+
+            recorder = TaskRecorder(batch_size=200, flush_interval=0.05)
+            schedule_date = date.today() - timedelta(days=90)
+            channel_code = ChannelEnum.DOUYIN.code
+
+            # 长任务：跨过写库间隔，先以进行中状态入库，结束后批量更新
+            long_task = recorder.start(channel_code, TaskTypeEnum.DAILY_COLLECTION.code, 0, schedule_date)
+            await asyncio.sleep(0.1)
+
+            # 大量短任务：开始和结束合并为一次批量插入
+            for biz_id in range(1, 501):
+                task = recorder.start(channel_code, TaskTypeEnum.DAILY_COLLECTION.code, biz_id, schedule_date)
+                error = RuntimeError("模拟失败") if biz_id % 100 == 0 else None
+                await recorder.finish(task, error=error)
+
+            assert long_task.pk is not None, "长任务应已以进行中状态入库"
+            await recorder.finish(long_task)
+
+            # 关闭时写入剩余缓冲
+            await recorder.stop()
+
+            tasks = Task.filter(schedule_date=schedule_date, channel_code=channel_code)
+            total = await tasks.count()
+            failed = await tasks.filter(task_status=TaskStatusEnum.FAILED.code).count()
+            long_row = await tasks.get(biz_id=0)
+            assert total == 501, f"期望501条任务，实际{total}条"
+            assert failed == 5, f"期望5条失败任务，实际{failed}条"
+            assert long_row.task_status == TaskStatusEnum.SUCCESS.code and long_row.duration_ms >= 100
+            assert long_row.finished_at is not None
+
+            failed_row = await tasks.filter(task_status=TaskStatusEnum.FAILED.code).first()
+            assert "模拟失败" in failed_row.error_msg
+
+            self.log_test_result(
+                "任务执行记录批量写入",
+                True,
+                "短任务批量插入，长任务先入库后批量更新",
+                {"total": total, "failed": failed, "long_task_duration_ms": long_row.duration_ms}
+            )
+
+        except Exception as e:
+            self.log_test_result("任务执行记录批量写入", False, str(e))
+
+    async def test_task_recorder_cancellation(self):
+        """测试采集被取消时任务记录正常结束"""
+        print("\n测试14.1: 采集取消时结束任务记录")
+
+        try:
+            from app.services.monitor.collector import BaseStatsFetcher, CollectedStats, MonitorCollectEngine
+            from app.services.monitor.task_recorder import task_recorder
+
+            user_id = self.test_user_id + 200
+            config_ids = []
+            for i in range(3):
+                config = await MonitorConfig.create(
+                    user_id=user_id,
+                    channel_code=ChannelEnum.DOUYIN.code,
+                    target_url=f"https://example.com/cancel/{i}",
+                    is_active=1
+                )
+                config_ids.append(config.id)
+
+            class HangingFetcher(BaseStatsFetcher):
+                async def fetch(self, config):
+                    await asyncio.sleep(60)
+                    return CollectedStats()
+
+            engine = MonitorCollectEngine(
+                fetchers={ChannelEnum.DOUYIN.code: HangingFetcher()}, concurrency=3, channel_concurrency=3
+            )
+            schedule_date = date.today() - timedelta(days=150)
+            run_task = asyncio.create_task(engine.run(user_id=user_id, stat_date=schedule_date))
+            await asyncio.sleep(0.2)
+            run_task.cancel()
+            await asyncio.gather(run_task, return_exceptions=True)
+
+            leaked = [task for task, _ in task_recorder._running.values() if task.biz_id in config_ids]
+            assert not leaked, f"{len(leaked)}个被取消的任务滞留在记录器中"
+
+            await task_recorder.flush()
+            statuses = await Task.filter(biz_id__in=config_ids, schedule_date=schedule_date).values_list("task_status", flat=True)
+            assert sorted(statuses) == [TaskStatusEnum.FAILED.code] * 3, f"被取消的任务应记为失败: {statuses}"
+
+            self.log_test_result("采集取消时结束任务记录", True, "被取消的采集任务记为失败并写入")
+
+        except Exception as e:
+            self.log_test_result("采集取消时结束任务记录", False, str(e))
+
+    async def test_collect_engine_shutdown(self):
+        """测试应用关闭时取消执行中的采集并写完结果"""
+        print("\n测试14.2: 关闭时取消执行中的采集")
+
+        try:
+            from app.services.monitor.collector import BaseStatsFetcher, CollectedStats, MonitorCollectEngine
+            from app.services.monitor.task_recorder import task_recorder
+
+            user_id = self.test_user_id + 300
+            config_ids = []
+            for i in range(3):
+                config = await MonitorConfig.create(
+                    user_id=user_id,
+                    channel_code=ChannelEnum.DOUYIN.code,
+                    target_url=f"https://example.com/shutdown/{i}",
+                    is_active=1
+                )
+                config_ids.append(config.id)
+            fast_id = config_ids[0]
+
+            class PartlyHangingFetcher(BaseStatsFetcher):
+                """第一个账号立即返回，其余挂起直到被取消"""
+
+                async def fetch(self, config):
+                    if config.id != fast_id:
+                        await asyncio.sleep(60)
+                    return CollectedStats(follower_count=42)
+
+            engine = MonitorCollectEngine(
+                fetchers={ChannelEnum.DOUYIN.code: PartlyHangingFetcher()}, concurrency=3, channel_concurrency=3
+            )
+            schedule_date = date.today() - timedelta(days=160)
+            run_task = asyncio.create_task(engine.run(user_id=user_id, stat_date=schedule_date))
+            await asyncio.sleep(0.2)
+
+            await engine.shutdown()
+            assert run_task.done() and not engine._runs
+
+            # shutdown 返回前已写入已采集的结果，被取消的账号不滞留在记录器中
+            stats = await MonitorDailyStats.get_or_none(config_id=fast_id, stat_date=schedule_date)
+            assert stats is not None and stats.follower_count == 42, "已采集的结果未写入"
+            leaked = [task for task, _ in task_recorder._running.values() if task.biz_id in config_ids]
+            assert not leaked, f"{len(leaked)}个被取消的任务滞留在记录器中"
+
+            await task_recorder.flush()
+            statuses = await Task.filter(
+                biz_id__in=config_ids, schedule_date=schedule_date
+            ).order_by("biz_id").values_list("task_status", flat=True)
+            expected = [TaskStatusEnum.SUCCESS.code] + [TaskStatusEnum.FAILED.code] * 2
+            assert list(statuses) == expected, f"任务状态不符: {statuses}"
+
+            self.log_test_result("关闭时取消执行中的采集", True, "已采集结果写入，被取消的任务记为失败")
+
+        except Exception as e:
+            self.log_test_result("关闭时取消执行中的采集", False, str(e))
+
+    async def test_stats_rollup(self):
+        """测试周 / 月汇总数据维护与趋势查询"""
+        print("\n测试15: 周/月汇总数据")
+
+        try:
+            from app.enums.monitor.stats_granularity import StatsGranularityEnum
+            from app.repositories.monitor.monitor_daily_stats_repository import monitor_daily_stats_repository
+            from app.repositories.monitor.monitor_stats_rollup_repository import monitor_weekly_stats_repository
+            from app.schemas.monitor.monitor import MonitorStatsTrendQueryRequest
+
+            if not self.created_config_ids:
+                raise Exception("没有可用的配置ID")
+
+            config_id = self.created_config_ids[0]
+            # 2025-12-22 为周一，共三周数据，粉丝每天 +10
+            start = date(2025, 12, 22)
+            records = [
+                {"config_id": config_id, "stat_date": start + timedelta(days=i), "follower_count": 100 + i * 10}
+                for i in range(21)
+            ]
+            with capture_sql() as statements:
+                await monitor_daily_stats_repository.bulk_upsert_daily_stats(records, batch_size=8)
+
+            week = await MonitorWeeklyStats.get(config_id=config_id, period_start=date(2025, 12, 29))
+            assert (week.follower_count, week.follower_delta, week.days_count) == (230, 70, 7), \
+                f"周汇总不符: {week.follower_count}/{week.follower_delta}/{week.days_count}"
+            month = await MonitorMonthlyStats.get(config_id=config_id, period_start=date(2026, 1, 1))
+            assert (month.follower_count, month.follower_delta, month.last_stat_date) == (300, 110, date(2026, 1, 11)), \
+                f"月汇总不符: {month.follower_count}/{month.follower_delta}/{month.last_stat_date}"
+            first_week = await MonitorWeeklyStats.get(config_id=config_id, period_start=start)
+            assert first_week.follower_delta == 60, "没有基线时增量应相对周期内第一条数据"
+
+            # 每块的汇总各通过一条语句写入
+            inserts = {
+                table: count_inserts(statements, table) for table in ("monitor_weekly_stats", "monitor_monthly_stats")
+            }
+            assert inserts == {"monitor_weekly_stats": 3, "monitor_monthly_stats": 3}, f"汇总写入语句数量不符: {inserts}"
+            sql, values = monitor_weekly_stats_repository.build_mysql_upsert(
+                [MonitorWeeklyStats(config_id=config_id, period_start=start + timedelta(weeks=i)) for i in range(3)],
+                ["follower_count", "updated_at"]
+            )
+            assert sql.count("INSERT") == 1 and sql.count("%s") == len(values), "MySQL 汇总写入应为一条多行语句"
+
+            # 补写上一周最后一天：上一周期末值和下一周的增量都随之变化
+            await monitor_daily_stats_repository.upsert_daily_stats(config_id, date(2025, 12, 28), follower_count=1160)
+            first_week = await MonitorWeeklyStats.get(config_id=config_id, period_start=start)
+            week = await MonitorWeeklyStats.get(config_id=config_id, period_start=date(2025, 12, 29))
+            assert (first_week.follower_delta, week.follower_delta) == (1060, -930), \
+                f"补写后增量不符: {first_week.follower_delta}/{week.follower_delta}"
+
+            granularities = {}
+            for resolution_days, expected_points in ((1, 21), (7, 3), (31, 2)):
+                trend = await monitor_service.get_stats_trend(self.test_user_id, MonitorStatsTrendQueryRequest(
+                    config_id=config_id,
+                    start_date=start,
+                    end_date=date(2026, 1, 11),
+                    resolution_days=resolution_days
+                ))
+                assert len(trend.points) == expected_points, \
+                    f"分辨率{resolution_days}天期望{expected_points}个数据点，实际{len(trend.points)}个"
+                granularities[resolution_days] = trend.granularity
+            assert granularities == {
+                1: StatsGranularityEnum.DAY.code, 7: StatsGranularityEnum.WEEK.code, 31: StatsGranularityEnum.MONTH.code
+            }, f"粒度选择不符: {granularities}"
+
+            self.log_test_result(
+                "周/月汇总数据",
+                True,
+                "汇总随每日数据增量更新，趋势查询按分辨率选择最粗粒度",
+                {"granularities": granularities}
+            )
+
+        except Exception as e:
+            self.log_test_result("周/月汇总数据", False, str(e))
+
+    async def test_stats_rollup_gap_and_rebuild(self):
+        """测试跨空周期的基线更新及历史汇总回填"""
+        print("\n测试15.1: 汇总跨空周期更新与历史回填")
+
+        try:
+            from app.repositories.monitor.monitor_daily_stats_repository import monitor_daily_stats_repository
+            from app.repositories.monitor.monitor_stats_rollup_repository import (
+                find_configs_missing_rollups,
+                rebuild_stats_rollups
+            )
+
+            if len(self.created_config_ids) < 2:
+                raise Exception("没有足够的配置ID")
+
+            # 2024-12-29（周日）和 2025-01-12（周日）之间隔着一个没有数据的周
+            config_id = self.created_config_ids[1]
+            await monitor_daily_stats_repository.bulk_upsert_daily_stats([
+                {"config_id": config_id, "stat_date": date(2024, 12, 29), "follower_count": 100},
+                {"config_id": config_id, "stat_date": date(2025, 1, 12), "follower_count": 150},
+            ])
+            week = await MonitorWeeklyStats.get(config_id=config_id, period_start=date(2025, 1, 6))
+            assert week.follower_delta == 50, f"初始增量不符: {week.follower_delta}"
+
+            # 补写前一个有数据的周，后面隔空周的周期增量随之更新
+            await monitor_daily_stats_repository.upsert_daily_stats(config_id, date(2024, 12, 29), follower_count=120)
+            week = await MonitorWeeklyStats.get(config_id=config_id, period_start=date(2025, 1, 6))
+            month = await MonitorMonthlyStats.get(config_id=config_id, period_start=date(2025, 1, 1))
+            assert (week.follower_delta, month.follower_delta) == (30, 30), \
+                f"补写后增量不符: 周{week.follower_delta}/月{month.follower_delta}"
+
+            # 汇总表上线前写入的历史数据（直接写每日表，没有汇总）
+            history_config = await MonitorConfig.create(
+                user_id=self.test_user_id, channel_code=ChannelEnum.DOUYIN.code,
+                target_url="https://example.com/rollup/history", is_active=1
+            )
+            for i in range(14):
+                await MonitorDailyStats.create(
+                    config_id=history_config.id, stat_date=date(2024, 6, 3) + timedelta(days=i), follower_count=i
+                )
+            missing = await find_configs_missing_rollups()
+            assert history_config.id in missing and config_id not in missing, f"缺少汇总的配置不符: {missing}"
+
+            for _ in range(2):
+                # 可重复执行
+                await rebuild_stats_rollups(missing, batch_size=1)
+            weeks = await MonitorWeeklyStats.filter(config_id=history_config.id).order_by("period_start")
+            assert [(w.follower_count, w.follower_delta) for w in weeks] == [(6, 6), (13, 7)], \
+                f"回填的周汇总不符: {[(w.follower_count, w.follower_delta) for w in weeks]}"
+            assert history_config.id not in await find_configs_missing_rollups()
+
+            self.log_test_result("汇总跨空周期更新与历史回填", True, "空周期之后的增量随补写更新，历史数据可回填")
+
+        except Exception as e:
+            self.log_test_result("汇总跨空周期更新与历史回填", False, str(e))
+
+    async def test_stats_rollup_windows(self):
+        """测试汇总刷新按配置分别确定读取范围"""
+        print("\n测试15.2: 汇总刷新按配置分别读取")
+
+        try:
+            from app.repositories.monitor.monitor_stats_rollup_repository import monitor_weekly_stats_repository
+
+            # 第一个配置有半年的每日数据，变更在一月初；第二个配置的变更在六月
+            early, late = [
+                await MonitorConfig.create(
+                    user_id=self.test_user_id, channel_code=ChannelEnum.DOUYIN.code,
+                    target_url=f"https://example.com/rollup/window/{name}", is_active=1
+                )
+                for name in ("early", "late")
+            ]
+            start = date(2023, 1, 2)
+            await MonitorDailyStats.bulk_create(
+                [MonitorDailyStats(config_id=early.id, stat_date=start + timedelta(days=i), follower_count=i)
+                 for i in range(180)]
+                + [MonitorDailyStats(config_id=late.id, stat_date=date(2023, 6, 5) + timedelta(days=i),
+                                     follower_count=i) for i in range(7)]
+            )
+
+            calls: Dict[str, Dict[int, date]] = {}
+            original_baselines = monitor_weekly_stats_repository._find_baselines
+            original_following = monitor_weekly_stats_repository._find_following_period_rows
+
+            async def spy_baselines(before):
+                calls["baselines"] = before
+                return await original_baselines(before)
+
+            async def spy_following(after):
+                calls["following"] = after
+                return await original_following(after)
+
+            monitor_weekly_stats_repository._find_baselines = spy_baselines
+            monitor_weekly_stats_repository._find_following_period_rows = spy_following
+            try:
+                written = await monitor_weekly_stats_repository.refresh(
+                    [(early.id, date(2023, 1, 4)), (late.id, date(2023, 6, 7))]
+                )
+            finally:
+                del monitor_weekly_stats_repository._find_baselines
+                del monitor_weekly_stats_repository._find_following_period_rows
+
+            # 第一个配置的变更周及其后一周，第二个配置的变更周
+            assert written == 3, f"写入的汇总数不符: {written}"
+            assert calls["baselines"] == {early.id: start, late.id: date(2023, 6, 5)}, f"基线范围不符: {calls}"
+            assert calls["following"] == {early.id: date(2023, 1, 9), late.id: date(2023, 6, 12)}, \
+                f"后续周期范围不符: {calls}"
+            weeks = await MonitorWeeklyStats.filter(config_id__in=[early.id, late.id]).order_by("config_id", "period_start")
+            assert [(w.config_id, w.period_start, w.follower_count) for w in weeks] == [
+                (early.id, start, 6), (early.id, date(2023, 1, 9), 13), (late.id, date(2023, 6, 5), 6)
+            ], f"汇总结果不符: {[(w.config_id, w.period_start, w.follower_count) for w in weeks]}"
+
+            self.log_test_result("汇总刷新按配置分别读取", True, "每个配置只读取自身变更周期及前后数据", calls)
+
+        except Exception as e:
+            self.log_test_result("汇总刷新按配置分别读取", False, str(e))
+
+    async def test_batch_stats(self):
+        """测试多配置数据批量查询"""
+        print("\n测试16: 多配置批量查询")
+
+        try:
+            from app.core.exceptions import BusinessException
+            from app.repositories.monitor.monitor_daily_stats_repository import monitor_daily_stats_repository
+            from app.schemas.monitor.monitor import MonitorStatsBatchQueryRequest
+
+            if len(self.created_config_ids) < 2:
+                raise Exception("没有足够的配置ID")
+
+            config_ids = self.created_config_ids[:2]
+            # 2025-11-03 为周一；第二个配置只有偶数日有数据
+            start = date(2025, 11, 3)
+            records = [
+                {"config_id": config_id, "stat_date": start + timedelta(days=i), "follower_count": config_id * 1000 + i}
+                for config_id in config_ids
+                for i in range(10)
+                if config_id == config_ids[0] or i % 2 == 0
+            ]
+            await monitor_daily_stats_repository.bulk_upsert_daily_stats(records)
+
+            end = start + timedelta(days=9)
+            result = await monitor_service.get_batch_stats(self.test_user_id, MonitorStatsBatchQueryRequest(
+                config_ids=[config_ids[1], config_ids[0]], start_date=start, end_date=end
+            ))
+            assert result.dates == [start + timedelta(days=i) for i in range(10)], f"日期数组不符: {result.dates}"
+            assert [series.config_id for series in result.series] == [config_ids[1], config_ids[0]], "序列顺序应与请求一致"
+            sparse = result.series[0].follower_count
+            assert sparse[1] is None and sparse[2] == config_ids[1] * 1000 + 2, f"缺失数据应为空: {sparse}"
+            assert result.series[1].follower_count[-1] == config_ids[0] * 1000 + 9
+
+            weekly = await monitor_service.get_batch_stats(self.test_user_id, MonitorStatsBatchQueryRequest(
+                config_ids=config_ids, start_date=start, end_date=end, resolution_days=7
+            ))
+            assert weekly.dates == [start, start + timedelta(days=7)], f"周粒度日期不符: {weekly.dates}"
+            assert weekly.series[1].follower_count == [config_ids[1] * 1000 + 6, config_ids[1] * 1000 + 8]
+
+            # 任一配置不属于当前用户时拒绝整个请求
+            try:
+                await monitor_service.get_batch_stats(self.test_user_id, MonitorStatsBatchQueryRequest(
+                    config_ids=[config_ids[0], 999999], start_date=start, end_date=end
+                ))
+                raise Exception("包含他人配置时应该抛出异常")
+            except BusinessException:
+                pass
+
+            self.log_test_result(
+                "多配置批量查询",
+                True,
+                "一次请求返回列式数据，缺失日期为空，归属校验生效",
+                {"dates": len(result.dates), "series": len(result.series)}
+            )
+
+        except Exception as e:
+            self.log_test_result("多配置批量查询", False, str(e))
+
     async def run_all_tests(self):
         """运行所有测试"""
         print("=" * 80)
@@ -684,6 +1491,19 @@ class MonitorTester:
             await self.test_complete_business_flow()
             await self.test_exception_scenarios()
             await self.test_data_statistics()
+            await self.test_bulk_upsert_daily_stats()
+            await self.test_bulk_upsert_statements()
+            await self.test_collect_engine()
+            await self.test_collect_engine_isolation()
+            await self.test_fetcher_partial_metrics()
+            await self.test_collect_engine_schedule()
+            await self.test_task_recorder()
+            await self.test_task_recorder_cancellation()
+            await self.test_collect_engine_shutdown()
+            await self.test_stats_rollup()
+            await self.test_stats_rollup_gap_and_rebuild()
+            await self.test_stats_rollup_windows()
+            await self.test_batch_stats()
 
             # 统计测试结果
             total_tests = len(self.test_results)
@@ -1,10 +1,12 @@
 # 独立的自动化脚本函数
 import asyncio
+import time
 from typing import List, Dict, Any
 
 from app.schemas.monitor.browser import BrowserListRequest, BrowserOpenRequest
 from app.services.monitor.browser_service import bit_browser_service
-from app.util.Playwright_util import PlaywrightUtil
+from app.util.Playwright_util import PlaywrightUtil, BlockingProfile
+from app.util.playwright_pool import playwright_session_pool
 
 
 async def browser_automation_script(util: PlaywrightUtil, browser_id: str):
@@ -304,6 +306,175 @@ async def run_advanced_automation_with_script(ws_url: str, browser_id: str):
     await util.run_automation(advanced_automation_script, browser_id, search_keyword=f"测试{browser_id}")
 
 
+async def test_pooled_back_to_back_automation(rounds: int = 3):
+    """
+    测试会话池：连续执行多个自动化任务，对比每次新建浏览器与复用会话池的耗时
+    （本地无头 Chromium，不依赖比特浏览器）
+    """
+    async def open_blank(util: PlaywrightUtil):
+        await util.goto("about:blank")
+
+    try:
+        for use_pool in (False, True):
+            costs = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                await PlaywrightUtil(headless=True, use_pool=use_pool).run_automation(open_blank)
+                costs.append((time.perf_counter() - start) * 1000)
+            mode = "会话池" if use_pool else "每次新建"
+            print(f"{mode}: " + " / ".join(f"{cost:.0f}ms" for cost in costs))
+    finally:
+        await playwright_session_pool.close_all()
+
+
+async def test_session_pool_reuse_and_recycle():
+    """
+    测试会话池的复用与回收：同一窗口重复取用复用同一连接；回收过期会话时，
+    等待关闭其他会话期间被取用的会话不会被关闭（使用模拟浏览器，不依赖 Chromium）
+    """
+    from app.core.config import settings
+    from app.util.playwright_pool import BrowserSession, PlaywrightSessionPool
+
+    class FakeBrowser:
+        def __init__(self, close_delay: float = 0):
+            self.connected = True
+            self.closed = False
+            self.close_delay = close_delay
+
+        def is_connected(self) -> bool:
+            return self.connected
+
+        async def close(self):
+            await asyncio.sleep(self.close_delay)
+            self.closed = True
+            self.connected = False
+
+    pool = PlaywrightSessionPool()
+    idle_at = time.monotonic() - settings.playwright_session_max_idle - 1
+
+    # 复用：同一 ws 地址的会话直接取用，不重新连接
+    reused = BrowserSession("w0", FakeBrowser(), "ws://w0")
+    pool._sessions["w0"] = reused
+    first = await pool.acquire("ws://w0", key="w0")
+    second = await pool.acquire("ws://w0", key="w0")
+    assert first is second is reused and reused.in_use == 2
+    pool.release(first)
+    pool.release(second)
+    assert reused.in_use == 0
+
+    # 回收：a 关闭较慢，等待期间 b 被重新取用，b 不应被关闭
+    slow, busy, dead = FakeBrowser(close_delay=0.2), FakeBrowser(), FakeBrowser()
+    dead.connected = False
+    for key, browser in (("a", slow), ("b", busy), ("c", dead)):
+        session = BrowserSession(key, browser, f"ws://{key}")
+        session.last_used_at = idle_at
+        pool._sessions[key] = session
+
+    recycling = asyncio.create_task(pool._recycle_stale())
+    await asyncio.sleep(0.05)
+    # 模拟在 b 过期前已通过回收检查的 acquire()：持锁取用 b
+    async with pool._locks.setdefault("b", asyncio.Lock()):
+        session_b = pool._sessions["b"]
+        session_b.in_use += 1
+        session_b.last_used_at = time.monotonic()
+    await recycling
+
+    assert slow.closed and "a" not in pool._sessions
+    assert dead.closed and "c" not in pool._sessions
+    assert not busy.closed and pool._sessions["b"] is session_b and session_b.in_use == 1
+    assert not reused.browser.closed
+
+    pool.release(session_b)
+    await pool.close_all()
+    assert busy.closed and len(pool) == 0
+    print("会话池复用与回收: 通过")
+
+
+async def test_fast_navigation_savings(url: str = "https://www.baidu.com"):
+    """
+    测试快速导航：对比拦截图片/字体/媒体/统计脚本前后的传输字节数与加载耗时
+    """
+    async with PlaywrightUtil(headless=True) as util:
+        result = await util.compare_navigation(url, BlockingProfile())
+        baseline, fast = result["baseline"], result["fast"]
+        print(f"不拦截: {baseline['requests']}个请求 / {baseline['bytes'] / 1024:.0f}KB / {baseline['elapsed_ms']:.0f}ms")
+        print(f"拦截后: {fast['requests']}个请求 / {fast['bytes'] / 1024:.0f}KB / {fast['elapsed_ms']:.0f}ms")
+        print(f"节省: {result['bytes_saved'] / 1024:.0f}KB / {result['time_saved_ms']:.0f}ms")
+
+
+async def test_crawl_local_pages(count: int = 6):
+    """
+    测试并发抓取：本地页面上验证结果可按序号还原顺序、失败重试次数、全局限速以及提前停止迭代后的清理
+    （本地无头 Chromium，不依赖比特浏览器）
+    """
+    import os
+    import tempfile
+    import threading
+    from functools import partial
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    directory = tempfile.mkdtemp(prefix="crawl_pages_")
+    for i in range(count):
+        with open(os.path.join(directory, f"page{i}.html"), "w", encoding="utf-8") as f:
+            f.write(f"<html><head><title>page{i}</title></head><body></body></html>")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(Handler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base_url}/page{i}.html" for i in range(count)]
+    flaky_url, broken_url = urls[1], urls[2]
+    calls: Dict[str, int] = {}
+
+    async def extract(page, url: str) -> str:
+        calls[url] = calls.get(url, 0) + 1
+        if url == flaky_url and calls[url] == 1:
+            raise RuntimeError("首次失败")
+        if url == broken_url:
+            raise RuntimeError("始终失败")
+        return await page.title()
+
+    try:
+        async with PlaywrightUtil(headless=True) as util:
+            pages_before = len(util.context.pages)
+            rate_limit = 10
+            start = time.perf_counter()
+            results = [result async for result in util.crawl(
+                urls, extract, concurrency=3, max_retries=1, rate_limit=rate_limit
+            )]
+            elapsed = time.perf_counter() - start
+
+            # 结果按完成顺序返回，按序号排序后与输入一一对应
+            results.sort(key=lambda result: result.index)
+            assert [result.url for result in results] == urls
+            for i, result in enumerate(results):
+                if result.url != broken_url:
+                    assert result.success and result.data == f"page{i}", result
+            # 失败重试：首次失败的 URL 第二次成功，始终失败的 URL 共尝试 max_retries + 1 次
+            by_url = {result.url: result for result in results}
+            assert by_url[flaky_url].attempts == 2 and by_url[flaky_url].success
+            assert by_url[broken_url].attempts == 2 and not by_url[broken_url].success
+            assert calls[broken_url] == 2
+            # 全局限速：count + 2 次导航，相邻导航间隔至少 1/rate_limit 秒
+            navigations = count + 2
+            assert elapsed >= (navigations - 1) / rate_limit, elapsed
+            # 全部完成后 worker 已关闭自己的页面
+            assert len(util.context.pages) == pages_before
+
+            # 提前停止迭代：剩余 worker 被取消并关闭页面
+            crawler = util.crawl(urls * 3, extract, concurrency=3)
+            async for _ in crawler:
+                break
+            await crawler.aclose()
+            assert len(util.context.pages) == pages_before
+
+            print(f"并发抓取: {len(results)}个结果, 耗时{elapsed * 1000:.0f}ms, 调用次数={len(calls)}个URL")
+    finally:
+        server.shutdown()
+
+
 if __name__ == "__main__":
     # 运行基础测试
     asyncio.run(main())
@@ -313,3 +484,15 @@ if __name__ == "__main__":
 
     # 或者运行高级测试
     # asyncio.run(test_advanced_automation())
+
+    # 或者运行会话池对比测试
+    # asyncio.run(test_pooled_back_to_back_automation())
+
+    # 或者运行会话池复用与回收测试
+    # asyncio.run(test_session_pool_reuse_and_recycle())
+
+    # 或者运行快速导航对比测试
+    # asyncio.run(test_fast_navigation_savings())
+
+    # 或者运行本地页面并发抓取测试
+    # asyncio.run(test_crawl_local_pages())
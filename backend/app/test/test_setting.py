@@ -2,6 +2,7 @@
 import asyncio
 import os
 import sys
+import timeit
 from typing import List, Dict, Any
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -14,6 +15,7 @@ from app.enums.settings import (
     NotificationSettingEnum,
     AdvancedSettingEnum
 )
+from app.repositories.account.setting_repository import setting_repository
 from app.schemas.account.setting import SettingUpdateRequest
 from app.services.account.setting_service import SettingService
 
@@ -36,6 +38,7 @@ class SettingTester:
     async def cleanup_test_database():
         print("正在清理测试数据库...")
         await Setting.all().delete()
+        setting_repository.clear_cache()
         await close_db()
         print("测试数据库清理完成")
 
@@ -172,6 +175,71 @@ class SettingTester:
         except Exception as e:
             self.log_test_result("根据code查找配置", False, str(e))
 
+    async def test_find_setting_by_code_benchmark(self):
+        """测试10.1: 配置项编码查找性能"""
+        print("\n测试10.1: 配置项编码查找性能")
+        try:
+            def linear_find(code):
+                for group in SettingGroupEnum:
+                    for setting in list(group.setting_enum):
+                        if setting.code == code:
+                            return group, setting
+                raise ValueError(code)
+
+            # 取最后一个分组中的配置项，对应线性扫描的最坏情况
+            codes = [s.code for s in SettingGroupEnum.DOWNLOAD.get_settings()]
+            number = 20000
+            linear_cost = timeit.timeit(lambda: [linear_find(c) for c in codes], number=number)
+            indexed_cost = timeit.timeit(
+                lambda: [SettingGroupEnum.find_setting_by_code(c) for c in codes], number=number
+            )
+
+            for code in codes:
+                assert SettingGroupEnum.find_setting_by_code(code) == linear_find(code)
+            assert indexed_cost < linear_cost, "索引查找应快于线性扫描"
+            self.log_test_result(
+                "配置项编码查找性能", True,
+                f"线性 {linear_cost / number * 1e6:.2f}us/次，索引 {indexed_cost / number * 1e6:.2f}us/次"
+            )
+        except Exception as e:
+            self.log_test_result("配置项编码查找性能", False, str(e))
+
+    async def test_setting_cache_invalidation(self):
+        """测试11: 配置缓存写穿失效"""
+        print("\n测试11: 配置缓存写穿失效")
+        try:
+            setting_key = AdvancedSettingEnum.TASK_RETRY_COUNT.code
+
+            # 首次读取回填缓存，再次读取命中缓存
+            await self.service.get_setting(self.test_user_id, setting_key)
+            hits_before = setting_repository._cache.hits
+            await self.service.get_setting(self.test_user_id, setting_key)
+            assert setting_repository._cache.hits == hits_before + 1, "第二次读取应命中缓存"
+
+            # 更新后立即可见
+            request = SettingUpdateRequest(setting_key=setting_key, setting_value=8)
+            await self.service.update_setting(self.test_user_id, request)
+            result = await self.service.get_setting(self.test_user_id, setting_key)
+            assert result.setting_value == 8 and result.is_default is False
+
+            # 重置后立即可见
+            await self.service.reset_setting(self.test_user_id, setting_key)
+            result = await self.service.get_setting(self.test_user_id, setting_key)
+            assert result.setting_value == AdvancedSettingEnum.TASK_RETRY_COUNT.default
+            assert result.is_default is True
+
+            # 修改返回的 JSON 配置值不影响缓存
+            json_key = 990001
+            await setting_repository.upsert_user_setting(self.test_user_id, json_key, {"tags": ["a"]})
+            settings_map = await setting_repository.find_user_settings_map(self.test_user_id)
+            settings_map[json_key]["tags"].append("b")
+            settings_map = await setting_repository.find_user_settings_map(self.test_user_id)
+            assert settings_map[json_key] == {"tags": ["a"]}, f"缓存被调用方修改: {settings_map[json_key]}"
+            await setting_repository.delete_user_setting(self.test_user_id, json_key)
+            self.log_test_result("配置缓存写穿失效", True, "更新/重置后读取到最新值，返回值修改不影响缓存")
+        except Exception as e:
+            self.log_test_result("配置缓存写穿失效", False, str(e))
+
     async def run_all_tests(self):
         print("=" * 80)
         print("开始用户配置模块测试")
@@ -190,6 +258,8 @@ class SettingTester:
             await self.test_get_invalid_group()
             await self.test_group_enum_structure()
             await self.test_find_setting_by_code()
+            await self.test_find_setting_by_code_benchmark()
+            await self.test_setting_cache_invalidation()
 
             total = len(self.test_results)
             passed = sum(1 for r in self.test_results if r["success"])
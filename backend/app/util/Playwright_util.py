@@ -1,9 +1,94 @@
 import asyncio
 import random
+import re
+import time
 import uuid
-from typing import Optional, Dict, Callable
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, FrozenSet, Iterable, Optional, Tuple
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright, Route
+
+from app.util.playwright_pool import BrowserSession, playwright_session_pool
+
+
+@dataclass
+class CrawlResult:
+    """单个 URL 的抓取结果"""
+    index: int  # URL 在输入中的序号，结果按完成顺序返回，可据此还原顺序
+    url: str
+    success: bool
+    data: Any = None  # handler 的返回值
+    error: Optional[str] = None
+    attempts: int = 0
+    elapsed_ms: int = 0  # 最后一次尝试的耗时
+
+
+@dataclass
+class BlockingProfile:
+    """
+    快速导航配置：通过路由拦截屏蔽不需要的资源
+
+    只需要标题或 DOM 文本时，图片、字体、媒体和统计脚本都不必下载
+    """
+    # 屏蔽的资源类型（Playwright request.resource_type）
+    resource_types: FrozenSet[str] = frozenset({"image", "media", "font"})
+    # 屏蔽的 URL 片段（子串匹配，常见统计/广告域名）
+    url_patterns: Tuple[str, ...] = (
+        "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+        "hm.baidu.com", "cnzz.com", "sentry.io", "facebook.net"
+    )
+    # 各类资源的估算大小（字节），用于统计节省的流量
+    estimated_bytes: Dict[str, int] = field(default_factory=lambda: {
+        "image": 60_000, "media": 500_000, "font": 40_000, "script": 30_000, "stylesheet": 20_000
+    })
+    default_estimated_bytes: int = 10_000
+    # 估算带宽（字节/秒），用于由节省的流量估算节省的时间
+    estimated_bandwidth: int = 1_250_000
+
+    def __post_init__(self):
+        self._url_regex = re.compile("|".join(map(re.escape, self.url_patterns))) if self.url_patterns else None
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """判断请求是否需要屏蔽"""
+        if resource_type in self.resource_types:
+            return True
+        return bool(self._url_regex and self._url_regex.search(url))
+
+
+@dataclass
+class BlockingStats:
+    """快速导航统计（节省的流量和时间为按资源类型的估算值）"""
+    allowed_requests: int = 0
+    blocked_requests: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+    bytes_saved: int = 0
+    time_saved_ms: float = 0.0
+
+    def record_blocked(self, resource_type: str, profile: BlockingProfile):
+        self.blocked_requests += 1
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        estimated = profile.estimated_bytes.get(resource_type, profile.default_estimated_bytes)
+        self.bytes_saved += estimated
+        self.time_saved_ms += estimated / profile.estimated_bandwidth * 1000
+
+
+class _RateLimiter:
+    """简单的全局限速器：相邻两次放行至少间隔 1/rate 秒"""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
 
 
 class PlaywrightUtil:
@@ -14,7 +99,9 @@ class PlaywrightUtil:
     def __init__(
             self,
             ws_endpoint: Optional[str] = None,
-            headless: bool = True
+            headless: bool = True,
+            use_pool: bool = False,
+            pool_key: Optional[str] = None
     ):
         """
         初始化 PlaywrightUtil
@@ -22,9 +109,19 @@ class PlaywrightUtil:
         Args:
             ws_endpoint: 可选，如果提供则连接到已存在的浏览器
             headless: 是否以无头模式运行 (仅在启动新浏览器时有效)
+            use_pool: 是否使用全局会话池。使用时浏览器连接在任务之间复用，
+                      关闭时只关闭本实例的上下文
+            pool_key: 会话池中的键，比特浏览器场景建议传窗口 ID（默认使用 ws_endpoint）
         """
         self.ws_endpoint = ws_endpoint
         self.headless = headless
+        self.use_pool = use_pool
+        self.pool_key = pool_key
+        self._session: Optional[BrowserSession] = None
+
+        # 快速导航（资源拦截）
+        self.blocking_profile: Optional[BlockingProfile] = None
+        self.blocking_stats = BlockingStats()
 
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
@@ -38,14 +135,20 @@ class PlaywrightUtil:
             print("浏览器已经启动或连接。")
             return
 
-        self.playwright = await async_playwright().start()
-
-        if self.ws_endpoint:
-            print(f"正在连接到浏览器: {self.ws_endpoint}")
-            self.browser = await self.playwright.chromium.connect_over_cdp(self.ws_endpoint)
+        if self.use_pool:
+            # 会话池模式：复用已有的驱动和浏览器连接
+            self._session = await playwright_session_pool.acquire(self.ws_endpoint, self.pool_key, self.headless)
+            self.browser = self._session.browser
+            print(f"已从会话池获取浏览器: {self._session.key}")
         else:
-            print(f"正在启动新的 Chromium 浏览器 (无头模式: {self.headless})...")
-            self.browser = await self.playwright.chromium.launch(headless=self.headless)
+            self.playwright = await async_playwright().start()
+
+            if self.ws_endpoint:
+                print(f"正在连接到浏览器: {self.ws_endpoint}")
+                self.browser = await self.playwright.chromium.connect_over_cdp(self.ws_endpoint)
+            else:
+                print(f"正在启动新的 Chromium 浏览器 (无头模式: {self.headless})...")
+                self.browser = await self.playwright.chromium.launch(headless=self.headless)
 
         # 创建一个独立的浏览器上下文，用于隔离会话
         self.context = await self.browser.new_context()
@@ -74,12 +177,29 @@ class PlaywrightUtil:
 
     async def close_browser(self):
         """关闭浏览器并清理资源。"""
+        if self._session:
+            # 会话池模式：只关闭本实例的上下文，浏览器连接归还会话池
+            try:
+                if self.context:
+                    await self.context.close()
+            finally:
+                playwright_session_pool.release(self._session)
+                self._session = None
+                self.browser = None
+                self.context = None
+                self.pages = {}
+                self._default_page_id = None
+                self.blocking_profile = None
+                print("浏览器上下文已关闭，连接已归还会话池。")
+            return
+
         if self.browser:
             await self.browser.close()
             self.browser = None
             self.context = None
             self.pages = {}
             self._default_page_id = None
+            self.blocking_profile = None
             print("浏览器已关闭。")
         if self.playwright:
             await self.playwright.stop()
@@ -126,6 +246,212 @@ class PlaywrightUtil:
         del self.pages[page_id]
         print(f"已关闭页面: {page_id}")
 
+    # --- 快速导航（资源拦截） ---
+
+    async def _route_handler(self, route: Route):
+        """路由拦截：按配置屏蔽资源，其余请求放行"""
+        request = route.request
+        profile = self.blocking_profile
+        if profile and profile.should_block(request.resource_type, request.url):
+            self.blocking_stats.record_blocked(request.resource_type, profile)
+            await route.abort()
+        else:
+            self.blocking_stats.allowed_requests += 1
+            await route.continue_()
+
+    async def enable_fast_navigation(self, profile: Optional[BlockingProfile] = None):
+        """
+        开启快速导航：在当前上下文中拦截并屏蔽不需要的资源，对已有和之后创建的页面（含 crawl）都生效
+
+        Args:
+            profile: 拦截配置，默认屏蔽图片、媒体、字体和常见统计脚本
+        """
+        if not self.context:
+            raise RuntimeError("浏览器未启动，无法开启快速导航。")
+
+        if self.blocking_profile is None:
+            await self.context.route("**/*", self._route_handler)
+        self.blocking_profile = profile or BlockingProfile()
+        self.blocking_stats = BlockingStats()
+
+    async def disable_fast_navigation(self):
+        """关闭快速导航，恢复加载全部资源"""
+        if self.context and self.blocking_profile is not None:
+            await self.context.unroute("**/*", self._route_handler)
+        self.blocking_profile = None
+
+    async def compare_navigation(
+            self,
+            url: str,
+            profile: Optional[BlockingProfile] = None,
+            wait_until: str = "load",
+            timeout: int = 30000
+    ) -> Dict[str, Any]:
+        """
+        实测快速导航的效果：分别在不拦截和拦截的全新上下文中打开同一页面，对比传输字节数和加载耗时
+
+        Args:
+            url: 测试页面
+            profile: 拦截配置，默认使用 BlockingProfile()
+            wait_until: 导航等待的加载状态
+            timeout: 导航超时时间（毫秒）
+
+        Returns:
+            包含 baseline / fast 两次的字节数和耗时，以及实际节省值的字典
+        """
+        if not self.browser:
+            raise RuntimeError("浏览器未启动，无法测试。")
+
+        profile = profile or BlockingProfile()
+
+        async def measure(block: bool) -> Dict[str, float]:
+            context = await self.browser.new_context()
+            sizes = []
+
+            async def on_finished(request):
+                try:
+                    sizes.append(await request.sizes())
+                except Exception:
+                    pass
+
+            try:
+                if block:
+                    async def handler(route: Route):
+                        request = route.request
+                        if profile.should_block(request.resource_type, request.url):
+                            await route.abort()
+                        else:
+                            await route.continue_()
+                    await context.route("**/*", handler)
+
+                page = await context.new_page()
+                page.on("requestfinished", on_finished)
+                start = time.perf_counter()
+                await page.goto(url, wait_until=wait_until, timeout=timeout)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                # 等待 requestfinished 回调中的 sizes() 完成
+                await asyncio.sleep(0.2)
+                total_bytes = sum(s["responseBodySize"] + s["responseHeadersSize"] for s in sizes)
+                return {"bytes": total_bytes, "elapsed_ms": elapsed_ms, "requests": len(sizes)}
+            finally:
+                await context.close()
+
+        baseline = await measure(block=False)
+        fast = await measure(block=True)
+        return {
+            "baseline": baseline,
+            "fast": fast,
+            "bytes_saved": baseline["bytes"] - fast["bytes"],
+            "time_saved_ms": baseline["elapsed_ms"] - fast["elapsed_ms"]
+        }
+
+    # --- 并发抓取 ---
+
+    async def crawl(
+            self,
+            urls: Iterable[str],
+            handler: Callable[[Page, str], Awaitable[Any]],
+            concurrency: int = 5,
+            timeout: int = 15000,
+            max_retries: int = 1,
+            rate_limit: Optional[float] = None,
+            wait_until: str = "domcontentloaded"
+    ) -> AsyncIterator[CrawlResult]:
+        """
+        在当前上下文中用 N 个页面并发抓取一批 URL，结果以异步生成器按完成顺序返回。
+
+        用法：
+            async def extract(page, url):
+                return await page.title()
+
+            async for result in util.crawl(urls, extract, concurrency=8, rate_limit=5):
+                print(result.index, result.url, result.data)
+
+        Args:
+            urls: URL 列表
+            handler: 页面导航完成后执行的异步函数，接收 (page, url)，返回值写入 CrawlResult.data
+            concurrency: 并发页面数量
+            timeout: 单个 URL 的超时时间（毫秒，包含导航和 handler）
+            max_retries: 单个 URL 失败后的重试次数
+            rate_limit: 全局每秒最多发起的导航次数，None 表示不限速
+            wait_until: 导航等待的加载状态
+        """
+        if not self.context:
+            raise RuntimeError("浏览器未启动，无法抓取。")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(urls):
+            queue.put_nowait(item)
+        if queue.empty():
+            return
+
+        results: asyncio.Queue = asyncio.Queue()
+        limiter = _RateLimiter(rate_limit)
+        timeout_seconds = timeout / 1000
+
+        async def visit(page: Page, url: str) -> Any:
+            await page.goto(url, timeout=timeout, wait_until=wait_until)
+            return await handler(page, url)
+
+        async def worker():
+            page = await self.context.new_page()
+            try:
+                while True:
+                    try:
+                        index, url = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+
+                    result = CrawlResult(index=index, url=url, success=False)
+                    while True:
+                        result.attempts += 1
+                        await limiter.wait()
+                        if page.is_closed():
+                            page = await self.context.new_page()
+                        start = time.perf_counter()
+                        try:
+                            result.data = await asyncio.wait_for(visit(page, url), timeout_seconds)
+                            result.success = True
+                            result.error = None
+                        except Exception as e:
+                            result.error = str(e) or type(e).__name__
+                        result.elapsed_ms = int((time.perf_counter() - start) * 1000)
+
+                        if result.success or result.attempts > max_retries:
+                            break
+                        await asyncio.sleep(2 ** (result.attempts - 1) * random.uniform(0.5, 1.5))
+
+                    await results.put(result)
+            finally:
+                if not page.is_closed():
+                    await page.close()
+
+        workers = {asyncio.create_task(worker()) for _ in range(min(concurrency, queue.qsize()))}
+        getter: Optional[asyncio.Future] = None
+        try:
+            while workers or not results.empty():
+                if not results.empty():
+                    yield results.get_nowait()
+                    continue
+                getter = asyncio.ensure_future(results.get())
+                finished, _ = await asyncio.wait({getter, *workers}, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished - {getter}:
+                    workers.discard(task)
+                    # 传播 worker 中的意外异常（如创建页面失败）
+                    task.result()
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+                getter = None
+        finally:
+            # 调用方提前停止迭代或 worker 异常时取消剩余 worker，并等待其关闭页面
+            if getter is not None:
+                getter.cancel()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
     # --- 页面级操作 ---
 
     async def goto(self, url: str, page_id: Optional[str] = None):
@@ -4,6 +4,16 @@
 import hashlib
 import secrets
 import string
+from typing import List
+
+# 后缀字符集（62个字符）
+_SUFFIX_CHARS = string.ascii_uppercase + string.digits + string.ascii_lowercase
+# 随机字节映射到后缀字符时的拒绝阈值：只接受 [0, 248)，保证 62 个字符等概率
+_SUFFIX_BYTE_LIMIT = 256 - 256 % len(_SUFFIX_CHARS)
+# 字节 -> 后缀字符的查找表，配合 bytes.translate 在 C 层完成整批编码
+_SUFFIX_TABLE = bytes(ord(_SUFFIX_CHARS[b % len(_SUFFIX_CHARS)]) for b in range(256))
+# 需要拒绝（删除）的字节
+_SUFFIX_REJECTED = bytes(range(_SUFFIX_BYTE_LIMIT, 256))
 
 
 class ActivationCodeGenerator:
@@ -48,5 +58,40 @@ class ActivationCodeGenerator:
 
         return f"{hash2}{suffix}"
 
+    @staticmethod
+    def generate_batch(n: int) -> List[str]:
+        """
+        批量生成随机激活码
+
+        与 generate() 格式一致（32位小写十六进制 + 16位后缀），但一次性从
+        secrets.token_bytes 取出全部熵：
+        1. 前32位：16个随机字节的十六进制编码（与 MD5 摘要同为128位均匀分布）
+        2. 后16位：随机字节经查找表映射到后缀字符集，丢弃 >= 248 的字节避免取模偏差
+
+        Args:
+            n: 生成数量
+
+        Returns:
+            List[str]: 48位激活码字符串列表
+        """
+        if n <= 0:
+            return []
+
+        hex_part = secrets.token_bytes(16 * n).hex()
+
+        suffix_len = 16 * n
+        suffix = b''
+        while len(suffix) < suffix_len:
+            # 按拒绝率（8/256）多取一些字节，通常一轮即可凑满
+            need = suffix_len - len(suffix)
+            raw = secrets.token_bytes(need + need // 16 + 16)
+            suffix += raw.translate(_SUFFIX_TABLE, _SUFFIX_REJECTED)
+        suffix_part = suffix[:suffix_len].decode('ascii')
+
+        return [
+            hex_part[i * 32:(i + 1) * 32] + suffix_part[i * 16:(i + 1) * 16]
+            for i in range(n)
+        ]
+
 
 code_generator = ActivationCodeGenerator()
@@ -7,6 +7,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
 from app.models.account.user import User
+from app.repositories.account.user_repository import user_repository
 from app.util.jwt import jwt_manager
 
 # OAuth2 密码流，tokenUrl 对应登录接口
@@ -26,8 +27,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     payload = jwt_manager.verify_token(token)
     user_id = payload.get("user_id")
 
-    # 获取用户
-    user = await User.get_or_none(id=user_id)
+    # 获取用户（带缓存，用户更新/删除时失效）
+    user = await user_repository.get_cached_by_id(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,132 @@
+"""
+进程内缓存工具类
+提供带过期时间（TTL）和 LRU 淘汰的简单内存缓存
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+# 内部哨兵，用于区分"未命中"和"缓存值为 None"
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    TTL + LRU 内存缓存
+
+    - 每个条目写入时记录过期时间，读取时惰性清理过期条目
+    - 超过最大容量时淘汰最久未访问的条目
+    - 仅在单个事件循环内使用，不做线程同步
+
+    泛型参数:
+        K: 缓存键类型
+        V: 缓存值类型
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        """
+        初始化缓存
+
+        Args:
+            max_size: 最大条目数，<= 0 表示禁用缓存
+            ttl: 默认过期时间（秒）
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """缓存是否启用"""
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+            default: 未命中时的返回值
+
+        Returns:
+            缓存值，未命中或已过期返回 default
+        """
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expire_at, value = entry
+        if expire_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 本条目的过期时间（秒），不传则使用默认值
+        """
+        if not self.enabled:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> bool:
+        """
+        删除单个缓存条目
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            条目是否存在
+        """
+        return self._data.pop(key, _MISSING) is not _MISSING
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> int:
+        """
+        按条件批量删除缓存条目
+
+        Args:
+            predicate: 接收缓存键，返回 True 表示删除
+
+        Returns:
+            删除的条目数量
+        """
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key, _MISSING)
+        return entry is not _MISSING and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
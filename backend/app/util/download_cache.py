@@ -0,0 +1,214 @@
+"""
+下载去重缓存
+按"平台 + 视频 ID + 请求格式"索引已下载的文件，重复请求直接硬链接到用户下载目录，不再重新下载
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import log
+
+
+class DownloadCache:
+    """
+    下载去重缓存
+
+    - 缓存文件保存在独立的缓存目录中，每个条目一个子目录，用户目录中的文件是它的硬链接
+      （跨磁盘无法硬链接时退化为复制）
+    - 索引按最近使用顺序保存在缓存目录的 index.json 中，重启后仍然有效
+    - 条目数或总大小超过上限时淘汰最久未使用的条目；淘汰只删除缓存副本，用户目录中的硬链接不受影响
+    - 仅在单个事件循环内使用，不做线程同步
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录，默认读取配置
+            max_entries: 最大条目数，默认读取配置
+            max_bytes: 缓存文件总大小上限（字节），默认读取配置
+        """
+        self.cache_dir = Path(cache_dir or settings.download_cache_dir)
+        self.max_entries = settings.download_cache_max_entries if max_entries is None else max_entries
+        self.max_bytes = settings.download_cache_max_bytes if max_bytes is None else max_bytes
+        self._index: Optional["OrderedDict[str, Dict[str, Any]]"] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """缓存是否启用"""
+        return settings.download_cache_enabled and self.max_entries > 0 and self.max_bytes > 0
+
+    @property
+    def total_bytes(self) -> int:
+        """缓存文件总大小"""
+        return sum(entry["size"] for entry in self._load().values())
+
+    @staticmethod
+    def make_key(info: Dict[str, Any], format_spec: Optional[str]) -> Optional[str]:
+        """
+        根据 yt-dlp 解析结果生成缓存键
+
+        Args:
+            info: extract_info(download=False) 的返回值
+            format_spec: 请求的格式（yt-dlp format 参数）
+
+        Returns:
+            缓存键，播放列表等无法确定单个视频时返回 None
+        """
+        if info.get("_type", "video") != "video" or not info.get("id"):
+            return None
+        extractor = (info.get("extractor_key") or info.get("extractor") or "generic").lower()
+        return f"{extractor}:{info['id']}:{format_spec or 'best'}"
+
+    def entry_dir(self, key: str) -> Path:
+        """获取缓存条目的下载目录"""
+        return self.cache_dir / hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        读取缓存文件路径
+
+        缓存文件已被删除时自动移除索引条目。
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存文件路径，未命中返回 None
+        """
+        index = self._load()
+        entry = index.get(key)
+        if entry is None or not os.path.isfile(entry["path"]):
+            if entry is not None:
+                del index[key]
+                self._save()
+            self.misses += 1
+            return None
+
+        index.move_to_end(key)
+        entry["last_used"] = time.time()
+        self._save()
+        self.hits += 1
+        return entry["path"]
+
+    def put(self, key: str, path: str) -> None:
+        """
+        登记缓存文件并按上限淘汰旧条目
+
+        Args:
+            key: 缓存键
+            path: 缓存目录中已下载完成的文件路径
+        """
+        index = self._load()
+        index[key] = {"path": path, "size": os.path.getsize(path), "last_used": time.time()}
+        index.move_to_end(key)
+        self._evict(keep=key)
+        self._save()
+
+    def invalidate(self, key: str) -> bool:
+        """
+        删除缓存条目及其缓存文件
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            条目是否存在
+        """
+        entry = self._load().pop(key, None)
+        if entry is None:
+            return False
+        self._remove_files(key)
+        self._save()
+        return True
+
+    def clear(self) -> None:
+        """清空缓存条目及缓存文件"""
+        for key in list(self._load()):
+            self._remove_files(key)
+        self._load().clear()
+        self._save()
+
+    @staticmethod
+    def link_into(path: str, output_dir: str) -> str:
+        """
+        将缓存文件硬链接到输出目录（同名文件已存在时直接返回）
+
+        Args:
+            path: 缓存文件路径
+            output_dir: 用户下载目录
+
+        Returns:
+            输出目录中的文件绝对路径
+        """
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        target = os.path.abspath(os.path.join(output_dir, os.path.basename(path)))
+        if os.path.exists(target):
+            return target
+
+        try:
+            os.link(path, target)
+        except OSError:
+            # 跨磁盘或文件系统不支持硬链接
+            shutil.copy2(path, target)
+        return target
+
+    def _evict(self, keep: str) -> None:
+        """淘汰最久未使用的条目，直到条目数和总大小都不超过上限"""
+        index = self._load()
+        total = sum(entry["size"] for entry in index.values())
+        for key in list(index):
+            if len(index) <= self.max_entries and total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= index.pop(key)["size"]
+            self._remove_files(key)
+            log.info(f"下载缓存淘汰: {key}")
+
+    def _remove_files(self, key: str) -> None:
+        """删除条目的缓存目录"""
+        shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+
+    def _load(self) -> "OrderedDict[str, Dict[str, Any]]":
+        """加载（首次访问时从磁盘读取）索引"""
+        if self._index is None:
+            self._index = OrderedDict()
+            index_path = self.cache_dir / self.INDEX_FILE
+            if index_path.is_file():
+                try:
+                    self._index.update(json.loads(index_path.read_text(encoding="utf-8")))
+                except (OSError, ValueError) as e:
+                    log.warning(f"下载缓存索引读取失败，已重建: {e}")
+        return self._index
+
+    def _save(self) -> None:
+        """写入索引（先写临时文件再替换，避免中途失败损坏索引）"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index_path = self.cache_dir / self.INDEX_FILE
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._index, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, index_path)
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+
+# 全局下载缓存实例
+download_cache = DownloadCache()
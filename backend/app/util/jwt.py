@@ -3,6 +3,7 @@
 使用 PyJWT 进行 token 签名和验证，无需服务端存储
 """
 
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 
@@ -10,6 +11,7 @@ import jwt
 from fastapi import HTTPException
 
 from app.core.config import settings
+from app.util.cache import TTLCache
 
 
 class JWTManager:
@@ -19,6 +21,11 @@ class JWTManager:
         self.secret_key = settings.jwt_secret_key
         self.algorithm = settings.jwt_algorithm
         self.expire_minutes = settings.jwt_expire_minutes
+        # 已验证 token -> 载荷，条目在 token 的 exp 时刻过期
+        self._payload_cache: TTLCache[str, Dict[str, Any]] = TTLCache(
+            max_size=settings.jwt_cache_max_size,
+            ttl=self.expire_minutes * 60
+        )
 
     def create_access_token(self, user_id: int) -> Dict[str, Any]:
         """创建访问令牌"""
@@ -42,14 +49,23 @@ class JWTManager:
         }
 
     def verify_token(self, token: str) -> Dict[str, Any]:
-        """验证 token 并返回 payload"""
+        """验证 token 并返回 payload（验证结果按 token 缓存至其过期时间）"""
+        payload = self._payload_cache.get(token)
+        if payload is not None:
+            return dict(payload)
+
         try:
-            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token已过期")
         except jwt.InvalidTokenError as e:
             raise HTTPException(status_code=401, detail=f"Token无效: {str(e)}")
 
+        exp = payload.get("exp")
+        if exp is not None:
+            self._payload_cache.set(token, payload, ttl=exp - time.time())
+        return dict(payload)
+
     @staticmethod
     def extract_token_from_header(authorization: str) -> Optional[str]:
         """从 Authorization 头中提取 token"""
@@ -0,0 +1,168 @@
+"""
+分页工具类
+提供游标（keyset）分页的编解码与总数估算
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
+
+from app.core.config import settings
+from app.core.logging import log
+from app.enums.common.page_count_mode import PageCountModeEnum
+from app.util.cache import TTLCache
+
+# 游标分页固定使用的排序：创建时间倒序，ID 倒序兜底保证顺序稳定
+CURSOR_ORDERING = ("-created_at", "-id")
+
+# 列表总数缓存：(统计方式, COUNT 语句) -> 总数
+# COUNT 语句已包含表名与全部过滤条件（含用户范围），可直接作为规范化的条件键
+_count_cache: TTLCache[Tuple[int, str], int] = TTLCache(
+    max_size=settings.page_count_cache_max_size,
+    ttl=settings.page_count_cache_ttl
+)
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    将一页最后一条记录的 (created_at, id) 编码为游标
+
+    Args:
+        created_at: 创建时间
+        id: 记录 ID
+
+    Returns:
+        URL 安全的 base64 游标字符串
+    """
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    解析游标
+
+    Args:
+        cursor: encode_cursor 生成的游标
+
+    Returns:
+        (created_at, id)
+
+    Raises:
+        ValueError: 游标格式错误
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"无效的分页游标: {e}")
+
+
+def apply_cursor(query: QuerySet, cursor: Optional[str]) -> QuerySet:
+    """
+    为查询集附加游标条件与固定排序
+
+    条件为 created_at < c OR (created_at = c AND id < i)，
+    可以走 (created_at, id) 上的索引，不受翻页深度影响
+
+    Args:
+        query: 查询集（原有排序会被替换为 CURSOR_ORDERING）
+        cursor: 上一页返回的游标，None 表示第一页
+
+    Returns:
+        附加条件后的查询集
+    """
+    query = query.order_by(*CURSOR_ORDERING)
+    if not cursor:
+        return query
+
+    created_at, id = decode_cursor(cursor)
+    return query.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=id))
+
+
+def cursor_of(item: Any) -> str:
+    """
+    根据一条记录生成指向它之后的游标
+
+    Args:
+        item: Model 实例或投影查询得到的字典
+
+    Returns:
+        游标字符串
+    """
+    if isinstance(item, dict):
+        return encode_cursor(item["created_at"], item["id"])
+    return encode_cursor(item.created_at, item.id)
+
+
+async def estimate_count(query: QuerySet) -> int:
+    """
+    估算查询结果总数
+
+    MySQL 下读取 EXPLAIN 的行数估计，避免对大表执行 COUNT(*)；
+    其他数据库没有可用的估计值，退化为精确统计
+
+    Args:
+        query: 查询集
+
+    Returns:
+        估算的记录数
+    """
+    db = query.model._meta.db
+    if db.capabilities.dialect != "mysql":
+        return await query.count()
+
+    try:
+        _, rows = await db.execute_query(f"EXPLAIN {query.sql(params_inline=True)}")
+        return max((int(row.get("rows") or 0) for row in rows), default=0)
+    except Exception as e:
+        log.warning(f"估算总数失败，改用精确统计: {e}")
+        return await query.count()
+
+
+async def count_total(
+    query: QuerySet,
+    count_mode: int,
+    use_cache: bool = False,
+    refresh: bool = False
+) -> Optional[int]:
+    """
+    按统计方式计算查询总数
+
+    Args:
+        query: 查询集
+        count_mode: 统计方式（PageCountModeEnum 编码）
+        use_cache: 是否使用总数缓存（同一条件在有效期内不重复 COUNT）
+        refresh: 是否忽略缓存重新统计并回写（通常用于第一页）
+
+    Returns:
+        总数，不统计时返回 None
+    """
+    if count_mode == PageCountModeEnum.NONE.code:
+        return None
+
+    key = None
+    if use_cache and _count_cache.enabled:
+        key = (count_mode, query.count().sql(params_inline=True))
+        if not refresh:
+            total = _count_cache.get(key)
+            if total is not None:
+                return total
+
+    if count_mode == PageCountModeEnum.ESTIMATED.code:
+        total = await estimate_count(query)
+    else:
+        total = await query.count()
+
+    if key is not None:
+        _count_cache.set(key, total)
+    return total
+
+
+def clear_count_cache() -> None:
+    """清空列表总数缓存"""
+    _count_cache.clear()
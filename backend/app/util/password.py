@@ -1,15 +1,45 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 import bcrypt
 
+from app.core.config import settings
+
+# bcrypt 计算期间会释放 GIL，放到独立线程池中执行，避免阻塞事件循环
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """获取（按需创建）密码哈希线程池"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.password_hash_workers,
+            thread_name_prefix="password-hash"
+        )
+    return _executor
+
+
+def shutdown_password_executor() -> None:
+    """关闭密码哈希线程池（应用关闭时调用）"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
 
 def hash_password(password: str) -> str:
     """
     使用 bcrypt 库对密码进行哈希处理。
+
+    同步版本，会阻塞当前线程；在异步代码中请使用 hash_password_async。
     """
     # bcrypt 库要求密码必须是 bytes 类型
     password_bytes = password.encode('utf-8')
 
-    # gensalt() 生成一个随机的盐
-    salt = bcrypt.gensalt()
+    # gensalt() 生成一个随机的盐，rounds 为成本因子
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
 
     # hashpw() 进行哈希，返回的也是 bytes
     hashed_bytes = bcrypt.hashpw(password_bytes, salt)
@@ -21,9 +51,27 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     验证密码。
+
+    同步版本，会阻塞当前线程；在异步代码中请使用 verify_password_async。
     """
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
 
     # checkpw 会自动从哈希值中提取盐进行验证
     return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    在密码哈希线程池中对密码进行哈希处理。
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    在密码哈希线程池中验证密码。
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), verify_password, plain_password, hashed_password)
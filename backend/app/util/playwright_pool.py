@@ -0,0 +1,252 @@
+"""
+Playwright 浏览器会话池
+复用 Playwright 驱动和浏览器连接（CDP / 本地启动），避免每个自动化任务重复启动和连接
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+
+from app.core.config import settings
+from app.core.logging import log
+
+
+class BrowserSession:
+    """
+    池中的一个浏览器会话
+
+    对应一个浏览器连接：比特浏览器窗口（通过 CDP 连接）或本地启动的 Chromium
+    """
+
+    def __init__(self, key: str, browser: Browser, ws_endpoint: Optional[str] = None):
+        """
+        初始化会话
+
+        Args:
+            key: 会话键（比特浏览器窗口 ID、ws 地址或本地启动标识）
+            browser: 已连接的浏览器
+            ws_endpoint: CDP 连接地址，本地启动时为空
+        """
+        self.key = key
+        self.browser = browser
+        self.ws_endpoint = ws_endpoint
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+        self.in_use = 0
+
+    @property
+    def is_connected(self) -> bool:
+        """浏览器连接是否仍然可用"""
+        return self.browser.is_connected()
+
+    def is_stale(self, now: float) -> bool:
+        """
+        会话是否需要回收：连接已断开，或空闲/存活时间超过上限（使用中的会话不因超时回收）
+
+        Args:
+            now: 当前时间（time.monotonic）
+        """
+        if not self.is_connected:
+            return True
+        if self.in_use:
+            return False
+        return (
+            now - self.last_used_at > settings.playwright_session_max_idle
+            or now - self.created_at > settings.playwright_session_max_age
+        )
+
+    async def close(self) -> None:
+        """关闭会话：CDP 连接只断开连接并清理本会话创建的上下文，不会关闭比特浏览器窗口"""
+        try:
+            await self.browser.close()
+        except Exception as e:
+            log.warning(f"关闭浏览器会话 {self.key} 失败: {e}")
+
+
+class PlaywrightSessionPool:
+    """
+    浏览器会话池
+
+    - 整个进程共享一个 Playwright 驱动
+    - 按比特浏览器窗口 ID / ws 地址缓存浏览器连接，本地启动的浏览器按无头模式缓存
+    - 每次取用前做健康检查，断开或过期的会话自动重建
+    - 通过 context() / page() 分发相互隔离的上下文和页面，用完即关闭，浏览器连接保留
+    """
+
+    def __init__(self):
+        self._playwright: Optional[Playwright] = None
+        self._sessions: Dict[str, BrowserSession] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._driver_lock = asyncio.Lock()
+
+    async def _get_playwright(self) -> Playwright:
+        """获取（按需启动）共享的 Playwright 驱动"""
+        async with self._driver_lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+                log.info("Playwright 驱动已启动")
+            return self._playwright
+
+    @staticmethod
+    def _resolve_key(ws_endpoint: Optional[str], key: Optional[str], headless: bool) -> str:
+        """计算会话键"""
+        if key:
+            return key
+        if ws_endpoint:
+            return ws_endpoint
+        return f"launch:{'headless' if headless else 'headed'}"
+
+    async def _recycle_stale(self) -> None:
+        """回收断开或过期的空闲会话"""
+        now = time.monotonic()
+        stale_keys = [key for key, session in self._sessions.items() if session.is_stale(now)]
+        for key in stale_keys:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                # 等待关闭前一个会话期间，该会话可能已被取用或重建，持锁重新检查
+                session = self._sessions.get(key)
+                if session is None or not session.is_stale(time.monotonic()):
+                    continue
+                del self._sessions[key]
+            log.info(f"回收浏览器会话: {key}")
+            await session.close()
+
+    async def acquire(
+            self,
+            ws_endpoint: Optional[str] = None,
+            key: Optional[str] = None,
+            headless: bool = True
+    ) -> BrowserSession:
+        """
+        获取浏览器会话（已有可用会话直接复用）
+
+        调用方使用完毕后必须调用 release()，建议使用 context() / page()
+
+        Args:
+            ws_endpoint: CDP 连接地址，为空时本地启动 Chromium
+            key: 会话键，比特浏览器场景传窗口 ID；默认使用 ws_endpoint
+            headless: 是否无头模式（仅本地启动时有效）
+
+        Returns:
+            浏览器会话
+        """
+        await self._recycle_stale()
+
+        session_key = self._resolve_key(ws_endpoint, key, headless)
+        lock = self._locks.setdefault(session_key, asyncio.Lock())
+
+        async with lock:
+            session = self._sessions.get(session_key)
+            # 同一窗口重新打开后 ws 地址会变化，旧连接不可再用
+            if session and (not session.is_connected or session.ws_endpoint != ws_endpoint):
+                del self._sessions[session_key]
+                await session.close()
+                session = None
+
+            if session is None:
+                playwright = await self._get_playwright()
+                start = time.perf_counter()
+                if ws_endpoint:
+                    browser = await playwright.chromium.connect_over_cdp(ws_endpoint)
+                else:
+                    browser = await playwright.chromium.launch(headless=headless)
+                session = BrowserSession(session_key, browser, ws_endpoint)
+                self._sessions[session_key] = session
+                log.info(f"新建浏览器会话 {session_key}，耗时 {(time.perf_counter() - start) * 1000:.0f}ms")
+
+            session.in_use += 1
+            session.last_used_at = time.monotonic()
+            return session
+
+    @staticmethod
+    def release(session: BrowserSession) -> None:
+        """
+        归还浏览器会话
+
+        Args:
+            session: acquire() 获取的会话
+        """
+        session.in_use = max(0, session.in_use - 1)
+        session.last_used_at = time.monotonic()
+
+    @asynccontextmanager
+    async def context(
+            self,
+            ws_endpoint: Optional[str] = None,
+            key: Optional[str] = None,
+            headless: bool = True,
+            **context_options
+    ) -> AsyncIterator[BrowserContext]:
+        """
+        获取一个隔离的浏览器上下文，退出时关闭上下文并归还会话
+
+        Args:
+            ws_endpoint: CDP 连接地址
+            key: 会话键
+            headless: 是否无头模式
+            **context_options: 透传给 browser.new_context 的参数
+        """
+        session = await self.acquire(ws_endpoint, key, headless)
+        context = None
+        try:
+            context = await session.browser.new_context(**context_options)
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    log.warning(f"关闭浏览器上下文失败: {e}")
+            self.release(session)
+
+    @asynccontextmanager
+    async def page(
+            self,
+            ws_endpoint: Optional[str] = None,
+            key: Optional[str] = None,
+            headless: bool = True,
+            **context_options
+    ) -> AsyncIterator[Page]:
+        """
+        获取一个隔离上下文中的新页面，退出时关闭并归还会话
+
+        Args:
+            ws_endpoint: CDP 连接地址
+            key: 会话键
+            headless: 是否无头模式
+            **context_options: 透传给 browser.new_context 的参数
+        """
+        async with self.context(ws_endpoint, key, headless, **context_options) as context:
+            yield await context.new_page()
+
+    async def close_session(self, key: str) -> None:
+        """
+        关闭并移除指定会话（如比特浏览器窗口已关闭）
+
+        Args:
+            key: 会话键
+        """
+        session = self._sessions.pop(key, None)
+        if session:
+            await session.close()
+
+    async def close_all(self) -> None:
+        """关闭全部会话和 Playwright 驱动（应用关闭时调用）"""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        self._locks.clear()
+        for session in sessions:
+            await session.close()
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+            log.info("Playwright 驱动已关闭")
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+# 全局会话池实例
+playwright_session_pool = PlaywrightSessionPool()
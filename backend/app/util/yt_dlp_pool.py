@@ -0,0 +1,153 @@
+"""
+YoutubeDL 实例池
+按配置（代理、cookies、格式等）复用 YoutubeDL 实例，避免每次下载重新初始化解析器、cookie 和 HTTP 会话
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import yt_dlp
+
+from app.core.config import settings
+from app.core.logging import log
+
+# 每个任务独立的配置项，不参与实例分组，借出时按任务设置
+_PER_JOB_OPTS = ("outtmpl", "progress_hooks")
+
+
+class PooledYoutubeDL:
+    """
+    池中的一个 YoutubeDL 实例
+
+    创建时注册一个路由钩子，借出期间把 yt-dlp 的进度事件转发给当前任务的进度钩子。
+    """
+
+    def __init__(self, key: str, opts: Dict[str, Any]):
+        """
+        初始化实例
+
+        Args:
+            key: 配置分组键
+            opts: 不含进度钩子的 yt-dlp 配置
+        """
+        self.key = key
+        self.ydl = yt_dlp.YoutubeDL(opts)
+        self.created_at = time.monotonic()
+        self.uses = 0
+        self._job_hooks: List[Callable[[Dict], None]] = []
+        self.ydl.add_progress_hook(self._route_progress)
+
+    def _route_progress(self, d: Dict) -> None:
+        """转发进度事件给当前任务"""
+        for hook in self._job_hooks:
+            hook(d)
+
+    def bind(self, outtmpl: Optional[str], hooks: List[Callable[[Dict], None]]) -> None:
+        """绑定当前任务的输出模板和进度钩子"""
+        if outtmpl:
+            self.ydl.params["outtmpl"]["default"] = outtmpl
+        self._job_hooks = list(hooks)
+
+    def unbind(self) -> None:
+        """解除任务绑定并保存 cookies"""
+        self._job_hooks = []
+        self.ydl.save_cookies()
+
+    def close(self) -> None:
+        """关闭实例（保存 cookies 并关闭 HTTP 会话）"""
+        try:
+            self.ydl.close()
+        except Exception as e:
+            log.warning(f"关闭 YoutubeDL 实例失败: {e}")
+
+
+class YoutubeDLPool:
+    """
+    YoutubeDL 实例池
+
+    - 按配置分组缓存空闲实例，outtmpl / progress_hooks 每次借出时单独设置
+    - 实例同一时间只借给一个任务（YoutubeDL 不是线程安全的），并发任务各自借出不同实例
+    - 任务异常时丢弃实例，避免残留状态影响后续任务
+    - 在工作线程中调用，使用线程锁同步
+    """
+
+    def __init__(self, max_idle: Optional[int] = None):
+        """
+        初始化实例池
+
+        Args:
+            max_idle: 每组最多保留的空闲实例数，0 表示禁用复用，默认读取配置
+        """
+        self.max_idle = settings.yt_dlp_pool_max_idle if max_idle is None else max_idle
+        self._idle: Dict[str, List[PooledYoutubeDL]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    @staticmethod
+    def make_key(opts: Dict[str, Any]) -> str:
+        """根据配置（不含任务级配置）生成分组键"""
+        return repr(sorted((k, repr(v)) for k, v in opts.items() if k not in _PER_JOB_OPTS))
+
+    @contextmanager
+    def borrow(self, ydl_opts: Dict[str, Any]) -> Iterator[yt_dlp.YoutubeDL]:
+        """
+        借出一个按当前配置初始化的 YoutubeDL 实例，退出时归还
+
+        Args:
+            ydl_opts: 完整的 yt-dlp 配置，其中 outtmpl / progress_hooks 只对本次任务生效
+
+        Example:
+            with youtube_dl_pool.borrow(opts) as ydl:
+                info = ydl.extract_info(url, download=True)
+        """
+        key = self.make_key(ydl_opts)
+        worker = self._acquire(key, ydl_opts)
+        worker.bind(ydl_opts.get("outtmpl"), ydl_opts.get("progress_hooks") or [])
+        try:
+            yield worker.ydl
+        except BaseException:
+            worker.close()
+            raise
+        else:
+            worker.unbind()
+            worker.uses += 1
+            self._release(worker)
+
+    def _acquire(self, key: str, ydl_opts: Dict[str, Any]) -> PooledYoutubeDL:
+        """取出空闲实例，没有则新建"""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+            self.created += 1
+
+        # 进度钩子由实例的路由钩子按任务转发；输出模板在初始化时被规范化为字典，借出时再替换 default 模板
+        opts = {k: v for k, v in ydl_opts.items() if k != "progress_hooks"}
+        return PooledYoutubeDL(key, opts)
+
+    def _release(self, worker: PooledYoutubeDL) -> None:
+        """归还实例，超过空闲上限或存活过久时关闭"""
+        expired = time.monotonic() - worker.created_at > settings.yt_dlp_pool_max_age
+        with self._lock:
+            idle = self._idle.setdefault(worker.key, [])
+            if not expired and len(idle) < self.max_idle:
+                idle.append(worker)
+                return
+        worker.close()
+
+    def close_all(self) -> None:
+        """关闭全部空闲实例（应用关闭时调用）"""
+        with self._lock:
+            workers = [worker for idle in self._idle.values() for worker in idle]
+            self._idle.clear()
+        for worker in workers:
+            worker.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+
+# 全局 YoutubeDL 实例池
+youtube_dl_pool = YoutubeDLPool()
@@ -4,36 +4,281 @@
 """
 
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yt_dlp
 
+from app.core.config import settings
 from app.core.exceptions import BusinessException
 from app.core.logging import log
+from app.util.cache import TTLCache
+from app.util.download_cache import download_cache
+from app.util.yt_dlp_pool import youtube_dl_pool
 
 
 # 进度回调类型: (已下载字节数, 总字节数)
 ProgressCallback = Callable[[int, int], None]
 
 
+class _SharedDownloadAborted(Exception):
+    """合并下载的所有等待者都已退出（在 yt-dlp 进度钩子中抛出，用于中止工作线程中的下载）"""
+
+
+class _SharedDownload:
+    """
+    合并后的一次实际下载，由同一视频的多个并发请求（等待者）共享
+
+    - 下载在独立的任务中执行，任一等待者被取消只让它自己退出，不影响其他等待者
+    - 进度逐个分发给等待者，某个等待者的回调抛出异常（如所属下载任务已取消）时只让该等待者退出
+    - 所有等待者都退出后才中止下载
+    - 进度在工作线程中分发，等待者列表使用线程锁同步
+    """
+
+    def __init__(self, key: str):
+        """
+        初始化合并下载
+
+        Args:
+            key: 下载缓存键
+        """
+        self.key = key
+        self.loop = asyncio.get_running_loop()
+        self.aborted = False
+        self._waiters: Dict[int, Tuple[asyncio.Future, Optional[ProgressCallback]]] = {}
+        self._lock = threading.Lock()
+
+    def join(self, on_progress: Optional[ProgressCallback]) -> asyncio.Future:
+        """加入等待，返回该等待者的结果 Future"""
+        waiter = self.loop.create_future()
+        with self._lock:
+            self._waiters[id(waiter)] = (waiter, on_progress)
+        return waiter
+
+    def leave(self, waiter: asyncio.Future) -> None:
+        """等待者退出，最后一个等待者退出时中止下载"""
+        with self._lock:
+            self._waiters.pop(id(waiter), None)
+            if self._waiters or self.aborted:
+                return
+            self.aborted = True
+        # 后续相同请求重新发起下载，不再合并到即将中止的下载
+        if _inflight.get(self.key) is self:
+            del _inflight[self.key]
+        log.info(f"合并下载的等待者均已退出，中止下载: {self.key}")
+
+    def publish(self, downloaded: int, total: int) -> None:
+        """分发进度（在工作线程中调用）"""
+        if self.aborted:
+            raise _SharedDownloadAborted(self.key)
+        with self._lock:
+            waiters = list(self._waiters.values())
+        for waiter, listener in waiters:
+            if listener is None:
+                continue
+            try:
+                listener(downloaded, total)
+            except Exception as e:
+                self.loop.call_soon_threadsafe(self._detach, waiter, e)
+
+    def finish(self, path: Optional[str] = None, error: Optional[BaseException] = None) -> None:
+        """下载结束，把结果交给所有仍在等待的等待者"""
+        with self._lock:
+            waiters = [waiter for waiter, _ in self._waiters.values()]
+            self._waiters.clear()
+        for waiter in waiters:
+            if waiter.done():
+                continue
+            if isinstance(error, asyncio.CancelledError):
+                waiter.cancel()
+            elif error is not None:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(path)
+
+    def _detach(self, waiter: asyncio.Future, error: Exception) -> None:
+        """进度回调失败的等待者以该异常退出"""
+        if not waiter.done():
+            waiter.set_exception(error)
+        self.leave(waiter)
+
+
+# 正在下载的缓存键 -> 合并下载，相同视频的并发请求合并为一次下载
+_inflight: Dict[str, _SharedDownload] = {}
+
+# 元数据解析结果中保留的字段（完整 info 含格式列表等，体积大且用不到）
+METADATA_FIELDS = (
+    "id", "extractor_key", "title", "description", "duration", "uploader", "uploader_id",
+    "channel", "channel_id", "channel_follower_count", "view_count", "like_count", "comment_count", "upload_date",
+    "timestamp", "thumbnail", "webpage_url", "url", "playlist_count",
+)
+
+# 元数据解析结果缓存: (url, flat, proxy, cookies_file) -> 元数据（不同 cookies 可见的内容可能不同）
+_metadata_cache: TTLCache[Tuple[str, bool, Optional[str], Optional[str]], Dict[str, Any]] = TTLCache(
+    max_size=settings.yt_dlp_metadata_cache_max_size,
+    ttl=settings.yt_dlp_metadata_cache_ttl
+)
+
+# 元数据解析线程池，限制同时进行的解析请求数量
+_metadata_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_metadata_executor() -> ThreadPoolExecutor:
+    """获取（按需创建）元数据解析线程池"""
+    global _metadata_executor
+    if _metadata_executor is None:
+        _metadata_executor = ThreadPoolExecutor(
+            max_workers=settings.yt_dlp_metadata_workers,
+            thread_name_prefix="yt-dlp-metadata"
+        )
+    return _metadata_executor
+
+
+def shutdown_metadata_executor() -> None:
+    """关闭元数据解析线程池（应用关闭时调用）"""
+    global _metadata_executor
+    if _metadata_executor is not None:
+        _metadata_executor.shutdown(wait=False, cancel_futures=True)
+        _metadata_executor = None
+
+
+def clear_metadata_cache() -> None:
+    """清空元数据解析结果缓存"""
+    _metadata_cache.clear()
+
+
+async def extract_metadata(
+    url: str,
+    proxy: Optional[str] = None,
+    cookies_file: Optional[str] = None,
+    flat: bool = True,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    只解析视频元数据，不下载文件
+
+    播放列表/频道默认平铺解析：只读取列表页，条目不逐个解析，扫描频道只产生列表请求。
+
+    Args:
+        url: 视频、播放列表或频道 URL
+        proxy: 代理地址（可选）
+        cookies_file: cookies 文件（可选）
+        flat: 播放列表/频道是否平铺解析（条目只包含列表页能拿到的字段）
+        use_cache: 是否使用结果缓存
+
+    Returns:
+        元数据字典（METADATA_FIELDS 中的字段）；播放列表/频道额外包含
+        _type="playlist" 和 entries 条目列表。结果与缓存共享，请勿修改
+
+    Raises:
+        BusinessException: 解析失败时抛出
+
+    Example:
+        meta = await yt_dlp_util.extract_metadata("https://www.youtube.com/@xxx/videos")
+        for entry in meta.get("entries", []):
+            print(entry["title"], entry["view_count"])
+    """
+    key = (url, flat, proxy, cookies_file)
+    if use_cache:
+        cached = _metadata_cache.get(key)
+        if cached is not None:
+            return cached
+
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        # 只要元数据，没有可用格式不视为错误
+        "ignore_no_formats_error": True,
+    }
+    if flat:
+        ydl_opts["extract_flat"] = "in_playlist"
+    if proxy:
+        ydl_opts["proxy"] = proxy
+    if cookies_file:
+        ydl_opts["cookiefile"] = cookies_file
+
+    loop = asyncio.get_running_loop()
+    try:
+        info = await loop.run_in_executor(_get_metadata_executor(), _extract_info, url, ydl_opts)
+    except Exception as e:
+        log.error(f"yt-dlp 元数据解析失败: {url}, 错误: {e}")
+        raise BusinessException(message=f"解析失败: {str(e)}")
+
+    metadata = _pick_metadata(info)
+    if use_cache:
+        _metadata_cache.set(key, metadata)
+    return metadata
+
+
+async def extract_batch(
+    urls: List[str],
+    proxy: Optional[str] = None,
+    cookies_file: Optional[str] = None,
+    flat: bool = True,
+    use_cache: bool = True
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    批量解析元数据
+
+    并发数受元数据解析线程池大小限制，重复 URL 只解析一次，单个失败不影响其他 URL。
+
+    Args:
+        urls: URL 列表
+        proxy: 代理地址（可选）
+        cookies_file: cookies 文件（可选）
+        flat: 播放列表/频道是否平铺解析
+        use_cache: 是否使用结果缓存
+
+    Returns:
+        与 urls 顺序一致的元数据列表，解析失败的位置为 None
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    results = await asyncio.gather(
+        *(extract_metadata(url, proxy, cookies_file, flat, use_cache) for url in unique_urls),
+        return_exceptions=True
+    )
+
+    metadata_map = {
+        url: None if isinstance(result, BaseException) else result
+        for url, result in zip(unique_urls, results)
+    }
+    return [metadata_map[url] for url in urls]
+
+
+def _pick_metadata(info: Dict[str, Any]) -> Dict[str, Any]:
+    """从 yt-dlp 解析结果中提取元数据字段"""
+    metadata = {field: info.get(field) for field in METADATA_FIELDS}
+    if info.get("_type") == "playlist":
+        metadata["_type"] = "playlist"
+        metadata["entries"] = [_pick_metadata(entry) for entry in info.get("entries") or [] if entry]
+    return metadata
+
+
 async def download(
     url: str,
     output_dir: str,
     proxy: Optional[str] = None,
     cookies_file: Optional[str] = None,
     on_progress: Optional[ProgressCallback] = None,
-    extra_opts: Optional[Dict] = None
+    extra_opts: Optional[Dict] = None,
+    use_cache: bool = True
 ) -> str:
     """
     使用 yt-dlp 下载视频
 
+    启用下载缓存时先解析视频信息（不下载），同一视频同一格式已下载过则直接硬链接到输出目录；
+    相同视频的并发请求只下载一次。
+
     Args:
         url: 视频 URL
         output_dir: 输出目录
         proxy: 代理地址（可选）
         on_progress: 进度回调 (downloaded_bytes, total_bytes)
         extra_opts: 额外的 yt-dlp 配置（可选）
+        use_cache: 是否使用下载去重缓存
 
     Returns:
         下载后的文件绝对路径
@@ -62,12 +307,70 @@ async def download(
 
     # 在线程池中执行下载
     try:
+        if use_cache and download_cache.enabled:
+            return await _cached_download(url, output_dir, ydl_opts, on_progress)
         return await asyncio.to_thread(_execute_download, url, ydl_opts)
+    except BusinessException:
+        raise
     except Exception as e:
         log.error(f"yt-dlp 下载失败: {url}, 错误: {e}")
         raise BusinessException(message=f"下载失败: {str(e)}")
 
 
+async def _cached_download(
+    url: str,
+    output_dir: str,
+    ydl_opts: Dict,
+    on_progress: Optional[ProgressCallback]
+) -> str:
+    """通过下载缓存下载：命中直接链接，未命中下载到缓存目录后链接到输出目录"""
+    # 解析视频信息（不下载），得到平台视频 ID
+    info = await asyncio.to_thread(_extract_info, url, ydl_opts)
+    key = download_cache.make_key(info, ydl_opts.get("format"))
+    if key is None:
+        return await asyncio.to_thread(_execute_download_info, info, ydl_opts)
+
+    cached = download_cache.get(key)
+    if cached:
+        log.info(f"下载缓存命中: {key}")
+        return download_cache.link_into(cached, output_dir)
+
+    shared = _inflight.get(key)
+    if shared is not None:
+        # 同一视频正在下载，等待其完成
+        log.info(f"合并重复下载: {key}")
+    else:
+        shared = _inflight[key] = _SharedDownload(key)
+        cache_opts = dict(ydl_opts)
+        cache_opts["outtmpl"] = f"{download_cache.entry_dir(key)}/%(title)s.%(ext)s"
+        cache_opts["progress_hooks"] = [_create_progress_hook(shared.publish)]
+        asyncio.create_task(_run_shared_download(shared, info, cache_opts))
+
+    waiter = shared.join(on_progress)
+    try:
+        path = await waiter
+    except asyncio.CancelledError:
+        shared.leave(waiter)
+        raise
+    return download_cache.link_into(path, output_dir)
+
+
+async def _run_shared_download(shared: _SharedDownload, info: Dict[str, Any], cache_opts: Dict) -> None:
+    """执行合并下载并把结果交给等待者"""
+    try:
+        path = await asyncio.to_thread(_execute_download_info, info, cache_opts)
+        download_cache.put(shared.key, path)
+    except BaseException as e:
+        shared.finish(error=e)
+        if not isinstance(e, Exception):
+            raise
+    else:
+        shared.finish(path=path)
+    finally:
+        if _inflight.get(shared.key) is shared:
+            del _inflight[shared.key]
+
+
 def _build_opts(
     output_dir: str,
     proxy: Optional[str],
@@ -108,8 +411,31 @@ def _create_progress_hook(on_progress: ProgressCallback):
 
 def _execute_download(url: str, ydl_opts: Dict) -> str:
     """执行下载（同步方法）"""
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    with youtube_dl_pool.borrow(ydl_opts) as ydl:
         info = ydl.extract_info(url, download=True)
-        filepath = ydl.prepare_filename(info)
+        filepath = _downloaded_path(ydl, info)
         log.info(f"yt-dlp 下载完成: {filepath}")
         return filepath
+
+
+def _extract_info(url: str, ydl_opts: Dict) -> Dict[str, Any]:
+    """只解析视频信息，不下载（同步方法）"""
+    with youtube_dl_pool.borrow(ydl_opts) as ydl:
+        return ydl.extract_info(url, download=False)
+
+
+def _execute_download_info(info: Dict[str, Any], ydl_opts: Dict) -> str:
+    """按已解析的视频信息下载，避免重复解析（同步方法）"""
+    with youtube_dl_pool.borrow(ydl_opts) as ydl:
+        result = ydl.process_ie_result(info, download=True)
+        filepath = _downloaded_path(ydl, result)
+        log.info(f"yt-dlp 下载完成: {filepath}")
+        return filepath
+
+
+def _downloaded_path(ydl: yt_dlp.YoutubeDL, info: Dict[str, Any]) -> str:
+    """获取实际下载的文件路径（合并格式后扩展名可能与模板推算的不同）"""
+    downloads = info.get("requested_downloads") or []
+    if downloads and downloads[0].get("filepath"):
+        return downloads[0]["filepath"]
+    return ydl.prepare_filename(info)